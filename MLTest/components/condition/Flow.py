@@ -1,5 +1,6 @@
 from MLTest.interfaces.Components import FlowComponent
 from MLTest.interfaces.Typing import DF
+from MLTest.core.Planning import Estimate
 from typing import Callable
 
 
@@ -22,6 +23,16 @@ class UseConditionalFlow(FlowComponent):
         self.true_component = true_component
         self.false_component = false_component
 
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Plans both branches. The output schema is only known if both branches agree on it.
+        """
+        true_estimate = self.true_component.plan(estimate)
+        false_estimate = self.false_component.plan(estimate)
+        if true_estimate is None or false_estimate is None or true_estimate.schema != false_estimate.schema:
+            return Estimate(rows=estimate.rows if estimate is not None else None)
+        return true_estimate
+
     def use(self, data: DF) -> DF:
         """
         Evaluate the condition and run the appropriate component based on the result.
@@ -0,0 +1,129 @@
+from MLTest.interfaces.Components import FlowComponent
+from MLTest.interfaces.Typing import DF
+from MLTest.core.Planning import Estimate
+from MLTest.core.FeatureStore import FeatureStore
+import polars as pl
+
+
+class UpdateFeatureStore(FlowComponent):
+    """
+    A FlowComponent that merges the rows passing through it into a FeatureStore and returns
+    them unchanged. With `rebuild`, the store is recomputed from the data instead (full history).
+    """
+    def __init__(self, store: FeatureStore, rebuild: bool = False, log: bool = False):
+        """
+        Initializes the UpdateFeatureStore component.
+
+        Parameters:
+        - store (FeatureStore): The store to update.
+        - rebuild (bool): Replace the stored state instead of updating it (default: False).
+        """
+        super().__init__(log)
+        self.store = store
+        self.rebuild = rebuild
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that the columns aggregated by the store exist.
+        """
+        estimate = estimate or Estimate()
+        store = self.store
+        estimate.require([store.key, store.order_by] + store.values + store.last_columns, self.__class__.__name__)
+        return estimate
+
+    def use(self, data: DF) -> DF:
+        """
+        Updates (or rebuilds) the store with the data.
+
+        Parameters:
+        - data (DF): The Polars DataFrame to process.
+
+        Returns:
+        - DF: The unchanged DataFrame.
+        """
+        self.log(f"{'Rebuilding' if self.rebuild else 'Updating'} feature store at '{self.store.path}' with {data.height} rows.", level="INFO")
+
+        try:
+            if self.rebuild:
+                self.store.materialize(data)
+            else:
+                self.store.update(data)
+            self.log("Feature store updated successfully.", level="INFO")
+        except Exception as e:
+            self.log(f"Failed to update feature store: {e}", level="ERROR")
+            raise
+
+        return data
+
+
+class JoinStoredFeatures(FlowComponent):
+    """
+    A FlowComponent that joins precomputed per-key features from a FeatureStore onto the data,
+    reading only the partitions of the keys present in the data. Keys unknown to the store get nulls.
+    """
+    def __init__(self, store: FeatureStore, features: list[str] = None, prefix: str = "", log: bool = False):
+        """
+        Initializes the JoinStoredFeatures component.
+
+        Parameters:
+        - store (FeatureStore): The store to read from.
+        - features (list[str]): Features to join (default: all, see `FeatureStore.feature_names`).
+        - prefix (str): Prefix added to the joined feature names (default: "").
+        """
+        super().__init__(log)
+        self.store = store
+        self.features = features or store.feature_names()
+        unknown = [feature for feature in self.features if feature not in store.feature_names()]
+        if unknown:
+            raise ValueError(f"Unknown features {unknown}. Available features: {store.feature_names()}.")
+        self.prefix = prefix
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks the key column and declares the joined features.
+        """
+        estimate = estimate or Estimate()
+        estimate.require([self.store.key], self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        outputs = {}
+        for feature in self.features:
+            if feature == f"last_{self.store.order_by}":
+                dtype = estimate.schema.get(self.store.order_by, pl.Datetime)
+            elif feature.endswith("_count"):
+                dtype = pl.Int64
+            elif feature in [f"{column}_last" for column in self.store.last_columns]:
+                dtype = estimate.schema.get(feature[:-len("_last")], pl.Float64)
+            else:
+                dtype = pl.Float64
+            outputs[self.prefix + feature] = dtype
+        return estimate.with_schema({**estimate.schema, **outputs})
+
+    def use(self, data: DF) -> DF:
+        """
+        Looks up the features of all keys in the data and left-joins them.
+
+        Parameters:
+        - data (DF): The Polars DataFrame to process.
+
+        Returns:
+        - DF: The DataFrame with the stored features added.
+        """
+        key = self.store.key
+        self.log(f"Joining {len(self.features)} stored feature(s) on '{key}'.", level="INFO")
+
+        try:
+            features = self.store.lookup(data[key].unique())
+            if features is None:
+                self.log("Feature store is empty, features are null.", level="WARNING")
+                return data.with_columns([pl.lit(None).alias(self.prefix + feature) for feature in self.features])
+            features = features.select(
+                [pl.col(key).cast(data.schema[key])] + [pl.col(feature).alias(self.prefix + feature) for feature in self.features]
+            )
+            data = data.join(features, on=key, how="left")
+            self.log("Stored features joined successfully.", level="INFO")
+        except Exception as e:
+            self.log(f"Failed to join stored features: {e}", level="ERROR")
+            raise
+
+        return data
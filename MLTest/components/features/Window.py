@@ -0,0 +1,207 @@
+from MLTest.interfaces.Components import FlowComponent
+from MLTest.interfaces.Typing import DF
+from MLTest.core.Planning import Estimate
+from typing import Optional, Union
+import polars as pl
+
+
+class RollingFeatures(FlowComponent):
+    """
+    A FlowComponent computing grouped rolling statistics of a column (e.g. per-user rolling
+    mean of `Amount`) in a single vectorized pass over the frame sorted by group and time.
+
+    Windows are either row counts (int, e.g. 7 for the last 7 transactions) or durations
+    (str, e.g. "7d" for the last 7 days of `order_by`). Row-count windows match pandas'
+    `groupby().rolling(window=7, min_periods=1)`. In duration windows, rows with equal timestamps
+    share one window that holds all of them, where pandas includes only the earlier rows of the tie.
+    """
+    STATISTICS = ["mean", "std", "count", "sum", "min", "max"]
+
+    def __init__(self, column: str = "Amount", by: str = "User", order_by: str = "Datetime",
+                 windows: list[Union[int, str]] = None, statistics: list[str] = None,
+                 names: Optional[dict[tuple, str]] = None, fill_value: Optional[float] = None, log: bool = False):
+        """
+        Initializes the RollingFeatures component.
+
+        Parameters:
+        - column (str): Column to aggregate (default: "Amount").
+        - by (str): Grouping column (default: "User").
+        - order_by (str): Column defining the order within a group and time-based windows (default: "Datetime").
+        - windows (list[Union[int, str]]): Row-count or duration windows (default: [7]).
+        - statistics (list[str]): Any of "mean", "std", "count", "sum", "min", "max" (default: all).
+        - names (Optional[dict[tuple, str]]): Output names for (statistic, window) pairs, e.g.
+          {("mean", 7): "WeeklyTransactionMean"}. Other outputs are named "<column>_rolling_<statistic>_<window>".
+        - fill_value (Optional[float]): Value replacing nulls in the outputs, e.g. 0 for the std of a
+          single transaction (default: None keeps nulls).
+        """
+        super().__init__(log)
+        self.column = column
+        self.by = by
+        self.order_by = order_by
+        self.windows = windows or [7]
+        self.statistics = statistics or self.STATISTICS
+        unknown = [statistic for statistic in self.statistics if statistic not in self.STATISTICS]
+        if unknown:
+            raise ValueError(f"Unsupported statistics {unknown}. Supported statistics: {self.STATISTICS}.")
+        self.names = names or {}
+        self.fill_value = fill_value
+
+    def _name(self, statistic: str, window: Union[int, str]) -> str:
+        """
+        Returns the output column name of a statistic and window.
+        """
+        return self.names.get((statistic, window), f"{self.column}_rolling_{statistic}_{window}")
+
+    def _expression(self, statistic: str, window: Union[int, str]) -> pl.Expr:
+        """
+        Builds the rolling expression of a statistic over a row-count or duration window.
+        """
+        values = pl.col(self.column)
+        if statistic == "count":
+            statistic, values = "sum", values.is_not_null().cast(pl.UInt32)
+
+        if isinstance(window, int):
+            expression = getattr(values, f"rolling_{statistic}")(window_size=window, min_samples=1)
+        else:
+            expression = getattr(values, f"rolling_{statistic}_by")(self.order_by, window_size=window, min_samples=1)
+        return expression.over(self.by)
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks the input columns and declares the rolling outputs.
+        """
+        estimate = estimate or Estimate()
+        estimate.require([self.column, self.by, self.order_by], self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        outputs = {
+            self._name(statistic, window): pl.UInt32 if statistic == "count" else pl.Float64
+            for window in self.windows for statistic in self.statistics
+        }
+        return estimate.with_schema({**estimate.schema, **outputs})
+
+    def use(self, data: DF) -> DF:
+        """
+        Sorts the frame by group and order column (stable, so rows with equal timestamps keep
+        their input order) and adds the rolling statistics.
+
+        Parameters:
+        - data (DF): The Polars DataFrame to process.
+
+        Returns:
+        - DF: The sorted DataFrame with the rolling feature columns added.
+        """
+        self.log(f"Computing rolling {self.statistics} of '{self.column}' per '{self.by}' over windows {self.windows}.", level="INFO")
+
+        transformations = []
+        for window in self.windows:
+            for statistic in self.statistics:
+                expression = self._expression(statistic, window)
+                if self.fill_value is not None:
+                    expression = expression.fill_null(self.fill_value)
+                transformations.append(expression.alias(self._name(statistic, window)))
+
+        try:
+            data = data.sort([self.by, self.order_by], maintain_order=True).with_columns(transformations)
+            self.log("Rolling features computed successfully.", level="INFO")
+        except Exception as e:
+            self.log(f"Failed to compute rolling features: {e}", level="ERROR")
+            raise
+
+        return data
+
+
+class LagFeatures(FlowComponent):
+    """
+    A FlowComponent computing per-group lag and difference features, and the time since the
+    previous row of the group (e.g. `TimeSinceLastTransaction`), in a single vectorized pass.
+    """
+    TIME_UNITS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+
+    def __init__(self, columns: list[str] = None, by: str = "User", order_by: str = "Datetime",
+                 lags: list[int] = None, diffs: list[int] = None, time_since: Optional[str] = "TimeSinceLastTransaction",
+                 time_unit: str = "m", fill_value: Optional[float] = None, log: bool = False):
+        """
+        Initializes the LagFeatures component.
+
+        Parameters:
+        - columns (list[str]): Columns to lag and difference (default: none).
+        - by (str): Grouping column (default: "User").
+        - order_by (str): Column defining the order within a group (default: "Datetime").
+        - lags (list[int]): Lags producing "<column>_lag_<n>" (default: none).
+        - diffs (list[int]): Differences producing "<column>_diff_<n>" (default: none).
+        - time_since (Optional[str]): Name of the column with the time since the previous row of the
+          group, or None to skip it (default: "TimeSinceLastTransaction").
+        - time_unit (str): Unit of `time_since`: "s", "m", "h" or "d" (default: "m").
+        - fill_value (Optional[float]): Value replacing nulls of the first row of each group (default: None).
+        """
+        super().__init__(log)
+        if time_unit not in self.TIME_UNITS:
+            raise ValueError(f"Unsupported time unit '{time_unit}'. Supported units: {list(self.TIME_UNITS)}.")
+        self.columns = columns or []
+        self.by = by
+        self.order_by = order_by
+        self.lags = lags or []
+        self.diffs = diffs or []
+        self.time_since = time_since
+        self.time_unit = time_unit
+        self.fill_value = fill_value
+
+    def _expressions(self) -> dict[str, pl.Expr]:
+        """
+        Builds the output expressions by name.
+        """
+        expressions = {}
+        for column in self.columns:
+            for n in self.lags:
+                expressions[f"{column}_lag_{n}"] = pl.col(column).shift(n).over(self.by)
+            for n in self.diffs:
+                expressions[f"{column}_diff_{n}"] = pl.col(column).diff(n).over(self.by)
+        if self.time_since is not None:
+            expressions[self.time_since] = (
+                pl.col(self.order_by).diff().over(self.by).dt.total_milliseconds() / self.TIME_UNITS[self.time_unit]
+            )
+        return expressions
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks the input columns and declares the lag, difference and time-since outputs.
+        """
+        estimate = estimate or Estimate()
+        estimate.require(self.columns + [self.by, self.order_by], self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        outputs = {
+            name: estimate.schema[name.rsplit("_", 2)[0]] if "_lag_" in name else pl.Float64
+            for name in self._expressions()
+        }
+        return estimate.with_schema({**estimate.schema, **outputs})
+
+    def use(self, data: DF) -> DF:
+        """
+        Sorts the frame by group and order column (stable, so rows with equal timestamps keep
+        their input order) and adds the lag features.
+
+        Parameters:
+        - data (DF): The Polars DataFrame to process.
+
+        Returns:
+        - DF: The sorted DataFrame with the lag feature columns added.
+        """
+        expressions = self._expressions()
+        self.log(f"Computing lag features {list(expressions)} per '{self.by}'.", level="INFO")
+
+        transformations = []
+        for name, expression in expressions.items():
+            if self.fill_value is not None:
+                expression = expression.fill_null(self.fill_value)
+            transformations.append(expression.alias(name))
+
+        try:
+            data = data.sort([self.by, self.order_by], maintain_order=True).with_columns(transformations)
+            self.log("Lag features computed successfully.", level="INFO")
+        except Exception as e:
+            self.log(f"Failed to compute lag features: {e}", level="ERROR")
+            raise
+
+        return data
@@ -1,6 +1,13 @@
 from MLTest.interfaces.Components import ExportComponent, MultiExportComponent
 from MLTest.interfaces.Typing import DF
-from typing import List
+from MLTest.core.Planning import Estimate, PlanError
+from MLTest.core.Streaming import MicroBatch
+from MLTest.core.Encoding import FeatureEncoder, write_feature_matrix
+from MLTest.core.Datasets import FORMATS, write_shards
+from typing import Any, List, Optional
+from datetime import datetime, timezone
+import uuid
+import os
 
 
 class ExportData(ExportComponent):
@@ -8,6 +15,46 @@ class ExportData(ExportComponent):
     Component for exporting a single DataFrame to a specified file path.
     Supports CSV, Parquet (pq), and JSON formats.
     """
+    def __init__(self, export_to: str, mode: str = "overwrite", log: bool = False):
+        """
+        Initialize the ExportData component.
+
+        Args:
+            export_to (str): Path of the exported file. In "append" mode, the extension selects the
+                             format and the path without extension is used as a directory that
+                             receives one new part file per export (e.g. "./exports/preprocessed.pq"
+                             -> "./exports/preprocessed/part-<timestamp>-<id>.pq"). Within a streaming
+                             micro-batch the part is named after the batch id instead, so a replayed
+                             batch overwrites its previous attempt.
+            mode (str): "overwrite" (default) or "append".
+        """
+        super().__init__(export_to, log)
+        if mode not in ["overwrite", "append"]:
+            raise ValueError(f"Unsupported export mode '{mode}'. Supported modes: overwrite, append.")
+        self.mode = mode
+
+    def plan(self, estimate: Estimate = None) -> None:
+        """
+        Checks that the export format is supported before any data is processed.
+        """
+        file_type = self.export_to.split('.')[-1].lower()
+        if file_type not in ['csv', 'pq', 'json']:
+            raise PlanError(f"ExportData: unsupported file format '{file_type}'. Supported formats: csv, pq, json.")
+        return None
+
+    def _target(self, file_type: str) -> str:
+        """
+        Returns the path to write to, creating a new part file path in "append" mode.
+        """
+        if self.mode == "overwrite":
+            return self.export_to
+        directory = os.path.splitext(self.export_to)[0]
+        os.makedirs(directory, exist_ok=True)
+        batch = MicroBatch.active()
+        if batch is not None:
+            return os.path.join(directory, f"part-batch-{batch.id}.{file_type}")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        return os.path.join(directory, f"part-{timestamp}-{uuid.uuid4().hex[:8]}.{file_type}")
 
     def use(self, data: DF) -> None:
         """
@@ -22,26 +69,74 @@ class ExportData(ExportComponent):
         """
         # Infer the file format from the save path
         file_type = self.export_to.split('.')[-1].lower()
-        self.log(f"Starting export of DataFrame to {self.export_to} (inferred format: {file_type}).", level="INFO")
+        if self.mode == "append" and data.height == 0:
+            self.log("No rows to append. Skipping export.", level="INFO")
+            return
+
+        target = self._target(file_type)
+        self.log(f"Starting export of DataFrame to {target} (inferred format: {file_type}).", level="INFO")
 
         # Export based on the inferred file format
         try:
             if file_type == 'csv':
-                data.write_csv(self.export_to)
-                self.log(f"Exported DataFrame to {self.export_to} as CSV.", level="INFO")
+                data.write_csv(target)
+                self.log(f"Exported DataFrame to {target} as CSV.", level="INFO")
             elif file_type == 'pq':
-                data.write_parquet(self.export_to)
-                self.log(f"Exported DataFrame to {self.export_to} as Parquet.", level="INFO")
+                data.write_parquet(target)
+                self.log(f"Exported DataFrame to {target} as Parquet.", level="INFO")
             elif file_type == 'json':
-                data.write_json(self.export_to)
-                self.log(f"Exported DataFrame to {self.export_to} as JSON.", level="INFO")
+                data.write_json(target)
+                self.log(f"Exported DataFrame to {target} as JSON.", level="INFO")
             else:
                 raise ValueError(f"Unsupported file format '{file_type}'. Supported formats: csv, pq, json.")
         except Exception as e:
-            self.log(f"Failed to export DataFrame to {self.export_to}: {e}", level="ERROR")
+            self.log(f"Failed to export DataFrame to {target}: {e}", level="ERROR")
             raise
 
 
+class ExportShards(ExportComponent):
+    """
+    Component for exporting a DataFrame as a sharded training dataset: shards of a fixed row
+    count plus an `index.json`, read back in shuffled mini-batches by `ShardedDataset`.
+    """
+    def __init__(self, export_to: str, shard_rows: int = 100_000, file_format: str = "pq",
+                 mode: str = "overwrite", log: bool = False):
+        """
+        Initialize the ExportShards component.
+
+        Args:
+            export_to (str): Dataset directory (e.g. "./exports/strategy_6_shards").
+            shard_rows (int): Rows per shard (default: 100 000).
+            file_format (str): "pq" (default) or "arrow" (uncompressed Arrow IPC, fastest to read).
+            mode (str): "overwrite" (default) or "append". In "append" mode every export adds shards
+                        to the dataset, e.g. one export per chunk of a chunked run. "overwrite" replaces only
+                        the shards of an existing dataset and refuses a non-empty directory without one.
+        """
+        super().__init__(export_to, log)
+        if mode not in ["overwrite", "append"]:
+            raise ValueError(f"Unsupported export mode '{mode}'. Supported modes: overwrite, append.")
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported shard format '{file_format}'. Supported formats: pq, arrow.")
+        self.shard_rows = shard_rows
+        self.file_format = file_format
+        self.mode = mode
+
+    def use(self, data: DF) -> None:
+        """
+        Writes the provided DataFrame as shards and updates the index.
+
+        Args:
+            data (DF): The DataFrame to be exported.
+        """
+        self.log(f"Starting export of {data.height} row(s) to shards of {self.shard_rows} rows in {self.export_to}.", level="INFO")
+        try:
+            index = write_shards(data, self.export_to, self.shard_rows, self.file_format, append=self.mode == "append")
+        except Exception as e:
+            self.log(f"Failed to export shards to {self.export_to}: {e}", level="ERROR")
+            raise
+        self.log(f"Dataset in {self.export_to} holds {index['rows']} row(s) in {len(index['shards'])} shard(s).", level="INFO")
+
+
 class ExportMany(MultiExportComponent):
     """
     Component for exporting multiple DataFrames to specified file paths.
@@ -92,4 +187,65 @@ class ExportMany(MultiExportComponent):
                     raise ValueError(f"Unsupported file format '{file_type}' for path '{path}'. Supported formats: csv, pq, json.")
             except Exception as e:
                 self.log(f"Failed to export DataFrame to {path}: {e}", level="ERROR")
-                raise
\ No newline at end of file
+                raise
+
+
+class ExportFeatureMatrix(ExportComponent):
+    """
+    Component for exporting a feature frame as a training-ready matrix: the numeric features and
+    the labels are written as contiguous float32 arrays (`.npy` or raw buffers) with a JSON manifest
+    of the columns and their encoding (see `write_feature_matrix`). Booleans become 0/1,
+    categoricals and strings become category codes listed in the manifest, nulls become NaN.
+
+    Training jobs open the export with `read_feature_matrix`, which memory-maps the arrays, so
+    loading costs no parsing and only the touched pages are read.
+    """
+    def __init__(self, export_to: str, label: Optional[str] = "Is Fraud?", positive: Any = "Yes",
+                 exclude: Optional[List[str]] = None, layout: str = "npy", log: bool = False):
+        """
+        Initialize the ExportFeatureMatrix component.
+
+        Args:
+            export_to (str): Output directory (e.g. "./exports/strategy_6").
+            label (Optional[str]): Label column, written separately (default: "Is Fraud?"). None exports features only.
+            positive (Any): Label value of the positive class, or None for numeric/boolean labels (default: "Yes").
+            exclude (Optional[List[str]]): Columns not exported as features, e.g. "User" or "Datetime" (default: none).
+            layout (str): "npy" (default) or "raw" (`.f32` buffers described by the manifest).
+        """
+        super().__init__(export_to, log)
+        if layout not in ["npy", "raw"]:
+            raise ValueError(f"Unsupported layout '{layout}'. Supported layouts: npy, raw.")
+        self.label = label
+        self.positive = positive
+        self.exclude = exclude or []
+        self.layout = layout
+
+    def plan(self, estimate: Estimate = None) -> None:
+        """
+        Checks that the label and excluded columns exist and reports columns that cannot be encoded.
+        """
+        if estimate is None or estimate.schema is None:
+            return None
+        estimate.require(self.exclude + ([self.label] if self.label is not None else []), self.__class__.__name__)
+        skipped = [name for name, dtype in estimate.schema.items()
+                   if name not in self.exclude and name != self.label and FeatureEncoder._kind(dtype) is None]
+        if skipped:
+            self.log(f"Columns {skipped} cannot be encoded and will not be exported.", level="WARNING")
+        return None
+
+    def use(self, data: DF) -> None:
+        """
+        Encodes and writes the feature matrix and labels of the provided DataFrame.
+
+        Args:
+            data (DF): The feature frame to be exported.
+        """
+        self.log(f"Starting export of a {data.height} row feature matrix to {self.export_to} ({self.layout}).", level="INFO")
+        try:
+            manifest = write_feature_matrix(data, self.export_to, self.label, self.positive, self.exclude, self.layout)
+        except Exception as e:
+            self.log(f"Failed to export feature matrix to {self.export_to}: {e}", level="ERROR")
+            raise
+        if manifest["encoding"]["skipped"]:
+            self.log(f"Skipped columns that cannot be encoded: {manifest['encoding']['skipped']}.", level="WARNING")
+        self.log(f"Exported {manifest['rows']} x {len(manifest['feature_names'])} feature matrix to {self.export_to}.", level="INFO")
@@ -1,6 +1,64 @@
 from MLTest.interfaces.Components import ImportComponent
 from MLTest.interfaces.Typing import DF
+from MLTest.core.Watermarks import WatermarkStore
+from MLTest.core.Planning import Estimate, PlanError, estimate_file
+from MLTest.core.Sampling import Sampler, collect_sampled
+from MLTest.components.preprocessing.Types import EncodeCategoricals
+from typing import Iterator, Optional
 import polars as pl
+import glob
+import os
+
+
+# Process-wide cache of loaded inputs: absolute path -> (modification time, DataFrame)
+_CACHE = {}
+
+
+def _scan(path: str) -> pl.LazyFrame:
+    """
+    Lazily scans a file, inferring the format from its extension.
+    Supports CSV, Parquet (pq), JSON and NDJSON.
+
+    Raises:
+        ValueError: If the file type is unsupported.
+    """
+    file_type = path.split('.')[-1].lower()
+    if file_type == 'csv':
+        return pl.scan_csv(path)
+    elif file_type == 'pq':
+        return pl.scan_parquet(path)
+    elif file_type == 'ndjson':
+        return pl.scan_ndjson(path)
+    elif file_type == 'json':
+        return pl.read_json(path).lazy()
+    raise ValueError(f"Unsupported file type '{file_type}'. Supported types: csv, pq, json, ndjson.")
+
+
+def _encode_loaded(data: DF) -> DF:
+    """
+    Encodes a loaded frame with the categorical encoder of the running Sequence, if any.
+    """
+    encoder = EncodeCategoricals.active()
+    return encoder.use(data) if encoder is not None else data
+
+
+def iter_chunks(path: str, chunk_rows: int = 100_000) -> Iterator[DF]:
+    """
+    Reads a file lazily in chunks of `chunk_rows` rows, e.g. as input of a PipelinedExecutor.
+    CSV, Parquet and NDJSON files are streamed in a single pass over one scan, so every chunk
+    has the schema inferred once for the whole file; JSON files are read once and sliced.
+
+    Raises:
+        ValueError: If the file type is unsupported.
+    """
+    file_type = path.split('.')[-1].lower()
+    if file_type == 'json':
+        yield from pl.read_json(path).iter_slices(chunk_rows)
+        return
+
+    for chunk in _scan(path).collect_batches(chunk_size=chunk_rows):
+        if chunk.height:
+            yield chunk
 
 
 class LoadData(ImportComponent):
@@ -8,9 +66,29 @@ class LoadData(ImportComponent):
     Component for loading data from a specified file path into a Polars DataFrame.
     Supports CSV, Parquet (pq), and JSON file formats.
     """
+    def __init__(self, src: str, cache: bool = False, log: bool = False):
+        """
+        Initializes the LoadData component.
+
+        Parameters:
+        - src (str): Path of the file to load.
+        - cache (bool): Keep the loaded DataFrame in a process-wide cache and reuse it while the
+          file is unchanged. Meant for small dimension tables (e.g. Users, Cards) that are joined
+          on every incremental run.
+        """
+        super().__init__(src, log)
+        self.cache = cache
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Estimates the schema and row count from the file metadata without reading the data.
+        """
+        return estimate_file(self.src)
+
     def use(self) -> DF:
         """
-        Reads data from the specified file and returns it as a Polars DataFrame.
+        Reads data from the specified file and returns it as a Polars DataFrame. Within a Sequence
+        with categorical encoding, low-cardinality string columns are encoded right away.
 
         Returns:
             DF: The loaded data as a Polars DataFrame.
@@ -18,8 +96,33 @@ class LoadData(ImportComponent):
         Raises:
             ValueError: If the file type is unsupported.
         """
+        return _encode_loaded(self._read())
+
+    def _read(self) -> DF:
+        """
+        Reads the file through the active sampler or the cache.
+        """
         self.log(f"Starting to load data from {self.src}.", level="INFO")
 
+        sampler = Sampler.active()
+        if sampler is not None:
+            # Development mode: only the sampled rows are materialized, the cache is bypassed
+            self.log(f"Loading a sample ({type(sampler).__name__}) of {self.src}.", level="INFO")
+            try:
+                data = sampler.collect(_scan(self.src))
+            except Exception as e:
+                self.log(f"Failed to load data from {self.src}: {e}", level="ERROR")
+                raise
+            self.log(f"Loaded {data.height} sampled row(s) from {self.src}.", level="INFO")
+            return data
+
+        if self.cache:
+            key = os.path.abspath(self.src)
+            mtime = os.path.getmtime(self.src)
+            if key in _CACHE and _CACHE[key][0] == mtime:
+                self.log(f"Using cached data for {self.src}.", level="INFO")
+                return _CACHE[key][1]
+
         # Infer the file type from the file extension
         file_type = self.src.split('.')[-1].lower()
         self.log(f"Inferred file type: {file_type}.", level="INFO")
@@ -37,9 +140,155 @@ class LoadData(ImportComponent):
                 data = pl.read_json(self.src)
             else:
                 raise ValueError(f"Unsupported file type '{file_type}'. Supported types: csv, pq, json.")
-            
+
             self.log(f"Successfully loaded data from {self.src}.", level="INFO")
+            if self.cache:
+                _CACHE[key] = (mtime, data)
             return data
         except Exception as e:
             self.log(f"Failed to load data from {self.src}: {e}", level="ERROR")
             raise
+
+
+class LoadNewData(ImportComponent):
+    """
+    Component for incremental loading. Reads only the data that was not processed by
+    a previous successful run, tracked in a WatermarkStore.
+
+    `src` may be a single file, a directory or a glob pattern. Two modes are supported:
+    - per-file: files already recorded as processed are skipped (default),
+    - value watermark: only rows with `column` greater than the stored watermark are loaded.
+      Files not modified since the previous run are skipped, so only new or appended files are
+      scanned. Parquet scans push the watermark filter down to the row groups; CSV and JSON
+      files that changed are parsed in full before the filter applies.
+    """
+    # Suffix of the watermark key holding the newest file modification time seen by a value-watermark run
+    MTIME_SUFFIX = "#mtime"
+
+    def __init__(self, src: str, watermark: WatermarkStore, column: Optional[str] = None,
+                 schema: Optional[dict] = None, log: bool = False):
+        """
+        Initializes the LoadNewData component.
+
+        Parameters:
+        - src (str): File, directory or glob pattern to load.
+        - watermark (WatermarkStore): Store holding the state of previous runs.
+        - column (Optional[str]): Column of the raw files holding the watermark value, e.g. a load
+          timestamp or an increasing id. Columns derived later in the sequence (such as "Datetime"
+          built by GenerateTimeStamp) cannot be used. If None, the per-file processed set is used.
+        - schema (Optional[dict]): Schema of the empty frame returned while `src` has no files yet
+          (default: None, no columns). Once files exist, empty results take the schema of the newest file.
+        """
+        super().__init__(src, log)
+        self.watermark = watermark
+        self.column = column
+        self.schema = schema
+
+    def _empty(self, all_files: list[str]) -> DF:
+        """
+        Returns an empty frame with the schema of the newest file, or the configured schema if
+        there are no files, so downstream joins and casts still resolve their columns.
+        """
+        if all_files:
+            return pl.DataFrame(schema=_scan(all_files[-1]).collect_schema())
+        return pl.DataFrame(schema=self.schema)
+
+    def _files(self) -> list[str]:
+        """
+        Resolves `src` into a sorted list of files.
+        """
+        if os.path.isdir(self.src):
+            return sorted(
+                os.path.join(self.src, name) for name in os.listdir(self.src)
+                if os.path.isfile(os.path.join(self.src, name))
+            )
+        return sorted(glob.glob(self.src))
+
+    def _new_files(self, all_files: list[str]) -> list[str]:
+        """
+        Returns the files to scan: unprocessed files in per-file mode, or files modified since
+        the previous run with a value watermark. The newest file of the previous run is scanned
+        again, so appends within the resolution of the modification time are not missed.
+        """
+        if self.column is None:
+            processed = self.watermark.processed_files(self.src)
+            return [file for file in all_files if file not in processed]
+        last_modified = self.watermark.get(self.src + self.MTIME_SUFFIX)
+        if last_modified is None:
+            return all_files
+        return [file for file in all_files if os.path.getmtime(file) >= last_modified]
+
+    def _check_column(self, schema: Optional[dict]):
+        """
+        Checks that the watermark column exists in the files.
+
+        Raises:
+            ValueError: If the column is missing.
+        """
+        if self.column is not None and schema is not None and self.column not in schema:
+            raise ValueError(f"Watermark column '{self.column}' does not exist in {self.src}. "
+                             f"Available columns: {list(schema)}.")
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Estimates the new data from the metadata of the files that were not processed yet.
+        With a value watermark all modified files are counted, so the row count is an upper bound.
+        """
+        all_files = self._files()
+        files = self._new_files(all_files)
+        if all_files:
+            try:
+                self._check_column(estimate_file(all_files[-1]).schema)
+            except ValueError as e:
+                raise PlanError(f"LoadNewData: {e}") from e
+        if not files:
+            return Estimate(estimate_file(all_files[-1]).schema, 0) if all_files else Estimate(self.schema, 0)
+
+        estimates = [estimate_file(file) for file in files]
+        rows = None if any(e.rows is None for e in estimates) else sum(e.rows for e in estimates)
+        return Estimate(estimates[0].schema, rows)
+
+    def use(self) -> DF:
+        """
+        Loads new rows and stages the updated watermark.
+
+        Returns:
+            DF: The new data. Empty if nothing new arrived.
+        """
+        all_files = self._files()
+        # Modification times are taken before the scan, so files changing during the run are scanned again
+        modified = max((os.path.getmtime(file) for file in all_files), default=None)
+        files = self._new_files(all_files)
+        self.log(f"Found {len(files)} file(s) to scan in {self.src}.", level="INFO")
+
+        if not files:
+            return _encode_loaded(self._empty(all_files))
+
+        try:
+            query = pl.concat([_scan(file) for file in files], how="diagonal_relaxed")
+            self._check_column(query.collect_schema())
+            if self.column is not None:
+                last = self.watermark.get(self.src)
+                if last is not None:
+                    self.log(f"Loading rows with '{self.column}' > {last}.", level="INFO")
+                    query = query.filter(pl.col(self.column) > last)
+            data = collect_sampled(query)
+            if data.width == 0:
+                # A sampler that saw no rows does not know the schema of the query
+                data = pl.DataFrame(schema=query.collect_schema())
+        except Exception as e:
+            self.log(f"Failed to load new data from {self.src}: {e}", level="ERROR")
+            raise
+
+        if Sampler.active() is not None:
+            # A sampled run must not mark the rows it skipped as processed
+            self.log("Sampling is active, the watermark is not advanced.", level="WARNING")
+        elif self.column is None:
+            self.watermark.stage_files(self.src, files)
+        else:
+            if data.height:
+                self.watermark.stage(self.src, data.get_column(self.column).max())
+            self.watermark.stage(self.src + self.MTIME_SUFFIX, modified)
+
+        self.log(f"Loaded {data.height} new row(s) from {self.src}.", level="INFO")
+        return _encode_loaded(data)
@@ -0,0 +1,159 @@
+from MLTest.interfaces.Components import ImportComponent
+from MLTest.interfaces.Typing import DF
+from MLTest.components.filesystem.Input import _scan
+from MLTest.core.Watermarks import WatermarkStore
+from MLTest.core.Streaming import MicroBatch
+from MLTest.core.Planning import Estimate
+from MLTest.core.Sampling import collect_sampled
+from typing import Optional
+import polars as pl
+import threading
+import fnmatch
+import time
+import os
+
+
+class StreamDirectory(ImportComponent):
+    """
+    Streaming source over a landing (spool) directory receiving small CSV, NDJSON, JSON or
+    Parquet files. New files are grouped into micro-batches, closed as soon as `max_files` or
+    `max_bytes` is reached, or `max_delay` seconds after the oldest waiting file was seen.
+
+    Only files not yet committed as processed in the WatermarkStore are read, so history is
+    never re-read. Writers should land files atomically (write a hidden or `.tmp` file, then
+    rename it); hidden and `.tmp` files are ignored.
+
+    Used with `StreamRunner` for continuous processing, or as a regular ImportComponent whose
+    `use` returns the next micro-batch and stages its files like `LoadNewData`.
+    """
+    def __init__(self, src: str, watermark: WatermarkStore, pattern: str = "*", max_files: int = 100,
+                 max_bytes: int = 64 * 1024 * 1024, max_delay: float = 1.0, poll_interval: float = 0.2,
+                 log: bool = False):
+        """
+        Initializes the StreamDirectory component.
+
+        Parameters:
+        - src (str): Landing directory.
+        - watermark (WatermarkStore): Store of processed files.
+        - pattern (str): Glob pattern of file names to pick up (default: "*").
+        - max_files (int): Maximum number of files per batch (default: 100).
+        - max_bytes (int): Maximum size of a batch in bytes (default: 64 MiB).
+        - max_delay (float): Maximum seconds a landed file waits for its batch to fill up (default: 1.0).
+        - poll_interval (float): Seconds between directory listings (default: 0.2).
+        """
+        super().__init__(src, log)
+        self.key = src
+        self.watermark = watermark
+        self.pattern = pattern
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.first_seen = {}
+        self.claimed = set()
+        self._lock = threading.Lock()
+
+    def _landed(self) -> dict:
+        """
+        Lists the landed files that are neither processed nor claimed by a batch, with their sizes.
+        """
+        processed = self.watermark.processed_files(self.key)
+        landed = {}
+        for entry in os.scandir(self.src):
+            if (not entry.is_file() or entry.name.startswith(".") or entry.name.endswith(".tmp")
+                    or not fnmatch.fnmatch(entry.name, self.pattern)):
+                continue
+            if entry.path not in processed and entry.path not in self.claimed:
+                landed[entry.path] = entry.stat().st_size
+        return landed
+
+    def poll(self) -> Optional[MicroBatch]:
+        """
+        Lists the landing directory once and returns a closed batch, or None if no batch is due yet.
+        """
+        now = time.time()
+        with self._lock:
+            landed = self._landed()
+            for path in landed:
+                self.first_seen.setdefault(path, now)
+            self.first_seen = {path: seen for path, seen in self.first_seen.items() if path in landed}
+            if not landed:
+                return None
+
+            waiting = sorted(landed, key=lambda path: (self.first_seen[path], path))
+            files, size = [], 0
+            for path in waiting:
+                if files and (len(files) >= self.max_files or size + landed[path] > self.max_bytes):
+                    break
+                files.append(path)
+                size += landed[path]
+
+            full = len(files) >= self.max_files or size >= self.max_bytes or len(files) < len(waiting)
+            if not full and now - self.first_seen[waiting[0]] < self.max_delay:
+                return None
+
+            batch = MicroBatch(files, size, min(self.first_seen[path] for path in files))
+            self.claimed.update(files)
+            return batch
+
+    def next_batch(self, timeout: Optional[float] = None) -> Optional[MicroBatch]:
+        """
+        Polls until a batch is due or `timeout` seconds passed (None waits indefinitely).
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            batch = self.poll()
+            if batch is not None:
+                return batch
+            if deadline is not None and time.time() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def claim(self, batch: MicroBatch):
+        """
+        Excludes the files of a batch from new batches (used when replaying an open batch).
+        """
+        with self._lock:
+            self.claimed.update(batch.files)
+
+    def release(self, batch: MicroBatch):
+        """
+        Removes the claim on the files of a finished or abandoned batch. Committed files stay
+        excluded through the WatermarkStore.
+        """
+        with self._lock:
+            self.claimed.difference_update(batch.files)
+
+    def read(self, batch: MicroBatch) -> DF:
+        """
+        Reads the files of a batch into one DataFrame.
+        """
+        self.log(f"Reading batch {batch.id} ({len(batch.files)} file(s), {batch.size} bytes).", level="INFO")
+        try:
+            return collect_sampled(pl.concat([_scan(file) for file in batch.files], how="diagonal_relaxed"))
+        except Exception as e:
+            self.log(f"Failed to read batch {batch.id}: {e}", level="ERROR")
+            raise
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        The content of future batches is unknown.
+        """
+        return Estimate()
+
+    def use(self) -> DF:
+        """
+        Waits up to `max_delay` for the next micro-batch, reads it and stages its files as processed.
+
+        Returns:
+            DF: The batch data. Empty if no file landed.
+        """
+        batch = self.next_batch(timeout=self.max_delay)
+        if batch is None:
+            self.log(f"No new files in {self.src}.", level="INFO")
+            return pl.DataFrame()
+        data = self.read(batch)
+        # The files stay claimed, so a later call in this process does not read them again
+        self.watermark.stage_files(self.key, batch.files)
+        self.log(f"Loaded {data.height} row(s) from batch {batch.id}.", level="INFO")
+        return data
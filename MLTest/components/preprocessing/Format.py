@@ -1,10 +1,14 @@
 from MLTest.interfaces.Components import FlowComponent
 from MLTest.interfaces.Typing import DF
+from MLTest.core.Cardinality import use_dedup, map_unique
+from MLTest.core.Planning import Estimate
+from typing import Optional
 import polars as pl
 
 
 class FormatDate(FlowComponent):
-    def __init__(self, columns: list[str], format: str, strict: bool = False, log: bool = False):
+    def __init__(self, columns: list[str], format: str, strict: bool = False, dedup: Optional[bool] = None,
+                 dedup_threshold: float = 0.05, log: bool = False):
         """
         Initializes the DateParsingComponent.
         
@@ -12,11 +16,27 @@ class FormatDate(FlowComponent):
         - columns (list[str]): List of column names to parse as dates.
         - format (str): The date format to use for parsing (e.g., "%m/%Y").
         - strict (bool): Whether to enforce strict date parsing. Defaults to False.
+        - dedup (Optional[bool]): Parse only the unique values of a column and map the results back.
+                                  None (default) switches it on per column when the estimated
+                                  distinct ratio is below `dedup_threshold`.
+        - dedup_threshold (float): Distinct ratio below which dedup mode is used automatically.
         """
         super().__init__(log)
         self.columns = columns
         self.format = format
         self.strict = strict
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that the date columns exist as strings and declares them as Date.
+        """
+        estimate = estimate or Estimate()
+        estimate.require_type(self.columns, [pl.Utf8], self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        return estimate.with_schema({**estimate.schema, **{column: pl.Date for column in self.columns}})
 
     def use(self, data: DF) -> DF:
         """
@@ -34,11 +54,12 @@ class FormatDate(FlowComponent):
         for column in self.columns:
             self.log(f"Parsing column '{column}' as a date.", level="INFO")
             try:
-                data = data.with_columns(
-                    pl.col(column)
-                    .str.strptime(pl.Date, format=self.format, strict=self.strict)
-                    .alias(column)
-                )
+                parse = pl.col(column).str.strptime(pl.Date, format=self.format, strict=self.strict)
+                if use_dedup(data, column, self.dedup, self.dedup_threshold):
+                    self.log(f"Parsing unique values of column '{column}' and mapping them back.", level="INFO")
+                    data = map_unique(data, column, {column: parse})
+                else:
+                    data = data.with_columns(parse.alias(column))
                 self.log(f"Successfully parsed column '{column}'.", level="INFO")
             except Exception as e:
                 self.log(f"Failed to parse column '{column}' as a date: {e}", level="ERROR")
@@ -72,6 +93,30 @@ class GenerateTimeStamp(FlowComponent):
         self.second_col = second_col
         self.format = format
 
+    def _format_columns(self) -> dict:
+        """
+        Maps the format specifiers to the columns providing them.
+        """
+        return {
+            "%Y": self.year_col,
+            "%m": self.month_col,
+            "%d": self.day_col,
+            "%H": self.hour_col,
+            "%M": self.minute_col,
+            "%S": self.second_col
+        }
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that all columns required by the format exist and declares the 'Datetime' column.
+        """
+        estimate = estimate or Estimate()
+        format_to_column = self._format_columns()
+        estimate.require([format_to_column[s] for s in format_to_column if s in self.format], self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        return estimate.with_schema({**estimate.schema, "Datetime": pl.Datetime})
+
     def use(self, data: DF) -> DF:
         """
         Validates and generates a timestamp column using the provided year, month, day, hour, minute, and second columns.
@@ -85,14 +130,7 @@ class GenerateTimeStamp(FlowComponent):
         self.log(f"Starting timestamp generation with format: '{self.format}'.", level="INFO")
         
         # Mapping of format specifiers to required columns
-        format_to_column = {
-            "%Y": self.year_col,
-            "%m": self.month_col,
-            "%d": self.day_col,
-            "%H": self.hour_col,
-            "%M": self.minute_col,
-            "%S": self.second_col
-        }
+        format_to_column = self._format_columns()
 
         # Extract format specifiers from the format string
         used_specifiers = [specifier for specifier in format_to_column if specifier in self.format]
@@ -142,7 +180,8 @@ class GenerateTimeStamp(FlowComponent):
 
 
 class SplitTimeColumn(FlowComponent):
-    def __init__(self, time_col: str, time_format: str = "%H:%M:%S", log: bool = False):
+    def __init__(self, time_col: str, time_format: str = "%H:%M:%S", dedup: Optional[bool] = None,
+                 dedup_threshold: float = 0.05, log: bool = False):
         """
         Initializes the SplitTimeColumn component.
 
@@ -152,10 +191,27 @@ class SplitTimeColumn(FlowComponent):
                             Examples:
                               - "%H:%M" for hours and minutes only.
                               - "%H:%M:%S" for hours, minutes, and seconds.
+        - dedup (Optional[bool]): Split only the unique time strings and map the results back.
+                                  None (default) decides from the estimated distinct ratio.
+        - dedup_threshold (float): Distinct ratio below which dedup mode is used automatically.
         """
         super().__init__(log)
         self.time_col = time_col
         self.time_format = time_format
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that the time column exists as a string and declares the extracted components.
+        """
+        estimate = estimate or Estimate()
+        estimate.require_type([self.time_col], [pl.Utf8], self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        specifiers = {"%H": "Hour", "%M": "Minute", "%S": "Second"}
+        components = {name: pl.Int64 for specifier, name in specifiers.items() if specifier in self.time_format}
+        return estimate.with_schema({**estimate.schema, **components})
 
     def use(self, data: DF) -> DF:
         """
@@ -197,7 +253,11 @@ class SplitTimeColumn(FlowComponent):
 
         # Add new columns to the DataFrame
         self.log("Adding extracted time components to the DataFrame.", level="INFO")
-        data = data.with_columns([col.alias(name) for name, col in new_columns.items()])
+        if use_dedup(data, self.time_col, self.dedup, self.dedup_threshold):
+            self.log(f"Splitting unique values of column '{self.time_col}' and mapping them back.", level="INFO")
+            data = map_unique(data, self.time_col, new_columns)
+        else:
+            data = data.with_columns([col.alias(name) for name, col in new_columns.items()])
 
         self.log(f"Successfully created columns: {list(new_columns.keys())}.", level="INFO")
         return data
@@ -1,41 +1,199 @@
 from MLTest.interfaces.Components import AggregatorComponent
 from MLTest.interfaces.Typing import DF
-from typing import List
+from MLTest.core.Planning import Estimate, PlanError
+from MLTest.core.Memory import MemoryMonitor, SpillableFrame
+from typing import Iterator, List, Optional, Union
 import polars as pl
+import tempfile
+import shutil
+import math
+import os
+
+
+def _schema(frame: Union[DF, pl.LazyFrame]) -> dict:
+    """
+    Returns the schema of an eager or lazy frame.
+    """
+    return frame.collect_schema() if isinstance(frame, pl.LazyFrame) else frame.schema
+
+
+def _is_text(dtype: Optional[pl.DataType]) -> bool:
+    """
+    Returns True for string, categorical and enum types.
+    """
+    return dtype in (pl.Utf8, pl.String, pl.Categorical) or isinstance(dtype, pl.Enum)
 
 
 class MergeStorage(AggregatorComponent):
     """
     A component that accepts an array of dataframes and merges them into a single dataframe.
+
+    Joins are applied in input order: the first input is joined with the second, the result
+    with the third, and so on. Every join can have its own spec (see `specs`): equi joins
+    (inner, outer, left, right) on one or more key columns, semi and anti joins that filter
+    the left side without adding columns or rows, and as-of joins that attach the row of the
+    right input in effect at a time (the nearest preceding one by default), optionally
+    matched on group columns (e.g. the credit limit of a `User` at the transaction `Datetime`).
+    As-of joins sort the left side by the time column.
+
+    Joins can run partitioned (out-of-core): every input is hash-partitioned on the key into
+    Arrow IPC files and the join runs partition by partition, so only one partition of every
+    input is joined in memory at a time. Keys with more rows in the first input than
+    `heavy_hitter_rows` are split into chunks of at most that many rows, each joined with all
+    matching rows of the other inputs. The row order of a partitioned join differs from the
+    in-memory join. Partitioning requires all joins to share the same key columns (the `by`
+    columns of as-of joins).
+
+    The partitioned join streams the joined partitions to disk and never changes the input list:
+    it drops its own references to every input once the input is partitioned, so inputs the
+    caller no longer holds are freed during the join. `use` reads all joined partitions back
+    into the returned frame, so its peak memory still includes the full result. For joins whose
+    result does not fit into memory, pass the inputs to `join_to_files` or hand `iter_join` to
+    the next stage instead.
     """
-    def __init__(self, how: str = "concat", on = None, log:bool = False):
+    JOIN_TYPES = ["inner", "outer", "left", "right", "semi", "anti", "asof"]
+    # Assumed ratio of the in-memory join peak to the size of its inputs
+    JOIN_FACTOR = 3
+
+    def __init__(self, how: str = "concat", on: Union[str, List[str], None] = None, specs: Optional[List[dict]] = None,
+                 partitioned: Optional[bool] = None, memory_threshold: Optional[int] = None,
+                 partitions: Optional[int] = None, heavy_hitter_rows: Optional[int] = None,
+                 spill_dir: Optional[str] = None, log:bool = False):
         """
         Initializes the MergeStorage component.
 
         Parameters:
-        - how (str): The merge method, either "concat" for vertical concatenation or
-                     "join-inner", "join-outer", "join-left", or "join-right" for joins.
-        - on (Optional[str]): The column name to join on (required if `how` is one of the join methods).
+        - how (str): The merge method, either "concat" for vertical concatenation or "join-inner",
+                     "join-outer", "join-left", "join-right", "join-semi" or "join-anti" for joins.
+        - on (Union[str, List[str], None]): The column name(s) to join on (required if `how` is one
+                     of the join methods and no `specs` are given).
+        - specs (Optional[List[dict]]): One join spec per input after the first, overriding `how` and `on`:
+            - "how": "inner", "outer", "left", "right", "semi", "anti" or "asof" (the "join-" prefix is optional),
+            - "on": key column(s), or the sorted time column of an as-of join,
+            - "by": group column(s) matched exactly by an as-of join (default: none),
+            - "strategy": as-of direction, "backward" (default), "forward" or "nearest",
+            - "tolerance": maximum as-of distance, e.g. "30d" (default: none).
+        - partitioned (Optional[bool]): Force the partitioned join (True) or the in-memory join (False).
+          By default, the partitioned join is used when the estimated join size (input size times
+          JOIN_FACTOR) exceeds `memory_threshold`.
+        - memory_threshold (Optional[int]): Bytes above which joins run partitioned. Defaults to the
+          budget of the active MemoryMonitor, if any.
+        - partitions (Optional[int]): Number of partitions. Defaults to twice the estimated join size
+          divided by the threshold (at least 2).
+        - heavy_hitter_rows (Optional[int]): Rows of a key in the first input above which the key is
+          split. Defaults to the expected rows of one partition.
+        - spill_dir (Optional[str]): Directory for partition files. Defaults to the system temporary directory.
         """
         super().__init__(log)
+        self.partitioned = partitioned
+        self.memory_threshold = memory_threshold
+        self.partitions = partitions
+        self.heavy_hitter_rows = heavy_hitter_rows
+        self.spill_dir = spill_dir
+        self.specs = None
         # Validate the `how` parameter
-        if how == "concat":
+        if specs is not None:
+            self.specs = [self._normalize(spec) for spec in specs]
+            self.how = "join"
+            self.on = None
+        elif how == "concat":
             self.how = "concat"
             self.on = None  # `on` is not needed for concatenation
         elif how.startswith("join-"):
             join_type = how.split("-")[1]
-            if join_type not in ["inner", "outer", "left", "right"]:
-                raise ValueError(f"Unsupported join type '{join_type}'. Supported types: inner, outer, left, right.")
+            if join_type not in self.JOIN_TYPES[:-1]:
+                raise ValueError(f"Unsupported join type '{join_type}'. Supported types: inner, outer, left, right, semi, anti. Use `specs` for as-of joins.")
             if on is None:
                 raise ValueError("A column name must be specified in `on` for joining.")
             self.how = join_type
             self.on = on
         else:
-            raise ValueError(f"Unsupported merge method '{how}'. Use 'concat' or 'join-[type]' where [type] is inner, outer, left, or right.")
+            raise ValueError(f"Unsupported merge method '{how}'. Use 'concat' or 'join-[type]' where [type] is inner, outer, left, right, semi or anti.")
+
+    def _normalize(self, spec: dict) -> dict:
+        """
+        Validates a join spec and fills in its defaults.
+        """
+        how = spec.get("how", "inner").removeprefix("join-")
+        if how not in self.JOIN_TYPES:
+            raise ValueError(f"Unsupported join type '{how}'. Supported types: {', '.join(self.JOIN_TYPES)}.")
+        on = spec.get("on")
+        if on is None:
+            raise ValueError(f"Join spec {spec} must specify `on`.")
+        if how == "asof" and not isinstance(on, str):
+            raise ValueError(f"As-of join spec {spec} must specify a single time column in `on`.")
+        by = spec.get("by") or []
+        return {
+            "how": how,
+            "on": on if how == "asof" else ([on] if isinstance(on, str) else list(on)),
+            "by": [by] if isinstance(by, str) else list(by),
+            "strategy": spec.get("strategy", "backward"),
+            "tolerance": spec.get("tolerance"),
+        }
+
+    def _spec(self, i: int) -> dict:
+        """
+        Returns the normalized spec of the join with input `i` (i >= 1).
+        """
+        if self.specs is not None:
+            if i > len(self.specs):
+                raise ValueError(f"MergeStorage received {i + 1} or more inputs but only {len(self.specs)} join spec(s).")
+            return self.specs[i - 1]
+        return self._normalize({"how": self.how, "on": self.on})
+
+    @staticmethod
+    def _keys(spec: dict) -> List[str]:
+        """
+        Returns the columns matched exactly by a join: the keys, or the `by` columns of an as-of join.
+        """
+        return spec["by"] if spec["how"] == "asof" else spec["on"]
+
+    def plan(self, estimate: List[Estimate] = None) -> Estimate:
+        """
+        Estimates the merged schema and row count. Checks that join keys exist in every
+        input and have the same type.
+        """
+        estimates = estimate or []
+        if not estimates:
+            return Estimate()
+        rows = [e.rows for e in estimates]
+
+        if self.how == "concat":
+            return Estimate(estimates[0].schema, None if None in rows else sum(rows))
+
+        result = estimates[0]
+        for i, e in enumerate(estimates[1:], start=1):
+            spec = self._spec(i)
+            columns = self._keys(spec) + ([spec["on"]] if spec["how"] == "asof" else [])
+            result.require(columns, f"MergeStorage (input 0..{i - 1})")
+            e.require(columns, f"MergeStorage (input {i})")
+            if result.schema is not None and e.schema is not None:
+                for column in columns:
+                    if result.schema[column] != e.schema[column]:
+                        raise PlanError(f"MergeStorage: join column '{column}' has conflicting types "
+                                        f"{sorted({str(result.schema[column]), str(e.schema[column])})}.")
+
+            if spec["how"] in ["semi", "anti"]:
+                continue
+            row_count = None if result.rows is None or e.rows is None else max(result.rows, e.rows)
+            if spec["how"] == "asof":
+                row_count = result.rows
+            if result.schema is None or e.schema is None:
+                result = Estimate(rows=row_count)
+                continue
+            schema = dict(result.schema)
+            for column, dtype in e.schema.items():
+                if column in columns:
+                    continue
+                schema[column if column not in schema else f"{column}_right"] = dtype
+            result = Estimate(schema, row_count)
+        return result
 
     def use(self, data: List[DF]) -> DF:
         """
         Merges the provided dataframes based on the specified method during initialization.
+        A partitioned join still returns the full result as one frame; use `join_to_files` or
+        `iter_join` when the result itself does not fit into memory.
 
         Parameters:
         - data (List[pl.DataFrame]): The list of dataframes to merge.
@@ -43,10 +201,17 @@ class MergeStorage(AggregatorComponent):
         Returns:
         - pl.DataFrame: The merged dataframe.
         """
-        self.log(f"Starting merge operation with method '{self.how}' and key '{self.on}' (if applicable).", level="INFO")
+        self.log(f"Starting merge operation with method '{self.how}' and key '{self.on if self.specs is None else self.specs}' (if applicable).", level="INFO")
         
-        # Ensure that all elements in `data` are of type `pl.DataFrame`
-        if not all(isinstance(df, DF) for df in data):
+        # Ensure that all elements in `data` are of type `pl.DataFrame`. Spillable inputs are
+        # checked through their handles: spilled frames were written as IPC, so they are frames
+        # and are not reloaded just for the check.
+        handles = getattr(data, "handles", None)
+        if handles is not None:
+            valid = all(handle.spilled or isinstance(handle.get(), DF) for handle in handles)
+        else:
+            valid = all(isinstance(df, DF) for df in data)
+        if not valid:
             error_message = "All items in `data` must be Polars DataFrame instances."
             self.log(error_message, level="ERROR")
             raise TypeError(error_message)
@@ -57,15 +222,249 @@ class MergeStorage(AggregatorComponent):
                 self.log("Performing vertical concatenation of dataframes.", level="INFO")
                 result = pl.concat(data)
                 self.log("Concatenation completed successfully.", level="INFO")
+            elif self._use_partitioned(data) and self._partition_keys(len(data)) is not None:
+                # The joined partitions go to disk while the join runs, and the result is read back
+                # once the partition files of the inputs are gone
+                directory = tempfile.mkdtemp(prefix="mltest-join-result-", dir=self.spill_dir)
+                try:
+                    paths = self.join_to_files(data, directory)
+                    result = pl.concat([pl.scan_ipc(path) for path in paths], how="vertical_relaxed").collect()
+                finally:
+                    shutil.rmtree(directory, ignore_errors=True)
+                self.log("Partitioned join completed successfully.", level="INFO")
             else:
-                # Perform the join on the specified key
-                self.log(f"Performing join operation with key '{self.on}' using '{self.how}' method.", level="INFO")
-                result = data[0]
-                for i, df in enumerate(data[1:], start=1):
-                    self.log(f"Joining DataFrame {i} on column '{self.on}' using '{self.how}' method.", level="INFO")
-                    result = result.join(df, on=self.on, how=self.how)
+                # Perform the joins in input order
+                self.log("Performing join operations in input order.", level="INFO")
+                result = self._join(data, log=True)
                 self.log("Join operation completed successfully.", level="INFO")
             return result
         except Exception as e:
             self.log(f"Merge operation failed: {e}", level="ERROR")
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def _key_types(schemas: List[dict], keys: List[str]) -> dict:
+        """
+        Returns the common type of key columns that are categorical in some inputs and plain
+        strings (or another categorical type) in others, as happens when the loaders encode only
+        the inputs where a column qualifies. String keys are cast to Categorical, which the global
+        string cache matches across inputs; other mixes fall back to String.
+        """
+        types = {}
+        for key in keys:
+            dtypes = {schema.get(key) for schema in schemas}
+            if len(dtypes) < 2 or not all(_is_text(dtype) for dtype in dtypes):
+                continue
+            categorical = all(dtype == pl.String or dtype == pl.Categorical for dtype in dtypes)
+            types[key] = pl.Categorical if categorical else pl.String
+        return types
+
+    @staticmethod
+    def _cast_keys(df: Union[DF, pl.LazyFrame], types: dict) -> Union[DF, pl.LazyFrame]:
+        """
+        Casts the key columns of a frame to the types returned by `_key_types`.
+        """
+        casts = [pl.col(key).cast(dtype) for key, dtype in types.items() if _schema(df).get(key) != dtype]
+        return df.with_columns(casts) if casts else df
+
+    def _join(self, frames: List[Union[DF, pl.LazyFrame]], log: bool = False) -> Union[DF, pl.LazyFrame]:
+        """
+        Joins the frames (all eager or all lazy) one after another according to their specs.
+        """
+        result = frames[0]
+        for i, df in enumerate(frames[1:], start=1):
+            spec = self._spec(i)
+            types = self._key_types([_schema(result), _schema(df)], self._keys(spec))
+            result, df = self._cast_keys(result, types), self._cast_keys(df, types)
+            if log:
+                self.log(f"Joining DataFrame {i} on {spec['on']} using '{spec['how']}' method.", level="INFO")
+            if spec["how"] == "asof":
+                result = result.sort(spec["on"]).join_asof(
+                    df.sort(spec["on"]), on=spec["on"], by=spec["by"] or None, strategy=spec["strategy"],
+                    tolerance=spec["tolerance"], check_sortedness=False,
+                )
+            elif spec["how"] == "outer":
+                # Polars calls the outer join "full"; keys are coalesced like in the other joins
+                result = result.join(df, on=spec["on"], how="full", coalesce=True)
+            else:
+                result = result.join(df, on=spec["on"], how=spec["how"])
+        return result
+
+    def _partition_keys(self, inputs: int) -> Optional[List[str]]:
+        """
+        Returns the key columns shared by all joins, or None if the joins cannot be partitioned.
+        """
+        keys = [self._keys(self._spec(i)) for i in range(1, inputs)]
+        if not keys or not keys[0] or any(sorted(k) != sorted(keys[0]) for k in keys):
+            self.log("Joins do not share the same key columns, falling back to the in-memory join.", level="WARNING")
+            return None
+        return keys[0]
+
+    def _threshold(self) -> Optional[int]:
+        """
+        Returns the memory threshold of the partitioned join, falling back to the active memory budget.
+        """
+        if self.memory_threshold is not None:
+            return self.memory_threshold
+        monitor = MemoryMonitor.active()
+        return monitor.budget if monitor is not None else None
+
+    @staticmethod
+    def _input_bytes(data: List[DF]) -> int:
+        """
+        Returns the size of the inputs, without reloading spilled inputs.
+        """
+        handles = getattr(data, "handles", None)
+        if handles is not None:
+            return sum(handle.size for handle in handles)
+        return sum(df.estimated_size() for df in data)
+
+    def _use_partitioned(self, data: List[DF]) -> bool:
+        """
+        Decides between the partitioned and the in-memory join.
+        """
+        if self.how == "concat":
+            return False
+        if self.partitioned is not None:
+            return self.partitioned
+        threshold = self._threshold()
+        return threshold is not None and self._input_bytes(data) * self.JOIN_FACTOR > threshold
+
+    def _partition_count(self, data: List[DF]) -> int:
+        """
+        Returns the number of partitions of a partitioned join.
+        """
+        if self.partitions is not None:
+            return self.partitions
+        threshold = self._threshold()
+        if not threshold:
+            return 16
+        # Every partition gets half of the threshold, the rest is left to the partitioning pass
+        return max(2, math.ceil(2 * self._input_bytes(data) * self.JOIN_FACTOR / threshold))
+
+    @staticmethod
+    def _take(inputs: list, i: int) -> DF:
+        """
+        Returns input `i` of the component's own copy of the input list and drops the copy's
+        reference to it. Spillable inputs are reloaded if spilled; their handles stay with the
+        storage component that tracks them.
+        """
+        item, inputs[i] = inputs[i], None
+        return item.get() if isinstance(item, SpillableFrame) else item
+
+    @staticmethod
+    def _partition_ids(df: DF, keys: List[str], heavy: DF, partitions: int) -> pl.Series:
+        """
+        Returns the partition of every row of a frame, or -1 for the rows of heavy-hitter keys.
+        """
+        partition = (pl.struct(keys).hash(seed=0) % partitions).cast(pl.Int32)
+        query = df.lazy().select(keys)
+        if heavy.height:
+            flags = heavy.lazy().with_columns(pl.lit(True).alias("__heavy"))
+            query = query.join(flags, on=keys, how="left", nulls_equal=True, maintain_order="left")
+            partition = pl.when(pl.col("__heavy")).then(pl.lit(-1, dtype=pl.Int32)).otherwise(partition)
+        # Streaming keeps the intermediate hashes to one batch at a time
+        return query.select(partition.alias("__partition")).collect(engine="streaming").to_series()
+
+    def _partitioned(self, data: List[DF], lazy: bool) -> Iterator[Union[DF, pl.LazyFrame]]:
+        """
+        Writes the inputs to partition files and yields the join of every partition, read eagerly
+        or scanned lazily. The input list itself is left unchanged.
+        """
+        keys = self._partition_keys(len(data))
+        if keys is None:
+            raise ValueError("A partitioned join requires all joins to share the same key columns.")
+        partitions = self._partition_count(data)
+        handles = getattr(data, "handles", None)
+        # A shallow copy whose references are dropped input by input
+        inputs = list(handles) if handles is not None else list(data)
+        del data
+        directory = tempfile.mkdtemp(prefix="mltest-join-", dir=self.spill_dir)
+        self.log(f"Performing partitioned join on {keys} with {partitions} partitions in {directory}.", level="INFO")
+
+        def path(i: int, name) -> str:
+            return os.path.join(directory, f"input-{i}-{name}.arrow")
+
+        try:
+            # Keys must have the same type in every input to hash into the same partition
+            types = self._key_types([item.schema for item in inputs], keys)
+
+            count, schemas, chunks, heavy = len(inputs), [], 0, None
+            for i in range(count):
+                df = self._cast_keys(self._take(inputs, i), types)
+                schemas.append(df.schema)
+                if i == 0:
+                    limit = self.heavy_hitter_rows or max(df.height // partitions, 1)
+                    heavy = (df.lazy().group_by(keys).len().filter(pl.col("len") > limit).select(keys)
+                             .collect(engine="streaming"))
+                    if heavy.height:
+                        self.log(f"Splitting {heavy.height} heavy-hitter key(s) into chunks of {limit} rows.", level="INFO")
+
+                # Partitions are streamed to disk, so no partition is materialized next to the input
+                query = df.lazy().with_columns(self._partition_ids(df, keys, heavy, partitions))
+                for partition in range(partitions):
+                    query.filter(pl.col("__partition") == partition).drop("__partition").sink_ipc(path(i, partition))
+
+                if heavy.height:
+                    rows = query.filter(pl.col("__partition") == -1).drop("__partition")
+                    if i == 0:
+                        # Chunks of at most `limit` rows per heavy key
+                        rows = rows.with_columns((pl.int_range(pl.len()).over(keys) // limit).alias("__chunk")).collect()
+                        for (chunk,), part in rows.partition_by("__chunk", as_dict=True).items():
+                            part.drop("__chunk").write_ipc(path(i, f"heavy-{chunk}"), compression="uncompressed")
+                            chunks = max(chunks, chunk + 1)
+                    else:
+                        rows.sink_ipc(path(i, "heavy"))
+                    del rows
+                del df, query
+
+            def read(i: int, name) -> Union[DF, pl.LazyFrame]:
+                if not os.path.exists(path(i, name)):
+                    frame = pl.DataFrame(schema=schemas[i])
+                    return frame.lazy() if lazy else frame
+                return pl.scan_ipc(path(i, name)) if lazy else pl.read_ipc(path(i, name))
+
+            for partition in range(partitions):
+                yield self._join([read(i, partition) for i in range(count)])
+            for chunk in range(chunks):
+                yield self._join([read(0, f"heavy-{chunk}")] + [read(i, "heavy") for i in range(1, count)])
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def iter_join(self, data: List[DF]) -> Iterator[DF]:
+        """
+        Runs the join partition by partition and yields the joined partitions, so the result can
+        be streamed to the next stage, e.g. `PipelinedExecutor(...).stream(merge.iter_join(inputs))`,
+        without ever being held in memory as a whole.
+
+        Every input is written to partition files and the join drops its reference to it, so
+        inputs the caller no longer holds (e.g. `merge.iter_join([load(a), load(b)])`) are freed
+        and only one partition of every input is in memory during the join. `data` is not modified.
+
+        Parameters:
+        - data (List[pl.DataFrame]): The list of dataframes to join.
+
+        Yields:
+        - pl.DataFrame: The joined rows of one partition (or one chunk of a heavy-hitter key).
+        """
+        return self._partitioned(data, lazy=False)
+
+    def join_to_files(self, data: List[DF], directory: str) -> List[str]:
+        """
+        Runs the partitioned join and streams every joined partition into an uncompressed Arrow
+        IPC file in `directory`, so neither the joined partitions nor the result are materialized.
+        The files can be scanned lazily with `pl.scan_ipc`. Drops its references to the inputs
+        like `iter_join`.
+
+        Returns:
+        - List[str]: The paths of the joined partitions, in join order.
+        """
+        os.makedirs(directory, exist_ok=True)
+        queries = self._partitioned(data, lazy=True)
+        del data
+        paths = []
+        for number, query in enumerate(queries):
+            path = os.path.join(directory, f"part-{number:05d}.arrow")
+            query.sink_ipc(path)
+            paths.append(path)
+        return paths
@@ -1,10 +1,14 @@
 from MLTest.interfaces.Components import FlowComponent
 from MLTest.interfaces.Typing import DF
+from MLTest.core.Cardinality import use_dedup, map_unique
+from MLTest.core.Planning import Estimate
+from typing import Optional
 import polars as pl
 
 
 class ReplaceStringPattern(FlowComponent):
-    def __init__(self, columns: list[str], pattern: str, replace: str, is_regex: bool = True, log: bool = False):
+    def __init__(self, columns: list[str], pattern: str, replace: str, is_regex: bool = True,
+                 dedup: Optional[bool] = None, dedup_threshold: float = 0.05, log: bool = False):
         """
         Initializes the RegexReplace component.
         
@@ -13,12 +17,25 @@ class ReplaceStringPattern(FlowComponent):
         - pattern (str): The pattern to match. Can be a string or regex.
         - replace (str): The replacement string.
         - is_regex (bool): Whether the pattern is a regex pattern (True) or a literal string (False).
+        - dedup (Optional[bool]): Replace only in the unique values of a column and map the results back.
+                                  None (default) decides per column from the estimated distinct ratio.
+        - dedup_threshold (float): Distinct ratio below which dedup mode is used automatically.
         """
         super().__init__(log)
         self.columns = columns
         self.pattern = pattern
         self.replace = replace
         self.is_regex = is_regex
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that the columns exist and are strings. The schema is unchanged.
+        """
+        estimate = estimate or Estimate()
+        estimate.require_type(self.columns, [pl.Utf8], self.__class__.__name__)
+        return estimate
 
     def use(self, data: DF) -> DF:
         """
@@ -34,24 +51,26 @@ class ReplaceStringPattern(FlowComponent):
                  f"with replacement '{self.replace}' (is_regex={self.is_regex}).", level="INFO")
 
         transformations = []
+        deduplicated = {}
         for column in self.columns:
             if self.is_regex:
                 self.log(f"Applying regex replacement in column '{column}'.", level="INFO")
-                transformations.append(
-                    pl.col(column)
-                    .str.replace_all(self.pattern, self.replace)
-                    .alias(column)
-                )
+                transformation = pl.col(column).str.replace_all(self.pattern, self.replace)
             else:
                 self.log(f"Applying literal string replacement in column '{column}'.", level="INFO")
-                transformations.append(
-                    pl.col(column)
-                    .str.replace(self.pattern, self.replace, literal=True)
-                    .alias(column)
-                )
+                transformation = pl.col(column).str.replace(self.pattern, self.replace, literal=True)
+
+            if use_dedup(data, column, self.dedup, self.dedup_threshold):
+                self.log(f"Replacing in unique values of column '{column}' and mapping them back.", level="INFO")
+                deduplicated[column] = transformation
+            else:
+                transformations.append(transformation.alias(column))
 
         try:
-            data = data.with_columns(transformations)
+            for column, transformation in deduplicated.items():
+                data = map_unique(data, column, {column: transformation})
+            if transformations:
+                data = data.with_columns(transformations)
             self.log("Replacement operation completed successfully.", level="INFO")
         except Exception as e:
             self.log(f"Failed to apply replacements: {e}", level="ERROR")
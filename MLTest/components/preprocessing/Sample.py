@@ -0,0 +1,133 @@
+from MLTest.interfaces.Components import FlowComponent
+from MLTest.interfaces.Typing import DF
+from MLTest.core.Sampling import UserSampler, StratifiedSampler, ReservoirSampler
+from MLTest.core.Planning import Estimate
+from typing import Any, Dict, Optional
+import polars as pl
+
+
+class SampleUsers(FlowComponent):
+    """
+    Keeps all rows of a deterministic, hash-selected subset of the users (see `UserSampler`).
+    To avoid reading the other users at all, pass the sampler to `Sequence(sample=...)` instead.
+    """
+    def __init__(self, fraction: float, key: str = "User", seed: int = 0, log: bool = False):
+        """
+        Initializes the SampleUsers component.
+
+        Parameters:
+        - fraction (float): Fraction of the users to keep, in (0, 1].
+        - key (str): Key column (default: "User").
+        - seed (int): Hash seed selecting the users (default: 0).
+        """
+        super().__init__(log)
+        self.sampler = UserSampler(fraction, key, seed)
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that the key column exists. The schema is unchanged, the row count is scaled by the fraction.
+        """
+        estimate = estimate or Estimate()
+        estimate.require([self.sampler.key], self.__class__.__name__)
+        rows = None if estimate.rows is None else int(estimate.rows * self.sampler.fraction)
+        return Estimate(estimate.schema, rows, estimate.string_bytes)
+
+    def use(self, data: DF) -> DF:
+        """
+        Filters the rows of the sampled users.
+        """
+        try:
+            result = data.filter(self.sampler.expression())
+        except Exception as e:
+            self.log(f"Failed to sample users by '{self.sampler.key}': {e}", level="ERROR")
+            raise
+        self.log(f"Kept {result.height} of {data.height} row(s) of sampled users.", level="INFO")
+        return result
+
+
+class SampleByLabel(FlowComponent):
+    """
+    Downsamples rows per label value, e.g. keeps 5 % of the legitimate transactions and all
+    fraud rows (see `StratifiedSampler`).
+    """
+    def __init__(self, fractions: Dict[Any, float], label: str = "Is Fraud?", seed: int = 0,
+                 weight: Optional[str] = None, log: bool = False):
+        """
+        Initializes the SampleByLabel component.
+
+        Parameters:
+        - fractions (Dict[Any, float]): Label values mapped to the fraction of their rows to keep.
+          Rows of other values are all kept.
+        - label (str): Label column (default: "Is Fraud?").
+        - seed (int): Hash seed of the row selection (default: 0).
+        - weight (Optional[str]): Name of a column receiving the inverse sampling fraction (default: None).
+        """
+        super().__init__(log)
+        self.sampler = StratifiedSampler(fractions, label, seed, weight)
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that the label column exists and declares the weight column. The row count is unknown.
+        """
+        estimate = estimate or Estimate()
+        estimate.require([self.sampler.label], self.__class__.__name__)
+        schema = estimate.schema
+        if schema is not None and self.sampler.weight is not None:
+            schema = {**schema, self.sampler.weight: pl.Float64}
+        return Estimate(schema, None, estimate.string_bytes)
+
+    def use(self, data: DF) -> DF:
+        """
+        Filters the sampled rows of every label value.
+        """
+        try:
+            result = self.sampler.collect(data.lazy())
+        except Exception as e:
+            self.log(f"Failed to sample by label '{self.sampler.label}': {e}", level="ERROR")
+            raise
+        self.log(f"Kept {result.height} of {data.height} row(s) by label '{self.sampler.label}'.", level="INFO")
+        return result
+
+
+class SampleReservoir(FlowComponent):
+    """
+    Uniform sample of at most `size` rows (see `ReservoirSampler`). The reservoir persists across
+    calls: with chunked or streamed input (e.g. `PipelinedExecutor`, `StreamRunner`) every call adds
+    a chunk and returns the sample of all chunks seen so far. Call `reset` to start over.
+    """
+    def __init__(self, size: int, seed: int = 0, log: bool = False):
+        """
+        Initializes the SampleReservoir component.
+
+        Parameters:
+        - size (int): Number of rows to keep.
+        - seed (int): Seed of the random generator (default: 0).
+        """
+        super().__init__(log)
+        self.sampler = ReservoirSampler(size, seed)
+
+    def reset(self):
+        """
+        Empties the reservoir.
+        """
+        self.sampler.reset()
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        The schema is unchanged, the row count is at most `size`.
+        """
+        estimate = estimate or Estimate()
+        rows = self.sampler.size if estimate.rows is None else min(estimate.rows, self.sampler.size)
+        return Estimate(estimate.schema, rows, estimate.string_bytes)
+
+    def use(self, data: DF) -> DF:
+        """
+        Adds the rows to the reservoir and returns the current sample.
+        """
+        try:
+            result = self.sampler.add(data).result()
+        except Exception as e:
+            self.log(f"Failed to sample {data.height} row(s) into the reservoir: {e}", level="ERROR")
+            raise
+        self.log(f"Reservoir holds {result.height} of {self.sampler.seen} row(s) seen.", level="INFO")
+        return result
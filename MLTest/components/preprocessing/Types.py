@@ -1,5 +1,10 @@
 from MLTest.interfaces.Components import FlowComponent
 from MLTest.interfaces.Typing import DF
+from MLTest.core.Cardinality import estimate_distinct_ratio
+from MLTest.core.Planning import Estimate
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
 import polars as pl
 
 
@@ -15,6 +20,16 @@ class CastTypes(FlowComponent):
         super().__init__(log)
         self.columns_and_types = columns_and_types
 
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks that the columns exist and declares their target types.
+        """
+        estimate = estimate or Estimate()
+        estimate.require(self.columns_and_types, self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        return estimate.with_schema({**estimate.schema, **self.columns_and_types})
+
     def use(self, data: DF) -> DF:
         """
         Casts specified columns to their respective data types.
@@ -56,6 +71,15 @@ class HandleNullValues(FlowComponent):
         self.fill_values = fill_values or {}
         self.return_null_columns = return_null_columns
 
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Keeps the schema, or declares the single 'null_columns' column if null columns are returned.
+        """
+        estimate = estimate or Estimate()
+        if self.return_null_columns:
+            return Estimate({"null_columns": pl.Utf8}, len(estimate.schema) if estimate.schema is not None else None)
+        return estimate
+
     def use(self, data: DF) -> DF:
         """
         Checks for null values in the specified columns and optionally replaces them.
@@ -146,4 +170,241 @@ class HandleIndividualNullColumns(FlowComponent):
             self.log(f"Failed to handle nulls: {e}", level="ERROR")
             raise
 
-        return data
\ No newline at end of file
+        return data
+
+
+class EncodeCategoricals(FlowComponent):
+    """
+    A FlowComponent that converts low-cardinality string columns to Categorical (or Enum)
+    and reports the memory saved per column.
+
+    `Sequence(categorical=True)` activates its encoder while it runs; loading components
+    (`LoadData`, `LoadNewData`) find it through `EncodeCategoricals.active()` and encode every
+    input right after reading it, so aggregators such as `MergeStorage` already work on the
+    encoded columns.
+    """
+    _active = ContextVar("active_categorical_encoder", default=None)
+
+    def __init__(self, columns: Optional[list[str]] = None, max_distinct_ratio: float = 0.05,
+                 use_enum: bool = False, log: bool = False):
+        """
+        Initializes the EncodeCategoricals component.
+
+        Parameters:
+        - columns (Optional[list[str]]): Columns to encode. If None, every string column whose
+          estimated distinct ratio is below `max_distinct_ratio` is encoded.
+        - max_distinct_ratio (float): Distinct ratio below which a string column is considered
+          low-cardinality. Ignored for explicitly listed columns.
+        - use_enum (bool): Encode as Enum with the sorted observed values instead of Categorical.
+          Enum columns do not depend on the global string cache, but two Enum columns only join
+          if they were built with the same categories.
+        """
+        super().__init__(log)
+        self.columns = columns
+        self.max_distinct_ratio = max_distinct_ratio
+        self.use_enum = use_enum
+        self.report = {}
+
+    @classmethod
+    def active(cls) -> Optional["EncodeCategoricals"]:
+        """
+        Returns the encoder of the running Sequence, or None.
+        """
+        return cls._active.get()
+
+    @contextmanager
+    def activate(self):
+        """
+        Makes the encoder visible to loading components through `EncodeCategoricals.active()`.
+        """
+        token = EncodeCategoricals._active.set(self)
+        try:
+            yield self
+        finally:
+            EncodeCategoricals._active.reset(token)
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Checks and declares explicitly listed columns. Automatically selected columns depend
+        on the data, so the schema is kept unchanged for them.
+        """
+        estimate = estimate or Estimate()
+        if self.columns is None:
+            return estimate
+        estimate.require_type(self.columns, [pl.Utf8, pl.Categorical], self.__class__.__name__)
+        if estimate.schema is None:
+            return estimate
+        return estimate.with_schema({**estimate.schema, **{column: pl.Categorical for column in self.columns}})
+
+    def use(self, data: DF) -> DF:
+        """
+        Encodes the selected string columns and records the memory saved.
+
+        Parameters:
+        - data (DF): The Polars DataFrame to process.
+
+        Returns:
+        - DF: The modified DataFrame with encoded columns. The per-column report
+          {column: {"before": bytes, "after": bytes, "saved": bytes}} of all encoded inputs is
+          kept in `self.report`.
+        """
+        if self.columns is None:
+            columns = [
+                column for column, dtype in data.schema.items()
+                if dtype == pl.Utf8 and estimate_distinct_ratio(data, column) < self.max_distinct_ratio
+            ]
+        else:
+            columns = self.columns
+        self.log(f"Encoding columns {columns} as {'Enum' if self.use_enum else 'Categorical'}.", level="INFO")
+
+        transformations = []
+        for column in columns:
+            if self.use_enum:
+                categories = data.get_column(column).drop_nulls().unique().sort()
+                transformations.append(pl.col(column).cast(pl.Enum(categories)).alias(column))
+            else:
+                transformations.append(pl.col(column).cast(pl.Categorical).alias(column))
+
+        try:
+            encoded = data.with_columns(transformations) if transformations else data
+        except Exception as e:
+            self.log(f"Failed to encode categorical columns: {e}", level="ERROR")
+            raise
+
+        saved = 0
+        for column in columns:
+            before = data.get_column(column).estimated_size()
+            after = encoded.get_column(column).estimated_size()
+            self.report[column] = {"before": before, "after": after, "saved": before - after}
+            saved += before - after
+            self.log(f"Column '{column}': {before} -> {after} bytes (saved {before - after}).", level="INFO")
+
+        self.log(f"Categorical encoding saved {saved} bytes in total.", level="INFO")
+        return encoded
+
+
+class DowncastNumeric(FlowComponent):
+    """
+    A FlowComponent that casts numeric columns to the smallest dtype that holds their values,
+    based on the min/max statistics of each column, and logs the bytes saved.
+    """
+    INTEGER_RANGES = [
+        (pl.Int8, -2**7, 2**7 - 1),
+        (pl.Int16, -2**15, 2**15 - 1),
+        (pl.Int32, -2**31, 2**31 - 1),
+        (pl.Int64, -2**63, 2**63 - 1),
+    ]
+    UNSIGNED_RANGES = [
+        (pl.UInt8, 0, 2**8 - 1),
+        (pl.UInt16, 0, 2**16 - 1),
+        (pl.UInt32, 0, 2**32 - 1),
+        (pl.UInt64, 0, 2**64 - 1),
+    ]
+    FLOAT32_MAX = 3.4028234663852886e38
+
+    def __init__(self, columns: Optional[list[str]] = None, allow_unsigned: bool = False,
+                 allow_lossy_float32: bool = False, log: bool = False):
+        """
+        Initializes the DowncastNumeric component.
+
+        Parameters:
+        - columns (Optional[list[str]]): Columns to downcast. If None, all numeric columns are considered.
+        - allow_unsigned (bool): Allow unsigned integer types for columns without negative values.
+          Defaults to False, because differences of unsigned columns wrap around.
+        - allow_lossy_float32 (bool): Cast Float64 columns to Float32 even if precision is lost.
+          Without it, a float column is only downcast if every value round-trips exactly.
+        """
+        super().__init__(log)
+        self.columns = columns
+        self.allow_unsigned = allow_unsigned
+        self.allow_lossy_float32 = allow_lossy_float32
+        self.report = {}
+
+    def _integer_type(self, dtype: pl.DataType, minimum: int, maximum: int) -> pl.DataType:
+        """
+        Returns the smallest integer type holding the range [minimum, maximum], or `dtype` if no
+        type narrower than `dtype` holds it (e.g. UInt64 values above 2**63 - 1 without `allow_unsigned`).
+        """
+        widths = {candidate: high - low for candidate, low, high in self.INTEGER_RANGES + self.UNSIGNED_RANGES}
+        candidates = self.INTEGER_RANGES
+        if self.allow_unsigned and minimum >= 0:
+            candidates = [c for pair in zip(self.UNSIGNED_RANGES, self.INTEGER_RANGES) for c in pair]
+        for candidate, low, high in candidates:
+            if widths[candidate] >= widths[dtype]:
+                break
+            if low <= minimum and maximum <= high:
+                return candidate
+        return dtype
+
+    def _float_type(self, data: DF, column: str, minimum: float, maximum: float) -> pl.DataType:
+        """
+        Returns Float32 if the column fits into it (exactly, unless lossy casts are allowed), otherwise Float64.
+        """
+        if max(abs(minimum), abs(maximum)) > self.FLOAT32_MAX:
+            return pl.Float64
+        if self.allow_lossy_float32:
+            return pl.Float32
+        lossless = data.select(
+            (pl.col(column).cast(pl.Float32).cast(pl.Float64).eq_missing(pl.col(column)) | pl.col(column).is_nan()).all()
+        ).item()
+        return pl.Float32 if lossless else pl.Float64
+
+    def use(self, data: DF) -> DF:
+        """
+        Downcasts numeric columns to the smallest safe dtype.
+
+        Parameters:
+        - data (DF): The Polars DataFrame to process.
+
+        Returns:
+        - DF: The modified DataFrame. The per-column report
+          {column: {"from": dtype, "to": dtype, "before": bytes, "after": bytes}} is kept in `self.report`.
+        """
+        if self.columns is None:
+            columns = [column for column, dtype in data.schema.items() if dtype.is_numeric()]
+        else:
+            columns = self.columns
+        self.log(f"Starting numeric downcasting for columns: {columns}.", level="INFO")
+
+        # Collect min/max statistics of all columns in a single pass
+        statistics = data.select(
+            [pl.col(column).min().alias(f"{column}__min") for column in columns] +
+            [pl.col(column).max().alias(f"{column}__max") for column in columns]
+        ).row(0, named=True) if columns else {}
+
+        transformations = {}
+        for column in columns:
+            dtype = data.schema[column]
+            minimum, maximum = statistics[f"{column}__min"], statistics[f"{column}__max"]
+            if minimum is None:
+                self.log(f"Column '{column}' contains only nulls. Skipping.", level="WARNING")
+                continue
+
+            if dtype.is_integer():
+                target = self._integer_type(dtype, minimum, maximum)
+            elif dtype == pl.Float64:
+                target = self._float_type(data, column, minimum, maximum)
+            else:
+                continue
+
+            if target != dtype:
+                self.log(f"Downcasting column '{column}' from '{dtype}' to '{target}'.", level="INFO")
+                transformations[column] = pl.col(column).cast(target).alias(column)
+
+        try:
+            downcast = data.with_columns(list(transformations.values())) if transformations else data
+        except Exception as e:
+            self.log(f"Failed to downcast columns: {e}", level="ERROR")
+            raise
+
+        self.report = {
+            column: {
+                "from": data.schema[column],
+                "to": downcast.schema[column],
+                "before": data.get_column(column).estimated_size(),
+                "after": downcast.get_column(column).estimated_size(),
+            }
+            for column in transformations
+        }
+        self.log(f"Downcasting reduced the DataFrame from {data.estimated_size()} to {downcast.estimated_size()} bytes.", level="INFO")
+        return downcast
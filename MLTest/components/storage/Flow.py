@@ -1,5 +1,7 @@
 from MLTest.interfaces.Components import FlowComponent, AggregatorComponent
 from MLTest.interfaces.Typing import DF
+from MLTest.core.Planning import Estimate
+from MLTest.core.Memory import MemoryMonitor, SpillableList
 from typing import List
 
  
@@ -8,8 +10,11 @@ class UseFloatingStorage(FlowComponent):
     Component that accepts a list of FlowComponents and an aggregator component.
     It applies each component's `use` method, collects the results, and passes 
     them to the aggregator component to produce a combined DataFrame.
+
+    The branch results are dropped as soon as the aggregator returned,
+    unless `retain` is set.
     """
-    def __init__(self, components: List[FlowComponent], aggregator: AggregatorComponent, log: bool = False):
+    def __init__(self, components: List[FlowComponent], aggregator: AggregatorComponent, retain: bool = False, log: bool = False):
         """
         Initialize the UseFloatingStorage component with a list of components 
         and an aggregator.
@@ -18,12 +23,21 @@ class UseFloatingStorage(FlowComponent):
             components (List[FlowComponent]): A list of FlowComponents to be executed.
             aggregator (AggregatorComponent): A component that accepts a list of 
                                               results and returns a combined DataFrame.
+            retain (bool): Keep the branch results of the last run in `self.storage` for debugging.
+                           Defaults to False, which keeps `self.storage` empty.
         """ 
         super().__init__(log)
         self.components = components
         self.aggregator = aggregator
+        self.retain = retain
         self.storage = []
 
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Returns the estimate of the aggregated result of all components.
+        """
+        return self.aggregator.plan([component.plan(estimate) for component in self.components])
+
     def use(self, data: DF) -> DF:
         """
         Execute the `use` method on each component in `components`, store the results,
@@ -37,27 +51,37 @@ class UseFloatingStorage(FlowComponent):
             DF: Aggregated DataFrame from the results of all components.
         """
         self.log("Starting UseFloatingStorage execution.", level="INFO")
+        monitor = MemoryMonitor.active()
         results = []
 
         for i, component in enumerate(self.components):
             self.log(f"Executing component {i+1}/{len(self.components)}: {component.__class__.__name__}.", level="INFO")
             try:
                 result = component.use(data)
-                results.append(result)
+                # Under a memory budget, hold branch results as spillable handles
+                results.append(monitor.track(result) if monitor is not None else result)
                 self.log(f"Component {i+1}/{len(self.components)} executed successfully.", level="INFO")
             except Exception as e:
                 self.log(f"Component {i+1}/{len(self.components)} failed with error: {e}.", level="ERROR")
                 raise
 
-        self.storage = results
         self.log("All components executed. Passing results to the aggregator.", level="INFO")
 
         try:
-            aggregated_result = self.aggregator.use(results)
+            aggregated_result = self.aggregator.use(SpillableList(results) if monitor is not None else results)
             self.log("Aggregator executed successfully.", level="INFO")
         except Exception as e:
             self.log(f"Aggregator failed with error: {e}.", level="ERROR")
             raise
+        finally:
+            if monitor is not None:
+                monitor.release(results)
+            if self.retain and monitor is None:
+                self.storage = results
+            else:
+                # The aggregator consumed the branch results, drop them
+                results.clear()
+                self.storage = []
 
         self.log("UseFloatingStorage execution completed.", level="INFO")
         return aggregated_result
@@ -1,24 +1,59 @@
 from MLTest.interfaces.Components import Component, AggregatorComponent, ImportComponent
 from MLTest.interfaces.Typing import DF
+from MLTest.core.Planning import Estimate
+from MLTest.core.Memory import MemoryMonitor, SpillableList
+from MLTest.core.Async import run_cpu
 from typing import List
+import asyncio
+
+
+async def _use_all_async(owner: Component, components: List[Component], monitor) -> list:
+    """
+    Awaits `use_async` of all components concurrently, so I/O-bound inputs load in parallel.
+    Results keep the order of the components.
+    """
+    async def use(i: int, component: Component):
+        owner.log(f"Executing component {i+1}/{len(components)}: {component.__class__.__name__}.", level="INFO")
+        try:
+            result = await component.use_async()
+        except Exception as e:
+            owner.log(f"Component {i+1}/{len(components)} failed with error: {e}.", level="ERROR")
+            raise
+        owner.log(f"Component {i+1}/{len(components)} executed successfully.", level="INFO")
+        return monitor.track(result) if monitor is not None else result
+
+    return list(await asyncio.gather(*(use(i, component) for i, component in enumerate(components))))
 
 
 class StoreInputs(Component):
     """
     Component that accepts a list of Components and returns a list of results
     after applying each component's `use` method.
+
+    The returned list is owned by the caller (usually the aggregator that follows in the
+    pipeline), so the inputs are freed as soon as it has been consumed. Every run starts
+    from an empty list, so reusing the component does not accumulate previous results.
     """
-    def __init__(self, components: List[ImportComponent], log: bool = False):
+    def __init__(self, components: List[ImportComponent], retain: bool = False, log: bool = False):
         """
         Initialize with a list of components to store.
 
         Args:
             components (List[ImportComponent]): A list of import components to be stored and executed.
+            retain (bool): Keep the results of the last run in `self.storage` for debugging.
+                           Defaults to False, which keeps `self.storage` empty.
         """
         super().__init__(log)
         self.components = components
+        self.retain = retain
         self.storage = []
 
+    def plan(self, estimate: Estimate = None) -> List[Estimate]:
+        """
+        Returns the estimates of all stored components.
+        """
+        return [component.plan() for component in self.components]
+
     def use(self) -> List[DF]:
         """
         Execute the `use` method on each stored component and collect the results.
@@ -27,17 +62,32 @@ class StoreInputs(Component):
             List: A list of DataFrames from each component's `use` method.
         """
         self.log("Starting StoreInputs execution.", level="INFO")
+        monitor = MemoryMonitor.active()
+        results = []
         for i, component in enumerate(self.components):
             self.log(f"Executing component {i+1}/{len(self.components)}: {component.__class__.__name__}.", level="INFO")
             try:
                 result = component.use()
-                self.storage.append(result)
+                # Under a memory budget, hold inputs as spillable handles
+                results.append(monitor.track(result) if monitor is not None else result)
                 self.log(f"Component {i+1}/{len(self.components)} executed successfully.", level="INFO")
             except Exception as e:
                 self.log(f"Component {i+1}/{len(self.components)} failed with error: {e}.", level="ERROR")
                 raise
+        self.storage = results if self.retain else []
         self.log("StoreInputs execution completed. Results stored.", level="INFO")
-        return self.storage
+        return SpillableList(results) if monitor is not None else results
+
+    async def use_async(self) -> List[DF]:
+        """
+        Awaitable variant of `use` that loads all inputs concurrently.
+        """
+        self.log("Starting StoreInputs execution.", level="INFO")
+        monitor = MemoryMonitor.active()
+        results = await _use_all_async(self, self.components, monitor)
+        self.storage = results if self.retain else []
+        self.log("StoreInputs execution completed. Results stored.", level="INFO")
+        return SpillableList(results) if monitor is not None else results
     
 
 class StoreAndAggregateInputs(Component):
@@ -45,8 +95,11 @@ class StoreAndAggregateInputs(Component):
     Component that accepts a list of Components and aggregator component.
     It applies each component's `use` method, passes the collected results
     to the aggregator, and returns a DataFrame.
+
+    The collected results are dropped as soon as the aggregator returned,
+    unless `retain` is set.
     """
-    def __init__(self, components: List[Component], aggregator: AggregatorComponent, log: bool = False):
+    def __init__(self, components: List[Component], aggregator: AggregatorComponent, retain: bool = False, log: bool = False):
         """
         Initialize with a list of components to store and aggregator component.
 
@@ -54,12 +107,21 @@ class StoreAndAggregateInputs(Component):
             components (List[Component]): A list of components to be executed.
             aggregator (Component): A component that accepts a list of results
                                     and returns a DataFrame.
+            retain (bool): Keep the results of the last run in `self.storage` for debugging.
+                           Defaults to False, which leaves `self.storage` as None.
         """
         super().__init__(log)
         self.components = components
         self.aggregator = aggregator
+        self.retain = retain
         self.storage = None
 
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Returns the estimate of the aggregated result of all stored components.
+        """
+        return self.aggregator.plan([component.plan() for component in self.components])
+
     def use(self) -> DF:
         """
         Execute the `use` method on each stored component, collect the results,
@@ -70,25 +132,50 @@ class StoreAndAggregateInputs(Component):
             DF: Aggregated DataFrame.
         """
         self.log("Starting StoreAndAggregateInputs execution.", level="INFO")
+        monitor = MemoryMonitor.active()
         results = []
         for i, component in enumerate(self.components):
             self.log(f"Executing component {i+1}/{len(self.components)}: {component.__class__.__name__}.", level="INFO")
             try:
                 result = component.use()
-                results.append(result)
+                results.append(monitor.track(result) if monitor is not None else result)
                 self.log(f"Component {i+1}/{len(self.components)} executed successfully.", level="INFO")
             except Exception as e:
                 self.log(f"Component {i+1}/{len(self.components)} failed with error: {e}.", level="ERROR")
                 raise
 
-        self.storage = results
+        return self._aggregate(results, monitor)
+
+    async def use_async(self) -> DF:
+        """
+        Awaitable variant of `use` that loads all inputs concurrently before aggregating them
+        in the shared CPU thread pool.
+        """
+        self.log("Starting StoreAndAggregateInputs execution.", level="INFO")
+        monitor = MemoryMonitor.active()
+        results = await _use_all_async(self, self.components, monitor)
+        return await run_cpu(self._aggregate, results, monitor)
+
+    def _aggregate(self, results: list, monitor) -> DF:
+        """
+        Passes the collected results to the aggregator and drops them afterwards.
+        """
         self.log("All components executed. Passing results to the aggregator.", level="INFO")
         try:
-            aggregated_result = self.aggregator.use(results)
+            aggregated_result = self.aggregator.use(SpillableList(results) if monitor is not None else results)
             self.log("Aggregator executed successfully.", level="INFO")
         except Exception as e:
             self.log(f"Aggregator failed with error: {e}.", level="ERROR")
             raise
+        finally:
+            if monitor is not None:
+                monitor.release(results)
+            if self.retain and monitor is None:
+                self.storage = results
+            else:
+                # The aggregator consumed the inputs, drop them
+                results.clear()
+                self.storage = None
 
         self.log("StoreAndAggregateInputs execution completed.", level="INFO")
         return aggregated_result
\ No newline at end of file
@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import contextvars
+import threading
+import asyncio
+import functools
+
+"""
+Executors shared by the asyncio runtime (`Component.use_async`, `Sequence.run_async`).
+
+No component blocks the event loop: I/O-bound components (imports and exports) run in a
+process-wide I/O thread pool and all other components in a separate CPU thread pool. Polars
+releases the GIL while it computes, so the CPU stages of one sequence overlap with the I/O
+waits (and CPU stages) of others. All sequences sharing one event loop share these pools,
+which bounds the number of concurrent disk operations and of concurrent CPU stages; a CPU
+stage still uses the Polars thread pool internally.
+"""
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_CPU_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LOCK = threading.Lock()
+
+
+def io_executor(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """
+    Returns the shared I/O thread pool, creating it on first use.
+
+    Parameters:
+    - max_workers (Optional[int]): Size of the pool when it is created (default: 8).
+      Ignored once the pool exists; call `shutdown_io_executor` first to resize it.
+    """
+    global _EXECUTOR
+    with _LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=max_workers or 8, thread_name_prefix="mltest-io")
+        return _EXECUTOR
+
+
+def cpu_executor(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """
+    Returns the shared thread pool of CPU-bound components, creating it on first use.
+
+    Parameters:
+    - max_workers (Optional[int]): Size of the pool when it is created (default: 4).
+      Ignored once the pool exists; call `shutdown_io_executor` first to resize it.
+    """
+    global _CPU_EXECUTOR
+    with _LOCK:
+        if _CPU_EXECUTOR is None:
+            _CPU_EXECUTOR = ThreadPoolExecutor(max_workers=max_workers or 4, thread_name_prefix="mltest-cpu")
+        return _CPU_EXECUTOR
+
+
+def shutdown_io_executor():
+    """
+    Shuts the shared I/O and CPU thread pools down after their pending work finished.
+    """
+    global _EXECUTOR, _CPU_EXECUTOR
+    with _LOCK:
+        for executor in (_EXECUTOR, _CPU_EXECUTOR):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        _EXECUTOR = _CPU_EXECUTOR = None
+
+
+async def run_io(func: Callable, *args: Any) -> Any:
+    """
+    Runs a blocking function in the shared I/O pool and awaits its result. The caller's
+    context variables (e.g. the active MemoryMonitor) are visible inside the function.
+    """
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor(), functools.partial(context.run, func, *args))
+
+
+async def run_cpu(func: Callable, *args: Any) -> Any:
+    """
+    Runs a CPU-bound function (e.g. a Polars transformation) in the shared CPU pool and awaits
+    its result, with the caller's context variables visible like in `run_io`.
+    """
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(cpu_executor(), functools.partial(context.run, func, *args))
@@ -0,0 +1,86 @@
+from MLTest.interfaces.Typing import DF
+from typing import Optional
+import warnings
+import polars as pl
+
+
+def estimate_distinct_ratio(data: DF, column: str, sample_size: int = 100_000, seed: int = 0) -> float:
+    """
+    Estimates the ratio of distinct values to rows in a column from a random sample.
+
+    Parameters:
+    - data (DF): The Polars DataFrame holding the column.
+    - column (str): Name of the column to inspect.
+    - sample_size (int): Maximum number of rows to sample (default: 100 000).
+    - seed (int): Seed of the sampler, so that the estimate is reproducible.
+
+    Returns:
+    - float: Estimated distinct ratio in the range [0, 1]. Empty columns return 1.0.
+    """
+    series = data.get_column(column)
+    if series.len() == 0:
+        return 1.0
+    if series.len() > sample_size:
+        series = series.sample(n=sample_size, seed=seed)
+    return series.n_unique() / series.len()
+
+
+def use_dedup(data: DF, column: str, dedup: Optional[bool], threshold: float) -> bool:
+    """
+    Decides whether a column should be processed in dedup-then-map mode.
+
+    Parameters:
+    - data (DF): The Polars DataFrame holding the column.
+    - column (str): Name of the column to inspect.
+    - dedup (Optional[bool]): Explicit setting. None means decide from the estimated distinct ratio.
+    - threshold (float): Distinct ratio below which dedup mode is switched on automatically.
+
+    Returns:
+    - bool: True if the column should be parsed once per unique value.
+    """
+    if dedup is not None:
+        return dedup
+    return estimate_distinct_ratio(data, column) < threshold
+
+
+def map_unique(data: DF, column: str, expressions: dict[str, pl.Expr]) -> DF:
+    """
+    Evaluates expressions on the unique values of a column only and broadcasts
+    the results back to every row through a hash mapping.
+
+    The expressions must reference `pl.col(column)` only. Null values are never
+    evaluated and map to null in every output column.
+
+    Parameters:
+    - data (DF): The Polars DataFrame to process.
+    - column (str): Name of the column whose unique values are evaluated.
+    - expressions (dict[str, pl.Expr]): Output column names mapped to the expressions producing them.
+
+    Returns:
+    - DF: The DataFrame with the output columns added or replaced.
+    """
+    uniques = data.get_column(column).drop_nulls().unique()
+    lookup = pl.DataFrame({column: uniques}).select(
+        [expression.alias(name) for name, expression in expressions.items()]
+    )
+
+    return data.with_columns([
+        pl.col(column)
+        .replace_strict(uniques, lookup.get_column(name), default=None, return_dtype=lookup.schema[name])
+        .alias(name)
+        for name in expressions
+    ])
+
+
+def enable_global_string_cache():
+    """
+    Enables the global Polars string cache, so that Categorical columns created by
+    different components (and different inputs) share one encoding and can be
+    compared, concatenated and joined without re-encoding.
+
+    Recent Polars versions keep categoricals global by default and deprecate the
+    string cache; the call is then a no-op.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        pl.enable_string_cache()
@@ -0,0 +1,231 @@
+from MLTest.interfaces.Typing import DF
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from typing import Iterator, List, Optional
+import numpy as np
+import polars as pl
+import json
+import os
+
+"""
+Sharded training datasets.
+
+`write_shards` splits a feature frame into shards of a fixed row count (Parquet or Arrow IPC)
+and records them in `index.json`. `ShardedDataset` iterates shuffled mini-batches over the
+shards: background threads read the next shards while the training loop consumes the current
+ones, and a shuffle buffer mixes rows across shard boundaries. Shard order and row order are
+derived from a seed and the epoch, so every run sees the same batches.
+"""
+
+INDEX = "index.json"
+FORMATS = {"pq": "pq", "parquet": "pq", "arrow": "arrow", "ipc": "arrow"}
+
+
+def _read_index(directory: str) -> Optional[dict]:
+    """
+    Returns the index of a sharded dataset, or None if the directory has none.
+    """
+    path = os.path.join(directory, INDEX)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def _write_index(directory: str, index: dict):
+    """
+    Atomically replaces the index of a sharded dataset.
+    """
+    tmp_path = os.path.join(directory, f"{INDEX}.tmp")
+    with open(tmp_path, "w") as file:
+        json.dump(index, file, indent=2)
+    os.replace(tmp_path, os.path.join(directory, INDEX))
+
+
+def _remove_dataset(directory: str, index: dict):
+    """
+    Removes the index and the shards it lists, leaving all other files of the directory alone.
+    The index goes first, so an interrupted removal never leaves an index pointing to missing shards.
+    """
+    os.remove(os.path.join(directory, INDEX))
+    for shard in index["shards"]:
+        path = os.path.join(directory, shard["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def write_shards(data: DF, directory: str, shard_rows: int = 100_000, file_format: str = "pq",
+                 append: bool = False) -> dict:
+    """
+    Writes a frame as shards of `shard_rows` rows (the last shard may be smaller) and records them
+    in the index of the directory.
+
+    Parameters:
+    - data (DF): The frame to write.
+    - directory (str): Dataset directory.
+    - shard_rows (int): Rows per shard (default: 100 000).
+    - file_format (str): "pq" (default) or "arrow" (uncompressed Arrow IPC, no decode cost).
+    - append (bool): Add the shards to an existing dataset instead of replacing it (default: False).
+      The schema must match. Replacing a dataset removes only the shards listed in its index.
+
+    Returns:
+    - dict: The updated index.
+
+    Raises:
+    - FileExistsError: If `directory` is not empty and holds no dataset index.
+    """
+    if shard_rows < 1:
+        raise ValueError("`shard_rows` must be at least 1.")
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported shard format '{file_format}'. Supported formats: pq, arrow.")
+    file_format = FORMATS[file_format]
+    schema = {name: str(dtype) for name, dtype in data.schema.items()}
+
+    index = _read_index(directory) if os.path.isdir(directory) else None
+    if index is None and os.path.isdir(directory) and os.listdir(directory):
+        raise FileExistsError(f"{directory} is not empty and holds no sharded dataset; refusing to write into it.")
+    if index is not None and append:
+        if index["schema"] != schema:
+            raise ValueError(f"Schema of the appended data does not match the dataset in {directory}.")
+        if index["format"] != file_format:
+            raise ValueError(f"Dataset in {directory} uses the '{index['format']}' format, not '{file_format}'.")
+    else:
+        if index is not None:
+            _remove_dataset(directory, index)
+        index = {"format": file_format, "shard_rows": shard_rows, "rows": 0, "schema": schema, "shards": []}
+    os.makedirs(directory, exist_ok=True)
+
+    number = len(index["shards"])
+    for start in range(0, data.height, shard_rows):
+        shard = data.slice(start, shard_rows)
+        name = f"shard-{number:05d}.{file_format}"
+        path = os.path.join(directory, name)
+        if file_format == "pq":
+            shard.write_parquet(f"{path}.tmp")
+        else:
+            shard.write_ipc(f"{path}.tmp", compression="uncompressed")
+        os.replace(f"{path}.tmp", path)
+        index["shards"].append({"file": name, "rows": shard.height, "bytes": os.path.getsize(path)})
+        index["rows"] += shard.height
+        number += 1
+
+    # The index is written last, so readers never see a shard that is not complete
+    _write_index(directory, index)
+    return index
+
+
+class ShardedDataset:
+    """
+    Reader of a dataset written by `write_shards`, iterating mini-batches as DataFrames.
+
+    With shuffling, the shards are read in a seeded random order and their rows pass through a
+    shuffle buffer: once the buffer holds `buffer_rows` rows it is permuted and batches are taken
+    from it, keeping half of it to mix with the next shards. Larger buffers mix more shards at the
+    cost of memory. Up to `prefetch` shards are read ahead by `workers` background threads.
+    """
+    def __init__(self, path: str, columns: Optional[List[str]] = None):
+        """
+        Initializes the ShardedDataset.
+
+        Parameters:
+        - path (str): Dataset directory.
+        - columns (Optional[List[str]]): Columns to read (default: all).
+
+        Raises:
+        - FileNotFoundError: If the directory has no index.
+        """
+        self.path = path
+        self.index = _read_index(path)
+        if self.index is None:
+            raise FileNotFoundError(f"No sharded dataset index found in {path}.")
+        self.columns = columns
+
+    @property
+    def rows(self) -> int:
+        """
+        Number of rows in the dataset.
+        """
+        return self.index["rows"]
+
+    @property
+    def shards(self) -> List[dict]:
+        """
+        The shards of the dataset with their file name, rows and bytes.
+        """
+        return self.index["shards"]
+
+    def read_shard(self, number: int) -> DF:
+        """
+        Reads one shard.
+        """
+        path = os.path.join(self.path, self.shards[number]["file"])
+        if self.index["format"] == "pq":
+            return pl.read_parquet(path, columns=self.columns)
+        return pl.read_ipc(path, columns=self.columns)
+
+    def _prefetched(self, order: List[int], prefetch: int, workers: int) -> Iterator[DF]:
+        """
+        Yields the shards in `order`, reading up to `prefetch` shards ahead in background threads.
+        """
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mltest-shards")
+        pending = deque()
+        try:
+            for number in order:
+                pending.append(executor.submit(self.read_shard, number))
+                if len(pending) > prefetch:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def batches(self, batch_size: int, shuffle: bool = True, seed: int = 0, epoch: int = 0,
+                buffer_rows: int = 100_000, prefetch: int = 2, workers: int = 2,
+                drop_last: bool = False) -> Iterator[DF]:
+        """
+        Iterates the dataset in mini-batches.
+
+        Parameters:
+        - batch_size (int): Rows per batch.
+        - shuffle (bool): Shuffle shards and rows (default: True). Without shuffling, batches follow the shard order.
+        - seed (int): Seed of the shuffling (default: 0).
+        - epoch (int): Epoch number, combined with the seed so every epoch gets a different, reproducible order (default: 0).
+        - buffer_rows (int): Size of the shuffle buffer in rows (default: 100 000).
+        - prefetch (int): Number of shards read ahead (default: 2).
+        - workers (int): Number of reader threads (default: 2).
+        - drop_last (bool): Drop the final batch if it has fewer than `batch_size` rows (default: False).
+
+        Yields:
+        - DF: A mini-batch.
+        """
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be at least 1.")
+        rng = np.random.default_rng([seed, epoch])
+        order = list(range(len(self.shards)))
+        if shuffle:
+            order = [int(number) for number in rng.permutation(order)]
+
+        buffer = None
+        for shard in self._prefetched(order, max(prefetch, 0), max(workers, 1)):
+            buffer = shard if buffer is None else pl.concat([buffer, shard], how="vertical_relaxed")
+            if shuffle and buffer.height < buffer_rows:
+                continue
+            if shuffle:
+                buffer = buffer[rng.permutation(buffer.height)]
+                # Keep half of the buffer to mix with the following shards
+                ready = (buffer.height - buffer_rows // 2) // batch_size * batch_size
+            else:
+                ready = buffer.height // batch_size * batch_size
+            for start in range(0, ready, batch_size):
+                yield buffer.slice(start, batch_size)
+            buffer = buffer.slice(ready)
+
+        if buffer is None or buffer.height == 0:
+            return
+        if shuffle:
+            buffer = buffer[rng.permutation(buffer.height)]
+        for start in range(0, buffer.height, batch_size):
+            batch = buffer.slice(start, batch_size)
+            if batch.height < batch_size and drop_last:
+                return
+            yield batch
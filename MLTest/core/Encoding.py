@@ -0,0 +1,298 @@
+from MLTest.interfaces.Typing import DF
+from typing import Any, Iterable, List, Optional, Tuple
+import numpy as np
+import polars as pl
+import tempfile
+import shutil
+import json
+import os
+
+# Rows encoded at a time when writing a matrix, bounding the memory of the conversion
+BLOCK_ROWS = 65_536
+MANIFEST = "manifest.json"
+
+
+def _is_matrix(directory: str) -> bool:
+    """
+    Returns True if `directory` holds a matrix written by `write_feature_matrix`.
+    """
+    return os.path.isfile(os.path.join(directory, MANIFEST))
+
+
+class FeatureEncoder:
+    """
+    Encodes a mixed-dtype feature frame (as returned by the strategies) into a contiguous
+    row-major float32 matrix:
+    - numeric columns are cast to float32,
+    - booleans become 0/1,
+    - strings, categoricals and enums become the index of the value in the sorted categories
+      seen by `fit`,
+    - datetimes become seconds since the earliest datetime seen by `fit` (its `origin` in the
+      manifest, as epoch seconds), since float32 seconds since the epoch only resolve about two
+      minutes; dates become days since the epoch and durations seconds.
+    Nulls and unseen categories become NaN. Columns of other types (lists, structs, objects)
+    are skipped and listed in `skipped`.
+
+    The fitted encoding is described by a JSON-serializable manifest (`to_dict`), so a frame
+    encoded later or in another process gets the same columns and codes.
+    """
+    def __init__(self, exclude: Optional[Iterable[str]] = None):
+        """
+        Initializes the FeatureEncoder.
+
+        Parameters:
+        - exclude (Optional[Iterable[str]]): Columns never encoded, e.g. the label or the time column.
+        """
+        self.exclude = set(exclude or [])
+        self.columns = []
+        self.skipped = []
+
+    @staticmethod
+    def _kind(dtype: pl.DataType) -> Optional[str]:
+        """
+        Returns the encoding of a data type, or None if it cannot be encoded.
+        """
+        if dtype == pl.Boolean:
+            return "bool"
+        if dtype.is_numeric():
+            return "numeric"
+        if dtype in (pl.Utf8, pl.String, pl.Categorical) or isinstance(dtype, pl.Enum):
+            return "categorical"
+        if isinstance(dtype, pl.Datetime):
+            return "datetime"
+        if dtype == pl.Date:
+            return "date"
+        if isinstance(dtype, pl.Duration):
+            return "duration"
+        return None
+
+    def fit(self, data: DF) -> "FeatureEncoder":
+        """
+        Determines the encoded columns and the categories of categorical columns.
+        """
+        self.columns, self.skipped = [], []
+        for name, dtype in data.schema.items():
+            if name in self.exclude:
+                continue
+            kind = self._kind(dtype)
+            if kind is None:
+                self.skipped.append(name)
+                continue
+            column = {"name": name, "dtype": str(dtype), "encoding": kind}
+            if kind == "categorical":
+                values = data.get_column(name).cast(pl.String).drop_nulls().unique().sort()
+                column["categories"] = values.to_list()
+            elif kind == "datetime":
+                column["origin"] = data.select(pl.col(name).dt.epoch("s").min()).item() or 0
+            self.columns.append(column)
+        return self
+
+    def _expression(self, column: dict) -> pl.Expr:
+        """
+        Returns the float32 expression of an encoded column.
+        """
+        expression = pl.col(column["name"])
+        kind = column["encoding"]
+        if kind == "categorical":
+            categories = column["categories"]
+            expression = expression.cast(pl.String).replace_strict(
+                categories, list(range(len(categories))), default=None, return_dtype=pl.Int64,
+            )
+        elif kind == "datetime":
+            # Offsets from the origin stay exact in float32 for about six months of seconds
+            expression = expression.dt.epoch("s") - column.get("origin", 0)
+        elif kind == "date":
+            expression = expression.dt.epoch("d")
+        elif kind == "duration":
+            expression = expression.dt.total_seconds()
+        return expression.cast(pl.Float32)
+
+    @property
+    def feature_names(self) -> List[str]:
+        """
+        Names of the encoded columns, in matrix column order.
+        """
+        return [column["name"] for column in self.columns]
+
+    def transform_into(self, data: DF, out: np.ndarray, block_rows: int = BLOCK_ROWS) -> np.ndarray:
+        """
+        Encodes a frame into a preallocated (rows, features) float32 array, e.g. a memory-mapped
+        file, block by block, so no second full-size copy of the matrix is made.
+
+        Raises:
+        - ValueError: If a fitted column is missing from the frame or `out` has the wrong shape.
+        """
+        missing = [name for name in self.feature_names if name not in data.columns]
+        if missing:
+            raise ValueError(f"FeatureEncoder: columns {missing} are missing from the frame.")
+        if out.shape != (data.height, len(self.columns)):
+            raise ValueError(f"FeatureEncoder: expected an array of shape {(data.height, len(self.columns))}, got {out.shape}.")
+        if not self.columns:
+            return out
+        expressions = [self._expression(column) for column in self.columns]
+        for start in range(0, data.height, block_rows):
+            out[start:start + block_rows] = data.slice(start, block_rows).select(expressions).to_numpy(order="c")
+        return out
+
+    def transform(self, data: DF) -> np.ndarray:
+        """
+        Encodes a frame into a C-contiguous float32 matrix of shape (rows, features).
+        """
+        return self.transform_into(data, np.empty((data.height, len(self.columns)), dtype=np.float32))
+
+    def fit_transform(self, data: DF) -> np.ndarray:
+        """
+        Fits the encoder on a frame and encodes it.
+        """
+        return self.fit(data).transform(data)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the JSON-serializable manifest of the encoding.
+        """
+        return {"columns": self.columns, "skipped": self.skipped, "exclude": sorted(self.exclude)}
+
+    @classmethod
+    def from_dict(cls, manifest: dict) -> "FeatureEncoder":
+        """
+        Restores a fitted encoder from its manifest.
+        """
+        encoder = cls(manifest.get("exclude"))
+        encoder.columns = manifest["columns"]
+        encoder.skipped = manifest.get("skipped", [])
+        return encoder
+
+
+def encode_label(series: pl.Series, positive=None) -> np.ndarray:
+    """
+    Encodes a label column as a float32 vector: 1.0 where the value equals `positive` and 0.0
+    otherwise, or the numeric/boolean value itself if `positive` is None.
+
+    Raises:
+    - ValueError: If the label is neither numeric nor boolean and `positive` is None.
+    """
+    if positive is not None:
+        series = series == positive
+    elif not (series.dtype == pl.Boolean or series.dtype.is_numeric()):
+        raise ValueError(f"Label '{series.name}' of type {series.dtype} requires a `positive` value.")
+    return series.cast(pl.Float32).fill_null(float("nan")).to_numpy().astype(np.float32, copy=False)
+
+
+def write_feature_matrix(data: DF, directory: str, label: Optional[str] = None, positive: Any = None,
+                         exclude: Optional[Iterable[str]] = None, layout: str = "npy") -> dict:
+    """
+    Writes the encoded features (and labels) of a frame as contiguous little-endian float32 arrays
+    with a JSON manifest, which training jobs memory-map without parsing (see `read_feature_matrix`).
+
+    The directory contains `features` (rows x features, row-major) and `labels` (rows), either as
+    `.npy` files or as raw `.f32` buffers, and `manifest.json` describing shape, files, label and
+    the column encoding. An existing matrix directory (one containing `manifest.json`) is replaced
+    once the new one is complete; any other existing non-empty directory is refused.
+
+    Parameters:
+    - data (DF): The feature frame.
+    - directory (str): Output directory.
+    - label (Optional[str]): Label column, written separately and not encoded as a feature (default: None).
+    - positive (Any): Label value of the positive class, or None for numeric/boolean labels (default: None).
+    - exclude (Optional[Iterable[str]]): Further columns not encoded, e.g. keys or timestamps (default: none).
+    - layout (str): "npy" (default) or "raw".
+
+    Returns:
+    - dict: The manifest.
+
+    Raises:
+    - FileExistsError: If `directory` exists, is not empty and holds no feature matrix.
+    """
+    if layout not in ["npy", "raw"]:
+        raise ValueError(f"Unsupported layout '{layout}'. Supported layouts: npy, raw.")
+    if os.path.exists(directory) and not _is_matrix(directory) and (not os.path.isdir(directory) or os.listdir(directory)):
+        raise FileExistsError(f"{directory} exists and is not a feature matrix directory; refusing to replace it.")
+    encoder = FeatureEncoder([*(exclude or []), *([label] if label is not None else [])]).fit(data)
+    extension = "npy" if layout == "npy" else "f32"
+    shape = (data.height, len(encoder.columns))
+
+    # The matrix is staged next to the target, so the final rename stays on one file system
+    parent, base = os.path.split(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{base}-", dir=parent)
+
+    def allocate(name: str, array_shape: Tuple[int, ...]) -> np.ndarray:
+        path = os.path.join(staging, f"{name}.{extension}")
+        if layout == "npy":
+            return np.lib.format.open_memmap(path, mode="w+", dtype="<f4", shape=array_shape)
+        if not all(array_shape):
+            # np.memmap cannot map an empty file
+            open(path, "wb").close()
+            return np.empty(array_shape, dtype="<f4")
+        return np.memmap(path, mode="w+", dtype="<f4", shape=array_shape)
+
+    try:
+        features = allocate("features", shape)
+        encoder.transform_into(data, features)
+        if isinstance(features, np.memmap):
+            features.flush()
+        del features
+
+        files = {"features": f"features.{extension}", "labels": None}
+        if label is not None:
+            labels = allocate("labels", (data.height,))
+            labels[:] = encode_label(data.get_column(label), positive)
+            if isinstance(labels, np.memmap):
+                labels.flush()
+            del labels
+            files["labels"] = f"labels.{extension}"
+
+        manifest = {
+            "layout": layout,
+            "dtype": "float32",
+            "byteorder": "little",
+            "order": "C",
+            "rows": shape[0],
+            "shape": list(shape),
+            "files": files,
+            "feature_names": encoder.feature_names,
+            "label": {"name": label, "positive": positive} if label is not None else None,
+            "encoding": encoder.to_dict(),
+        }
+        with open(os.path.join(staging, MANIFEST), "w") as file:
+            json.dump(manifest, file, indent=2, default=str)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    if os.path.isdir(directory):
+        # Only an empty directory or a previous matrix (checked above) is replaced
+        shutil.rmtree(directory)
+    os.replace(staging, directory)
+    return manifest
+
+
+def read_feature_matrix(directory: str, mmap: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray], dict]:
+    """
+    Opens a matrix written by `write_feature_matrix`.
+
+    Parameters:
+    - directory (str): The matrix directory.
+    - mmap (bool): Memory-map the arrays read-only, so only the touched pages are read (default: True).
+
+    Returns:
+    - Tuple: The features, the labels (or None) and the manifest.
+    """
+    with open(os.path.join(directory, MANIFEST), "r") as file:
+        manifest = json.load(file)
+
+    def load(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        path = os.path.join(directory, name)
+        if manifest["layout"] == "npy":
+            return np.load(path, mmap_mode="r" if mmap else None)
+        if not all(shape):
+            return np.empty(shape, dtype="<f4")
+        if mmap:
+            return np.memmap(path, mode="r", dtype="<f4", shape=shape)
+        return np.fromfile(path, dtype="<f4").reshape(shape)
+
+    features = load(manifest["files"]["features"], tuple(manifest["shape"]))
+    labels = None
+    if manifest["files"]["labels"] is not None:
+        labels = load(manifest["files"]["labels"], (manifest["rows"],))
+    return features, labels, manifest
@@ -0,0 +1,354 @@
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.core.Runner import THREAD_VARIABLES
+from MLTest.core.Executors import _resolve
+from MLTest.core.Encoding import read_feature_matrix, write_feature_matrix
+from MLTest.core.Memory import current_rss, peak_rss, reset_peak_rss
+from MLTest.core.Strategies import UseStrategy
+from MLTest.components.filesystem.Input import _scan
+from MLTest.interfaces.Typing import DF
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Union
+import multiprocessing
+import numpy as np
+import polars as pl
+import tempfile
+import shutil
+import time
+import os
+
+"""
+Parallel evaluation of feature strategies.
+
+Every strategy is applied to the same preprocessed dataset in a separate worker process, which
+measures the build time and the memory growth of the build. Its features are sorted by time and
+written as a float32 matrix with `write_feature_matrix`. The folds of a time-based
+cross-validation then run in a process pool: workers memory-map the matrices and train and
+test on row slices, so folds share the pages of one matrix instead of copying it.
+"""
+
+
+def roc_auc(y_true: np.ndarray, score: np.ndarray) -> float:
+    """
+    Area under the ROC curve (ties share their average rank). NaN if only one class is present.
+    """
+    positives = y_true == 1
+    n_positive = int(positives.sum())
+    n_negative = len(y_true) - n_positive
+    if n_positive == 0 or n_negative == 0:
+        return float("nan")
+    ranks = pl.Series(score).rank("average").to_numpy()
+    return float((ranks[positives].sum() - n_positive * (n_positive + 1) / 2) / (n_positive * n_negative))
+
+
+def average_precision(y_true: np.ndarray, score: np.ndarray) -> float:
+    """
+    Average precision over the distinct score thresholds. NaN if there is no positive.
+    """
+    order = np.argsort(-score, kind="stable")
+    y, score = y_true[order], score[order]
+    true_positives = np.cumsum(y == 1)
+    if len(y) == 0 or true_positives[-1] == 0:
+        return float("nan")
+    # Keep the last row of every distinct score, so tied rows are one threshold
+    last = np.r_[np.diff(score) != 0, True]
+    true_positives = true_positives[last]
+    precision = true_positives / (np.flatnonzero(last) + 1)
+    recall = true_positives / true_positives[-1]
+    return float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+
+
+METRICS = {"roc_auc": roc_auc, "average_precision": average_precision}
+
+
+def _time_values(series: pl.Series) -> np.ndarray:
+    """
+    Returns a time column as comparable float64 values (microseconds for datetimes, days for dates).
+    """
+    if isinstance(series.dtype, pl.Datetime):
+        series = series.dt.epoch("us")
+    elif series.dtype == pl.Date:
+        series = series.dt.epoch("d")
+    return series.cast(pl.Float64).to_numpy()
+
+
+def _init_worker(threads: Optional[int]):
+    """
+    Applies the thread budget of an evaluation worker before any work runs.
+    """
+    if threads:
+        for variable in THREAD_VARIABLES:
+            os.environ[variable] = str(threads)
+
+
+def _build_strategy(strategy: str, folder: str, source: str, target: str, label: str, positive,
+                    time_col: str, cuts: List[float]) -> dict:
+    """
+    Applies a strategy to the dataset and writes its time-sorted feature matrix and labels to the
+    directory `target` (see `write_feature_matrix`). Runs in a fresh worker process. Build time and
+    memory cover only the strategy call: the strategy is loaded and the dataset is converted to
+    pandas before the baselines are taken.
+    """
+    # Loading the strategy and converting the dataset to pandas are not part of the build
+    function = UseStrategy(folder).load_strategy(strategy)
+    frame = pl.read_ipc(source).to_pandas()
+    reset_peak_rss()
+    baseline = current_rss()
+    start = time.perf_counter()
+    result = function(frame)
+    build_seconds = time.perf_counter() - start
+    peak = peak_rss()
+    del frame
+    features = pl.from_pandas(result)
+    del result
+
+    missing = [column for column in [label, time_col] if column not in features.columns]
+    if missing:
+        raise ValueError(f"Strategy '{strategy}' did not keep the columns {missing}.")
+    features = features.sort(time_col, maintain_order=True)
+    manifest = write_feature_matrix(features, target, label=label, positive=positive, exclude=[time_col])
+    boundaries = np.searchsorted(_time_values(features.get_column(time_col)), cuts, side="left")
+    return {
+        "strategy": strategy,
+        "rows": manifest["rows"],
+        "features": len(manifest["feature_names"]),
+        "build_seconds": round(build_seconds, 3),
+        "build_memory_mb": round(max(peak - baseline, 0) / 2 ** 20, 1),
+        "boundaries": [int(boundary) for boundary in boundaries] + [manifest["rows"]],
+    }
+
+
+def _predict(model, matrix: np.ndarray) -> np.ndarray:
+    """
+    Returns the positive-class scores of a fitted estimator.
+    """
+    if hasattr(model, "predict_proba"):
+        return np.asarray(model.predict_proba(matrix))[:, -1]
+    if hasattr(model, "decision_function"):
+        return np.asarray(model.decision_function(matrix))
+    return np.asarray(model.predict(matrix))
+
+
+def _score_fold(strategy: str, fold: int, target: str, train_end: int, test_end: int,
+                estimator: Union[str, Callable], params: dict, metrics: Dict[str, Any]) -> dict:
+    """
+    Trains on the rows before `train_end` and scores the rows up to `test_end` of a memory-mapped
+    feature matrix. The row slices are views of the mapped file.
+    """
+    matrix, labels, _ = read_feature_matrix(target)
+    factory = _resolve(estimator) if isinstance(estimator, str) else estimator
+    model = factory(**params)
+
+    start = time.perf_counter()
+    model.fit(matrix[:train_end], labels[:train_end])
+    fit_seconds = time.perf_counter() - start
+    score = _predict(model, matrix[train_end:test_end])
+
+    y_true = np.asarray(labels[train_end:test_end])
+    values = {}
+    for name, metric in metrics.items():
+        function = _resolve(metric) if isinstance(metric, str) else metric
+        values[name] = float(function(y_true, score))
+    return {
+        "strategy": strategy, "fold": fold, "train_rows": train_end, "test_rows": test_end - train_end,
+        "fit_seconds": round(fit_seconds, 3), **values,
+    }
+
+
+class StrategyEvaluator:
+    """
+    Builds the features of several strategies and compares them with a time-based
+    cross-validation of a pluggable estimator, in a pool of worker processes.
+
+    The rows are cut into `folds + 1` consecutive time blocks by quantiles of `time_col` in the
+    input data, so all strategies use the same periods. Fold k trains on blocks 0..k and tests on
+    block k + 1 (an expanding window, never training on the future). Strategies must keep the
+    label and the time column; all other columns they return are features.
+
+    The estimator is a class or factory (or its "module:attribute" reference) called with
+    `estimator_params`, returning an object with `fit(X, y)` and `predict_proba`, `decision_function`
+    or `predict`, e.g. "sklearn.ensemble:HistGradientBoostingClassifier". Metrics are functions
+    `metric(y_true, score)`, higher is better; the table is ranked by the first one.
+    """
+    def __init__(self, estimator: Union[str, Callable], strategies: List[str], label: str = "Is Fraud?",
+                 positive: Any = "Yes", time_col: str = "Datetime", folds: int = 4,
+                 metrics: Optional[Union[List[str], Dict[str, Any]]] = None, estimator_params: Optional[dict] = None,
+                 strategies_folder: str = "strategies", max_workers: int = 4, threads: Optional[int] = None,
+                 work_dir: Optional[str] = None, log: bool = False):
+        """
+        Initializes the StrategyEvaluator.
+
+        Parameters:
+        - estimator (Union[str, Callable]): Estimator class or factory, or its "module:attribute" reference.
+          Must be importable by worker processes (defined at module level).
+        - strategies (List[str]): Names of the strategies to compare (files in `strategies_folder`).
+        - label (str): Label column (default: "Is Fraud?").
+        - positive (Any): Label value of the positive class, or None for numeric/boolean labels (default: "Yes").
+        - time_col (str): Time column ordering the folds (default: "Datetime").
+        - folds (int): Number of cross-validation folds (default: 4).
+        - metrics (Optional[Union[List[str], Dict[str, Any]]]): Names of built-in metrics ("roc_auc",
+          "average_precision"), or names mapped to functions or "module:function" references
+          (default: both built-in metrics).
+        - estimator_params (Optional[dict]): Keyword arguments of the estimator (default: none).
+        - strategies_folder (str): Folder containing the strategy files (default: "strategies").
+        - max_workers (int): Maximum number of worker processes (default: 4).
+        - threads (Optional[int]): Polars/BLAS thread budget of every worker (default: unchanged).
+        - work_dir (Optional[str]): Directory for the feature matrices. Defaults to a temporary
+          directory, removed after the run.
+        - log (bool): Whether to log evaluation events.
+        """
+        if folds < 1:
+            raise ValueError("`folds` must be at least 1.")
+        metrics = metrics if metrics is not None else list(METRICS)
+        if not isinstance(metrics, dict):
+            unknown = [name for name in metrics if name not in METRICS]
+            if unknown:
+                raise ValueError(f"Unknown metrics {unknown}. Built-in metrics: {list(METRICS)}.")
+            metrics = {name: METRICS[name] for name in metrics}
+        self.estimator = estimator
+        self.strategies = strategies
+        self.label = label
+        self.positive = positive
+        self.time_col = time_col
+        self.folds = folds
+        self.metrics = metrics
+        self.estimator_params = estimator_params or {}
+        self.strategies_folder = strategies_folder
+        self.max_workers = max_workers
+        self.threads = threads
+        self.work_dir = work_dir
+        self.log_enabled = log
+        self.context = multiprocessing.get_context("spawn")
+        self.builds = []
+        self.results = []
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.log_enabled:
+            LoggerSingleton().log(f"[StrategyEvaluator] {message}", level)
+
+    def _pool(self, **kwargs) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.context,
+                                   initializer=_init_worker, initargs=(self.threads,), **kwargs)
+
+    def _stage(self, data: Union[DF, str], work_dir: str) -> str:
+        """
+        Writes the dataset once as an Arrow IPC file that all build workers memory-map.
+        """
+        source = os.path.join(work_dir, "dataset.arrow")
+        if isinstance(data, str):
+            _scan(data).sink_ipc(source)
+        else:
+            data.write_ipc(source)
+        return source
+
+    def _cuts(self, source: str) -> List[float]:
+        """
+        Returns the times separating the `folds + 1` time blocks.
+        """
+        times = _time_values(pl.scan_ipc(source).select(self.time_col).collect().get_column(self.time_col))
+        times = times[~np.isnan(times)]
+        if len(times) == 0:
+            raise ValueError(f"Time column '{self.time_col}' has no values.")
+        return np.quantile(times, np.arange(1, self.folds + 1) / (self.folds + 1)).tolist()
+
+    def _build(self, source: str, work_dir: str, cuts: List[float]) -> List[dict]:
+        """
+        Builds all strategies in parallel, one fresh process per strategy.
+        """
+        builds = []
+        with self._pool(max_tasks_per_child=1) as pool:
+            futures = {
+                pool.submit(_build_strategy, strategy, self.strategies_folder, source, os.path.join(work_dir, strategy),
+                            self.label, self.positive, self.time_col, cuts): strategy
+                for strategy in self.strategies
+            }
+            for future in as_completed(futures):
+                strategy = futures[future]
+                try:
+                    build = future.result()
+                    self._log(f"Built '{strategy}': {build['rows']} rows x {build['features']} features "
+                              f"in {build['build_seconds']} s (+{build['build_memory_mb']} MB).")
+                except Exception as e:
+                    build = {"strategy": strategy, "error": f"{type(e).__name__}: {e}"}
+                    self._log(f"Failed to build '{strategy}': {build['error']}", level="ERROR")
+                builds.append(build)
+        return builds
+
+    def _evaluate(self, work_dir: str) -> List[dict]:
+        """
+        Runs the folds of all built strategies in the process pool.
+        """
+        results = []
+        with self._pool() as pool:
+            futures = {}
+            for build in self.builds:
+                if "error" in build:
+                    continue
+                boundaries = build["boundaries"]
+                for fold in range(self.folds):
+                    train_end, test_end = boundaries[fold], boundaries[fold + 1]
+                    if train_end == 0 or test_end == train_end:
+                        self._log(f"Skipping empty fold {fold} of '{build['strategy']}'.", level="WARNING")
+                        continue
+                    future = pool.submit(_score_fold, build["strategy"], fold, os.path.join(work_dir, build["strategy"]),
+                                         train_end, test_end, self.estimator, self.estimator_params, self.metrics)
+                    futures[future] = (build["strategy"], fold)
+            for future in as_completed(futures):
+                strategy, fold = futures[future]
+                try:
+                    result = future.result()
+                    self._log(f"Scored fold {fold} of '{strategy}': "
+                              + ", ".join(f"{name}={result[name]:.4f}" for name in self.metrics))
+                except Exception as e:
+                    result = {"strategy": strategy, "fold": fold, "error": f"{type(e).__name__}: {e}"}
+                    self._log(f"Fold {fold} of '{strategy}' failed: {result['error']}", level="ERROR")
+                results.append(result)
+        return sorted(results, key=lambda result: (result["strategy"], result["fold"]))
+
+    def table(self) -> DF:
+        """
+        Returns the ranked comparison of the last run: per strategy the mean and standard deviation
+        of every metric over the folds, the mean fit time, the build time and memory, and errors.
+        """
+        primary = next(iter(self.metrics))
+        rows = []
+        for build in self.builds:
+            folds = [r for r in self.results if r["strategy"] == build["strategy"] and "error" not in r]
+            errors = [r["error"] for r in self.results if r["strategy"] == build["strategy"] and "error" in r]
+            row = {"strategy": build["strategy"], "rows": build.get("rows"), "features": build.get("features"),
+                   "folds": len(folds)}
+            for name in self.metrics:
+                values = [r[name] for r in folds if not np.isnan(r[name])]
+                row[name] = float(np.mean(values)) if values else None
+                row[f"{name}_std"] = float(np.std(values)) if values else None
+            row["fit_seconds"] = float(np.mean([r["fit_seconds"] for r in folds])) if folds else None
+            row["build_seconds"] = build.get("build_seconds")
+            row["build_memory_mb"] = build.get("build_memory_mb")
+            row["error"] = build.get("error") or (errors[0] if errors else None)
+            rows.append(row)
+        table = pl.DataFrame(rows, infer_schema_length=None)
+        table = table.sort(primary, descending=True, nulls_last=True)
+        return table.with_columns(pl.int_range(1, pl.len() + 1).alias("rank")).select("rank", pl.exclude("rank"))
+
+    def run(self, data: Union[DF, str]) -> DF:
+        """
+        Builds and evaluates all strategies.
+
+        Parameters:
+        - data (Union[DF, str]): The preprocessed dataset, or the path of a file containing it.
+
+        Returns:
+        - DF: The ranked comparison table (see `table`). Fold results are kept in `results`,
+          build results in `builds`.
+        """
+        work_dir = self.work_dir or tempfile.mkdtemp(prefix="mltest-evaluation-")
+        os.makedirs(work_dir, exist_ok=True)
+        try:
+            source = self._stage(data, work_dir)
+            cuts = self._cuts(source)
+            self._log(f"Evaluating {len(self.strategies)} strategies with {self.folds} time-based folds in {work_dir}.")
+            self.builds = self._build(source, work_dir, cuts)
+            self.results = self._evaluate(work_dir)
+            return self.table()
+        finally:
+            if self.work_dir is None:
+                shutil.rmtree(work_dir, ignore_errors=True)
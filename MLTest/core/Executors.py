@@ -0,0 +1,413 @@
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.core.Runner import thread_environment
+from MLTest.interfaces.Components import Component, ExportComponent, MultiExportComponent
+from MLTest.interfaces.Typing import DF
+from multiprocessing.connection import wait
+from typing import Iterable, Iterator, List, Optional, Union
+import multiprocessing
+import contextvars
+import polars as pl
+import threading
+import importlib
+import traceback
+import tempfile
+import shutil
+import queue
+import time
+import os
+
+
+# Marks the end of the chunk stream in the stage queues
+_DONE = object()
+
+
+class _Failure:
+    """
+    Carries an exception raised in a stage to the consumer of the executor.
+    """
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        self.error = error
+
+
+class PipelinedExecutor:
+    """
+    Runs a chain of components over a stream of chunks with every component as a separate stage.
+
+    Stages run in their own threads and are connected by bounded queues of `depth` chunks, so
+    while chunk k is exported, chunk k+1 can be cast and chunk k+2 read. Each stage handles one
+    chunk at a time in arrival order, so the output keeps the order of the input chunks.
+
+    Per-stage metrics (busy, starved and blocked seconds, utilization) show the bottleneck:
+    the stage with the highest utilization limits the throughput.
+    """
+    def __init__(self, components: List[Component], depth: int = 2, log: bool = False):
+        """
+        Initializes the PipelinedExecutor.
+
+        Parameters:
+        - components (List[Component]): Components applied to every chunk in order. An export
+          component may only be the last one; use ExportData in "append" mode to write one part per chunk.
+        - depth (int): Capacity of every queue between stages, in chunks (default: 2).
+        - log (bool): Whether to log the stage report.
+        """
+        if depth < 1:
+            raise ValueError("depth must be at least 1.")
+        for component in components[:-1]:
+            if isinstance(component, (ExportComponent, MultiExportComponent)):
+                raise TypeError(f"{component.__class__.__name__} produces no output and must be the last stage.")
+        self.components = components
+        self.depth = depth
+        self.log_enabled = log
+        self.stages = []
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.log_enabled:
+            LoggerSingleton().log(f"[PipelinedExecutor] {message}", level)
+
+    @staticmethod
+    def _metrics(name: str) -> dict:
+        return {"stage": name, "chunks": 0, "busy": 0.0, "starved": 0.0, "blocked": 0.0, "utilization": None}
+
+    def _put(self, target: "queue.Queue", item, metrics: dict, stop: threading.Event) -> bool:
+        """
+        Blocks until the item fits into the next queue, counting the time as blocked.
+        """
+        start = time.perf_counter()
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                metrics["blocked"] += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _source(self, chunks: Iterable[DF], target: "queue.Queue", metrics: dict, stop: threading.Event):
+        """
+        Stage reading the input chunks.
+        """
+        iterator = iter(chunks)
+        try:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                metrics["busy"] += time.perf_counter() - start
+                metrics["chunks"] += 1
+                if not self._put(target, chunk, metrics, stop):
+                    return
+        except Exception as e:
+            self._put(target, _Failure(metrics["stage"], e), metrics, stop)
+            return
+        self._put(target, _DONE, metrics, stop)
+
+    def _stage(self, component: Component, source: "queue.Queue", target: "queue.Queue", metrics: dict,
+               stop: threading.Event):
+        """
+        Stage applying one component to every chunk of its input queue.
+        """
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                item = source.get(timeout=0.1)
+            except queue.Empty:
+                metrics["starved"] += time.perf_counter() - start
+                continue
+            metrics["starved"] += time.perf_counter() - start
+            if item is _DONE or isinstance(item, _Failure):
+                self._put(target, item, metrics, stop)
+                return
+
+            start = time.perf_counter()
+            try:
+                output = component.use(item)
+            except Exception as e:
+                self._put(target, _Failure(metrics["stage"], e), metrics, stop)
+                return
+            metrics["busy"] += time.perf_counter() - start
+            metrics["chunks"] += 1
+            if not self._put(target, output, metrics, stop):
+                return
+
+    def stream(self, chunks: Iterable[DF]) -> Iterator[Optional[DF]]:
+        """
+        Runs the stages and yields the output of the last stage for every chunk, in input order
+        (None per chunk when the last stage is an export).
+
+        Raises:
+        - Exception: The first exception raised by any stage, after all stages stopped.
+        """
+        names = ["source"] + [f"{i + 1}:{component.__class__.__name__}" for i, component in enumerate(self.components)]
+        self.stages = [self._metrics(name) for name in names]
+        queues = [queue.Queue(maxsize=self.depth) for _ in names]
+        stop = threading.Event()
+
+        threads = [threading.Thread(target=contextvars.copy_context().run,
+                                    args=(self._source, chunks, queues[0], self.stages[0], stop), daemon=True)]
+        for i, component in enumerate(self.components):
+            threads.append(threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._stage, component, queues[i], queues[i + 1], self.stages[i + 1], stop), daemon=True,
+            ))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    self._log(f"Stage '{item.stage}' failed: {item.error}", level="ERROR")
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            wall = time.perf_counter() - started
+            for metrics in self.stages:
+                metrics["utilization"] = metrics["busy"] / wall if wall > 0 else None
+            self._log(f"Stage report: {self.report()}")
+
+    def run(self, chunks: Iterable[DF]) -> List[DF]:
+        """
+        Runs all chunks through the stages and returns the outputs of the last stage in input
+        order (an empty list when the last stage is an export).
+        """
+        return [output for output in self.stream(chunks) if output is not None]
+
+    def report(self) -> str:
+        """
+        Formats the per-stage metrics of the last run, marking the bottleneck stage.
+        """
+        if not self.stages:
+            return "no run"
+        bottleneck = max(self.stages, key=lambda metrics: metrics["busy"])
+        return "; ".join(
+            f"{m['stage']}: {m['chunks']} chunk(s), busy {m['busy']:.2f}s, starved {m['starved']:.2f}s, "
+            f"blocked {m['blocked']:.2f}s, utilization {(m['utilization'] or 0):.0%}"
+            + (" (bottleneck)" if m is bottleneck else "")
+            for m in self.stages
+        )
+
+
+def _resolve(reference: str):
+    """
+    Imports a "module:attribute" reference.
+    """
+    module_name, attribute = reference.split(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _apply_task(task: dict, data: DF) -> DF:
+    """
+    Applies a shard task to a DataFrame (see `ShardedExecutor`).
+    """
+    if "function" in task:
+        return _resolve(task["function"])(data, **task.get("kwargs", {}))
+    if "sequence" in task:
+        return _resolve(task["sequence"])(task.get("args", [])).run(data)
+    if "strategy" in task:
+        from MLTest.core.Strategies import UseStrategy
+        result = UseStrategy(task.get("folder", "strategies")).use(task["strategy"], data.to_pandas())
+        return pl.from_pandas(result)
+    raise ValueError(f"Shard task {task} must define 'function', 'sequence' or 'strategy'.")
+
+
+def _run_shard(task: dict, source: str, target: str, connection):
+    """
+    Entry point of a shard worker process. Reads the shard, applies the task and writes the
+    result. Sends None on success or the formatted error to `connection`.
+    """
+    try:
+        result = _apply_task(task, pl.read_ipc(source))
+        result.write_ipc(f"{target}.tmp")
+        os.replace(f"{target}.tmp", target)
+        connection.send(None)
+    except BaseException as e:
+        connection.send(f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+        raise SystemExit(1)
+    finally:
+        connection.close()
+
+
+class ShardedExecutor:
+    """
+    Runs per-key work (e.g. per-user strategies) in parallel processes: the input is partitioned by
+    a hash of `key` into shards written as Arrow IPC files, every shard is processed by a separate
+    spawned worker, and the shard outputs are concatenated.
+
+    All rows of a key land in the same shard, so per-key features are unaffected. When the largest
+    shard exceeds `skew_factor` times the mean shard size, keys are reassigned to shards by their
+    row counts (largest first, to the currently smallest shard); a single key is never split.
+
+    A shard whose worker fails or crashes is retried up to `retries` times; the other shards are
+    not rerun.
+
+    The task is a dict with one of:
+    - {"function": "module:function", "kwargs": {...}}: `function(data, **kwargs)` returning a DataFrame,
+    - {"sequence": "module:factory", "args": [...]}: `factory(args).run(data)`, e.g. a Sequence
+      starting with a FlowThroughPipe,
+    - {"strategy": "strategy_6", "folder": "strategies"}: a pandas strategy of `UseStrategy`.
+    """
+    def __init__(self, task: Union[dict, str], key: str = "User", shards: int = 4, max_workers: int = 4,
+                 retries: int = 1, skew_factor: float = 1.5, threads: Optional[int] = None,
+                 work_dir: Optional[str] = None, timeout: Optional[float] = None, log: bool = False):
+        """
+        Initializes the ShardedExecutor.
+
+        Parameters:
+        - task (Union[dict, str]): The shard task, or a "module:function" reference.
+        - key (str): Partitioning key (default: "User").
+        - shards (int): Number of shards (default: 4).
+        - max_workers (int): Maximum number of worker processes at the same time (default: 4).
+        - retries (int): Retries of a failed shard (default: 1).
+        - skew_factor (float): Largest-to-mean shard size ratio triggering rebalancing (default: 1.5).
+        - threads (Optional[int]): Polars/BLAS thread budget of every worker, passed through the
+          environment the worker starts with (default: unchanged).
+        - work_dir (Optional[str]): Directory for shard files. Defaults to a temporary directory,
+          removed after the run.
+        - timeout (Optional[float]): Seconds before a worker is terminated and its shard retried (default: None).
+        - log (bool): Whether to log shard events.
+        """
+        self.task = {"function": task} if isinstance(task, str) else task
+        self.key = key
+        self.shards = shards
+        self.max_workers = max_workers
+        self.retries = retries
+        self.skew_factor = skew_factor
+        self.threads = threads
+        self.work_dir = work_dir
+        self.timeout = timeout
+        self.log_enabled = log
+        self.context = multiprocessing.get_context("spawn")
+        self.outcomes = []
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.log_enabled:
+            LoggerSingleton().log(f"[ShardedExecutor] {message}", level)
+
+    def partition(self, data: DF) -> DF:
+        """
+        Assigns every row a shard in a "shard" column, rebalancing skewed shards by key counts.
+        """
+        counts = data.group_by(self.key).len()
+        counts = counts.with_columns((pl.col(self.key).hash(seed=0) % self.shards).cast(pl.UInt32).alias("shard"))
+        sizes = counts.group_by("shard").agg(pl.col("len").sum())["len"]
+        mean = data.height / self.shards
+
+        if mean and sizes.max() > self.skew_factor * mean:
+            loads = [0] * self.shards
+            assignment = []
+            for count in counts.sort("len", descending=True)["len"]:
+                shard = loads.index(min(loads))
+                loads[shard] += count
+                assignment.append(shard)
+            counts = counts.sort("len", descending=True).with_columns(pl.Series("shard", assignment, dtype=pl.UInt32))
+            self._log(f"Rebalanced skewed shards: largest {sizes.max()} rows -> {max(loads)} rows (mean {mean:.0f}).")
+
+        return data.join(counts.select(self.key, "shard"), on=self.key, how="left", nulls_equal=True)
+
+    def _start(self, shard: int, paths: dict) -> dict:
+        """
+        Starts the worker process of a shard.
+        """
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=_run_shard, args=(self.task, paths["input"], paths["output"], sender), name=f"shard-{shard}",
+        )
+        # Polars reads its thread budget once at import, which the worker may do while unpickling the target
+        with thread_environment(self.threads):
+            process.start()
+        sender.close()
+        return {"shard": shard, "process": process, "receiver": receiver, "started": time.monotonic()}
+
+    def _error(self, running: dict) -> Optional[str]:
+        """
+        Returns the error of a finished worker, or None if it succeeded.
+        """
+        error = None
+        if running["receiver"].poll():
+            try:
+                error = running["receiver"].recv()
+            except EOFError:
+                pass
+        running["receiver"].close()
+        exitcode = running["process"].exitcode
+        if exitcode != 0 and error is None:
+            error = f"Killed by signal {-exitcode}." if exitcode < 0 else f"Exited with code {exitcode}."
+        return error
+
+    def run(self, data: DF) -> DF:
+        """
+        Partitions the data, processes all shards and returns the concatenated outputs in shard order.
+
+        Raises:
+        - RuntimeError: If a shard still fails after all retries.
+        """
+        work_dir = self.work_dir or tempfile.mkdtemp(prefix="mltest-shards-")
+        os.makedirs(work_dir, exist_ok=True)
+        try:
+            partitioned = self.partition(data)
+            paths = {}
+            for (shard,), part in partitioned.partition_by("shard", as_dict=True).items():
+                paths[shard] = {
+                    "input": os.path.join(work_dir, f"shard-{shard}.arrow"),
+                    "output": os.path.join(work_dir, f"shard-{shard}.out.arrow"),
+                    "rows": part.height,
+                }
+                part.drop("shard").write_ipc(paths[shard]["input"])
+            del partitioned
+            self._log(f"Wrote {len(paths)} shard(s) of {[p['rows'] for p in paths.values()]} rows to {work_dir}.")
+
+            pending = sorted(paths)
+            attempts = {shard: 0 for shard in pending}
+            running, self.outcomes = [], []
+            while pending or running:
+                while pending and len(running) < self.max_workers:
+                    shard = pending.pop(0)
+                    attempts[shard] += 1
+                    running.append(self._start(shard, paths[shard]))
+
+                now = time.monotonic()
+                deadlines = [r["started"] + self.timeout - now for r in running] if self.timeout else []
+                wait([r["process"].sentinel for r in running], timeout=max(min(deadlines), 0) if deadlines else None)
+
+                for record in list(running):
+                    process, timed_out = record["process"], False
+                    if process.is_alive():
+                        if not self.timeout or time.monotonic() - record["started"] < self.timeout:
+                            continue
+                        process.terminate()
+                        timed_out = True
+                    process.join()
+                    running.remove(record)
+                    error = self._error(record)
+                    if timed_out:
+                        error = f"Timed out after {self.timeout} s."
+                    shard = record["shard"]
+                    self.outcomes.append({
+                        "shard": shard, "attempt": attempts[shard], "rows": paths[shard]["rows"],
+                        "duration_s": round(time.monotonic() - record["started"], 3), "error": error,
+                    })
+                    if error is None:
+                        self._log(f"Shard {shard} finished in {self.outcomes[-1]['duration_s']} s.")
+                    elif attempts[shard] <= self.retries:
+                        self._log(f"Shard {shard} failed (attempt {attempts[shard]}): {error.splitlines()[0]} Retrying.", level="WARNING")
+                        pending.append(shard)
+                    else:
+                        for other in running:
+                            other["process"].terminate()
+                            other["process"].join()
+                        self._log(f"Shard {shard} failed after {attempts[shard]} attempt(s): {error}", level="ERROR")
+                        raise RuntimeError(f"Shard {shard} failed after {attempts[shard]} attempt(s): {error}")
+
+            return pl.concat([pl.read_ipc(paths[shard]["output"]) for shard in sorted(paths)], how="diagonal_relaxed")
+        finally:
+            if self.work_dir is None:
+                shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,239 @@
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.interfaces.Typing import DF
+from typing import Iterable, List, Optional
+import polars as pl
+import zlib
+import json
+import os
+
+
+class FeatureStore:
+    """
+    Local store of per-key aggregate state (e.g. per-user transaction statistics), kept as
+    Parquet files partitioned by a hash of the key.
+
+    For each value column the state holds count, sum, sum of squares, min, max, the last
+    value and optionally the last `tail` values, which is enough to derive mean, std and a
+    rolling mean over the most recent rows. `last_columns` (e.g. coordinates) keep their last
+    value. All of it can be merged with the state of new rows, so the store is updated
+    incrementally instead of being recomputed from the full history.
+
+    Lookups for a batch of keys read only the partitions those keys hash to.
+
+    Note: `update` assumes that new rows are later than the stored ones and that a batch is
+    applied once; couple it with a watermark (see `LoadNewData`) for incremental runs.
+    """
+    METADATA = "_store.json"
+
+    def __init__(self, path: str, key: str = "User", order_by: str = "Datetime", values: List[str] = None,
+                 last_columns: List[str] = None, tail: int = 0, partitions: int = 16, log: bool = False):
+        """
+        Initializes the FeatureStore and validates it against the stored metadata, if any.
+
+        Parameters:
+        - path (str): Directory of the store.
+        - key (str): Key column (default: "User").
+        - order_by (str): Column defining the order of rows within a key (default: "Datetime").
+        - values (List[str]): Numeric columns to aggregate (default: ["Amount"]).
+        - last_columns (List[str]): Columns whose last value is kept, e.g. ["Latitude", "Longitude"] (default: none).
+        - tail (int): Number of most recent values kept per value column for rolling means (default: 0).
+        - partitions (int): Number of partition files (default: 16).
+        - log (bool): Whether to log store operations.
+        """
+        self.path = path
+        self.key = key
+        self.order_by = order_by
+        self.values = values or ["Amount"]
+        self.last_columns = last_columns or []
+        self.tail = tail
+        self.partitions = partitions
+        self.log_enabled = log
+        self.files_read = 0
+
+        config = {
+            "key": key, "order_by": order_by, "values": self.values,
+            "last_columns": self.last_columns, "tail": tail, "partitions": partitions,
+        }
+        metadata_path = os.path.join(path, self.METADATA)
+        if os.path.exists(metadata_path):
+            with open(metadata_path, "r") as file:
+                stored = json.load(file)
+            if stored != config:
+                raise ValueError(f"FeatureStore at '{path}' was created with {stored}, got {config}.")
+        else:
+            os.makedirs(path, exist_ok=True)
+            with open(metadata_path, "w") as file:
+                json.dump(config, file, indent=2)
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.log_enabled:
+            LoggerSingleton().log(f"[FeatureStore] {message}", level)
+
+    def _file(self, partition: int) -> str:
+        """
+        Returns the path of a partition file.
+        """
+        return os.path.join(self.path, f"part-{partition:05d}.pq")
+
+    def partition_of(self, keys: pl.Series) -> pl.Series:
+        """
+        Returns the partition of each key. Integer keys are partitioned by modulo, other keys
+        by the CRC32 of their string form, so the assignment is stable across processes.
+        """
+        if keys.dtype.is_integer():
+            return (keys.cast(pl.Int64).abs() % self.partitions).cast(pl.UInt32).alias("partition")
+        uniques = keys.drop_nulls().unique()
+        partitions = [zlib.crc32(str(value).encode()) % self.partitions for value in uniques]
+        return keys.replace_strict(uniques, partitions, default=0, return_dtype=pl.UInt32).alias("partition")
+
+    def aggregate(self, data: DF) -> DF:
+        """
+        Computes the aggregate state of every key of a DataFrame.
+        """
+        aggregations = [pl.col(self.order_by).max().alias(f"last_{self.order_by}")]
+        for column in self.values:
+            values = pl.col(column).cast(pl.Float64)
+            aggregations += [
+                values.count().cast(pl.Int64).alias(f"{column}_count"),
+                values.sum().alias(f"{column}_sum"),
+                (values ** 2).sum().alias(f"{column}_sumsq"),
+                values.min().alias(f"{column}_min"),
+                values.max().alias(f"{column}_max"),
+                values.drop_nulls().last().alias(f"{column}_last"),
+            ]
+            if self.tail:
+                aggregations.append(values.drop_nulls().tail(self.tail).alias(f"{column}_tail"))
+        aggregations += [pl.col(column).last().alias(f"{column}_last") for column in self.last_columns]
+
+        return data.sort([self.key, self.order_by]).group_by(self.key).agg(aggregations)
+
+    def _combine(self, stored: DF, new: DF) -> DF:
+        """
+        Merges stored state with the state of new rows.
+        """
+        aggregations = [pl.col(f"last_{self.order_by}").max()]
+        for column in self.values:
+            aggregations += [
+                pl.col(f"{column}_count").sum(),
+                pl.col(f"{column}_sum").sum(),
+                pl.col(f"{column}_sumsq").sum(),
+                pl.col(f"{column}_min").min(),
+                pl.col(f"{column}_max").max(),
+                pl.col(f"{column}_last").drop_nulls().last(),
+            ]
+            if self.tail:
+                aggregations.append(pl.col(f"{column}_tail").explode().drop_nulls().tail(self.tail))
+        aggregations += [pl.col(f"{column}_last").last() for column in self.last_columns]
+
+        return (
+            pl.concat([stored, new], how="vertical_relaxed")
+            .sort([self.key, f"last_{self.order_by}"])
+            .group_by(self.key)
+            .agg(aggregations)
+        )
+
+    def _write(self, state: DF, replace_all: bool = False):
+        """
+        Writes the state of all partitions present in `state`. Partition files are written to
+        temporary files first and replaced together at the end.
+        """
+        state = state.with_columns(self.partition_of(state[self.key]))
+        written = {}
+        for (partition,), part in state.partition_by("partition", as_dict=True).items():
+            tmp_path = f"{self._file(partition)}.tmp"
+            part.drop("partition").sort(self.key).write_parquet(tmp_path)
+            written[partition] = tmp_path
+
+        if replace_all:
+            for partition in range(self.partitions):
+                if partition not in written and os.path.exists(self._file(partition)):
+                    os.remove(self._file(partition))
+        for partition, tmp_path in written.items():
+            os.replace(tmp_path, self._file(partition))
+
+    def _read(self, partitions: Iterable[int], keys: Optional[pl.Series] = None) -> Optional[DF]:
+        """
+        Reads the stored state of some partitions, optionally only for some keys.
+        """
+        files = [self._file(partition) for partition in sorted(set(partitions)) if os.path.exists(self._file(partition))]
+        self.files_read += len(files)
+        if not files:
+            return None
+        scan = pl.scan_parquet(files)
+        if keys is not None:
+            scan = scan.filter(pl.col(self.key).is_in(keys.implode()))
+        return scan.collect()
+
+    def materialize(self, data: DF):
+        """
+        Rebuilds the store from the full history, replacing all stored state.
+        """
+        state = self.aggregate(data)
+        self._write(state, replace_all=True)
+        self._log(f"Materialized state of {state.height} keys from {data.height} rows.")
+
+    def update(self, data: DF):
+        """
+        Merges the state of new rows into the store, rewriting only the partitions of their keys.
+        """
+        if data.is_empty():
+            self._log("No new rows, store unchanged.")
+            return
+        new = self.aggregate(data)
+        partitions = self.partition_of(new[self.key]).unique().to_list()
+        stored = self._read(partitions)
+        state = self._combine(stored, new) if stored is not None else new
+        self._write(state)
+        self._log(f"Updated state of {new.height} keys in {len(partitions)} partition(s) from {data.height} rows.")
+
+    def state(self, keys: Optional[Iterable] = None) -> Optional[DF]:
+        """
+        Returns the raw stored state of some keys, or of all keys if none are given.
+        Returns None if none of the partitions exists yet.
+        """
+        if keys is None:
+            stored = self._read(range(self.partitions))
+        else:
+            keys = pl.Series(self.key, list(keys) if not isinstance(keys, pl.Series) else keys).drop_nulls().unique()
+            stored = self._read(self.partition_of(keys).unique().to_list(), keys)
+        return stored
+
+    def feature_names(self) -> List[str]:
+        """
+        Returns the names of the features returned by `lookup`, without the key.
+        """
+        names = [f"last_{self.order_by}"]
+        for column in self.values:
+            names += [f"{column}_{statistic}" for statistic in ["count", "mean", "std", "min", "max", "last"]]
+            if self.tail:
+                names.append(f"{column}_rolling_mean_{self.tail}")
+        return names + [f"{column}_last" for column in self.last_columns]
+
+    def features(self, state: DF) -> DF:
+        """
+        Derives the features of a raw state frame.
+        """
+        expressions = [pl.col(self.key), pl.col(f"last_{self.order_by}")]
+        for column in self.values:
+            count, total, squares = pl.col(f"{column}_count"), pl.col(f"{column}_sum"), pl.col(f"{column}_sumsq")
+            variance = (squares - total ** 2 / count) / (count - 1)
+            expressions += [
+                count,
+                (total / count).alias(f"{column}_mean"),
+                pl.when(count > 1).then(variance.clip(lower_bound=0).sqrt()).alias(f"{column}_std"),
+                pl.col(f"{column}_min"),
+                pl.col(f"{column}_max"),
+                pl.col(f"{column}_last"),
+            ]
+            if self.tail:
+                expressions.append(pl.col(f"{column}_tail").list.mean().alias(f"{column}_rolling_mean_{self.tail}"))
+        expressions += [pl.col(f"{column}_last") for column in self.last_columns]
+        return state.select(expressions)
+
+    def lookup(self, keys: Iterable) -> Optional[DF]:
+        """
+        Returns the features of a batch of keys, reading only the partitions they belong to.
+        Unknown keys are missing from the result, which is None if the store is empty.
+        """
+        state = self.state(keys)
+        return self.features(state) if state is not None else None
@@ -0,0 +1,205 @@
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.interfaces.Typing import DF
+from MLTest.core.Pipelines import LoadingPipe, FlowThroughPipe, ExportPipe
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Any, Optional
+
+
+class Node:
+    """
+    A node of a GraphSequence: one pipeline with named inputs and an optional named output.
+    """
+    def __init__(self, name: str, pipeline: Any, args: Optional[dict] = None, inputs: Optional[List[str]] = None,
+                 output: Optional[str] = None, memory: Optional[int] = None):
+        """
+        Initializes the Node.
+
+        Parameters:
+        - name: Unique name of the node.
+        - pipeline: A pipeline factory (when `args` is given) or an already built pipeline.
+        - args: Arguments of the pipeline factory. If None, `pipeline` is used as is.
+        - inputs: Names of the outputs this node consumes. No inputs call `run()`, one input calls
+          `run(data)`, several inputs call `run([data, ...])` in the listed order, which requires a
+          pipeline accepting a list, such as a MergingPipe starting with MergeStorage.
+        - output: Name under which the result is published. None for sinks such as an ExportPipe.
+        - memory: Estimated peak memory of the node in bytes. If None, it is estimated from the
+          size of its inputs.
+        """
+        self.name = name
+        self.pipeline = pipeline
+        self.args = args
+        self.inputs = inputs or []
+        self.output = output
+        self.memory = memory
+
+
+class GraphSequence:
+    """
+    Executes pipelines as a directed acyclic graph. Independent nodes run concurrently on a
+    thread pool (Polars releases the GIL), a node is only started while the estimated memory
+    stays within the budget, and intermediates are freed as soon as their last consumer finished.
+    """
+    def __init__(self, name: str, nodes: List[Node], max_workers: int = 4, memory_budget: Optional[int] = None,
+                 memory_factor: float = 2.0, log: bool = False):
+        """
+        Initializes the GraphSequence.
+
+        Parameters:
+        - name: Name of the graph.
+        - nodes: List of nodes. Order does not matter.
+        - max_workers: Maximum number of nodes running at the same time (default: 4).
+        - memory_budget: Memory budget in bytes for held intermediates plus running nodes. None disables it.
+        - memory_factor: Estimated footprint of a node without `memory`, as a multiple of its input size.
+        - log: If True, enable logging for the graph and all pipelines built from factories (default: False).
+        """
+        self.name = name
+        self.nodes = {node.name: node for node in nodes}
+        self.max_workers = max_workers
+        self.memory_budget = memory_budget
+        self.memory_factor = memory_factor
+        self.log_enabled = log
+
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Node names must be unique.")
+        self.producers = {}
+        for node in nodes:
+            if node.output is not None:
+                if node.output in self.producers:
+                    raise ValueError(f"Output '{node.output}' is produced by more than one node.")
+                self.producers[node.output] = node.name
+        for node in nodes:
+            for input in node.inputs:
+                if input not in self.producers:
+                    raise ValueError(f"Node '{node.name}' consumes '{input}', which no node produces.")
+            if node.args is not None:
+                node.pipeline = node.pipeline(**{"log": log, **node.args})
+            if len(node.inputs) > 1 and isinstance(node.pipeline, (LoadingPipe, FlowThroughPipe, ExportPipe)):
+                raise TypeError(f"Node '{node.name}' consumes {len(node.inputs)} inputs, but a "
+                                f"{type(node.pipeline).__name__} accepts at most one. Use a MergingPipe.")
+        self.order = self._topological_order()
+
+    def _log(self, message: str, level: str = "INFO"):
+        """
+        Logs a message if logging is enabled for the graph.
+        """
+        if self.log_enabled:
+            LoggerSingleton().log(f"[GraphSequence:{self.name}] {message}", level)
+
+    def _topological_order(self) -> List[str]:
+        """
+        Returns node names in a topological order.
+
+        Raises:
+        - ValueError: If the graph contains a cycle.
+        """
+        order, state = [], {}
+
+        def visit(name: str):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"The graph contains a cycle through node '{name}'.")
+            state[name] = "visiting"
+            for input in self.nodes[name].inputs:
+                visit(self.producers[input])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name)
+        return order
+
+    @staticmethod
+    def _size(value: Any) -> int:
+        """
+        Returns the estimated size in bytes of an intermediate result.
+        """
+        if isinstance(value, DF):
+            return value.estimated_size()
+        if isinstance(value, (list, tuple)):
+            return sum(GraphSequence._size(item) for item in value)
+        return 0
+
+    def _estimate(self, node: Node, results: dict) -> int:
+        """
+        Returns the estimated peak memory of a node.
+        """
+        if node.memory is not None:
+            return node.memory
+        return int(self.memory_factor * sum(self._size(results[input]) for input in node.inputs))
+
+    @staticmethod
+    def _run_node(node: Node, inputs: list):
+        """
+        Runs the pipeline of a node with its inputs.
+        """
+        if not inputs:
+            return node.pipeline.run()
+        if len(inputs) == 1:
+            return node.pipeline.run(inputs[0])
+        return node.pipeline.run(inputs)
+
+    def run(self, keep: Optional[List[str]] = None) -> dict:
+        """
+        Executes the graph.
+
+        Parameters:
+        - keep: Names of outputs to return. Defaults to all outputs that no node consumes.
+
+        Returns:
+        - dict: Requested outputs by name.
+        """
+        consumers = {output: 0 for output in self.producers}
+        for node in self.nodes.values():
+            for input in node.inputs:
+                consumers[input] += 1
+        keep = set(keep) if keep is not None else {output for output, count in consumers.items() if count == 0}
+
+        results, estimates, running = {}, {}, {}
+        pending = list(self.order)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name) as executor:
+            while pending or running:
+                for name in list(pending):
+                    node = self.nodes[name]
+                    if len(running) >= self.max_workers:
+                        break
+                    if not all(input in results for input in node.inputs):
+                        continue
+
+                    estimate = self._estimate(node, results)
+                    if self.memory_budget is not None and running:
+                        held = sum(self._size(value) for value in results.values())
+                        if held + sum(estimates.values()) + estimate > self.memory_budget:
+                            self._log(f"Deferring node '{name}' (estimated {estimate} bytes) to stay within the memory budget.")
+                            continue
+
+                    self._log(f"Starting node '{name}'.")
+                    pending.remove(name)
+                    estimates[name] = estimate
+                    future = executor.submit(self._run_node, node, [results[input] for input in node.inputs])
+                    running[future] = node
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    estimates.pop(node.name)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self._log(f"Node '{node.name}' failed: {e}", level="ERROR")
+                        for other in running:
+                            other.cancel()
+                        raise
+                    self._log(f"Node '{node.name}' completed.")
+
+                    if node.output is not None and (consumers[node.output] or node.output in keep):
+                        results[node.output] = result
+                    # Free intermediates whose last consumer just finished
+                    for input in node.inputs:
+                        consumers[input] -= 1
+                        if consumers[input] == 0 and input not in keep:
+                            self._log(f"Releasing intermediate '{input}'.")
+                            del results[input]
+
+        return {output: results[output] for output in keep if output in results}
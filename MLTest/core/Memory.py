@@ -0,0 +1,260 @@
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.interfaces.Typing import DF
+from collections.abc import Sequence as SequenceABC
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+import polars as pl
+import itertools
+import threading
+import tempfile
+import shutil
+import resource
+import time
+import os
+
+
+def current_rss() -> int:
+    """
+    Returns the resident set size of the current process in bytes.
+    Falls back to the peak RSS where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def peak_rss() -> int:
+    """
+    Returns the peak resident set size of the current process in bytes, since the start of the
+    process or the last `reset_peak_rss`.
+    """
+    try:
+        with open("/proc/self/status", "r") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak RSS reported by `peak_rss` to the current RSS, so the peak of a single step
+    can be measured. Only supported on Linux; returns False where the peak cannot be reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class SpillableFrame:
+    """
+    Handle to an intermediate DataFrame that the MemoryMonitor may spill to disk.
+    A spilled frame is kept as an uncompressed Arrow IPC file and memory-mapped back on access.
+    """
+    def __init__(self, data: DF, monitor: "MemoryMonitor"):
+        self._data = data
+        self.monitor = monitor
+        self.path = None
+        self.size = data.estimated_size()
+        self.schema = data.schema
+        self.last_access = time.monotonic()
+
+    @property
+    def spilled(self) -> bool:
+        """
+        True while the frame is only held on disk.
+        """
+        return self._data is None
+
+    def get(self) -> DF:
+        """
+        Returns the DataFrame, reloading it from disk if it was spilled.
+        """
+        self.last_access = time.monotonic()
+        if self._data is not None:
+            return self._data
+        self.monitor.reloads += 1
+        return pl.read_ipc(self.path)
+
+    def spill(self):
+        """
+        Writes the DataFrame to disk (once) and drops the in-memory reference.
+        """
+        if self._data is None:
+            return
+        if self.path is None:
+            self.path = self.monitor.spill_path()
+            self._data.write_ipc(self.path, compression="uncompressed")
+        self._data = None
+
+    def release(self):
+        """
+        Drops the DataFrame and removes its spill file.
+        """
+        self._data = None
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+        self.path = None
+
+
+class SpillableList(SequenceABC):
+    """
+    Read-only list of spillable intermediates that materializes frames on access,
+    so it can be passed to aggregators expecting a list of DataFrames.
+    """
+    def __init__(self, handles: List[SpillableFrame]):
+        self.handles = handles
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [handle.get() for handle in self.handles[index]]
+        return self.handles[index].get()
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+
+class MemoryMonitor:
+    """
+    Tracks held intermediates and the process RSS against a memory budget. When the budget is
+    exceeded, the least recently used intermediates are spilled to memory-mapped Arrow IPC files.
+
+    Components find the monitor of the running Sequence through `MemoryMonitor.active()`.
+    """
+    _active = ContextVar("active_memory_monitor", default=None)
+
+    def __init__(self, budget: int, spill_dir: Optional[str] = None, log: bool = False):
+        """
+        Initializes the MemoryMonitor.
+
+        Parameters:
+        - budget (int): Memory budget in bytes.
+        - spill_dir (Optional[str]): Local directory for spill files. Defaults to a temporary directory,
+          created on the first spill and removed by `cleanup`.
+        - log (bool): Whether to log spill events.
+        """
+        self.budget = budget
+        self.spill_dir = spill_dir
+        self._temporary = spill_dir is None
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.log_enabled = log
+        self.handles = []
+        self.spill_events = 0
+        self.spilled_bytes = 0
+        self.reloads = 0
+        self.peak_rss = 0
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def active(cls) -> Optional["MemoryMonitor"]:
+        """
+        Returns the monitor activated in the current context, or None.
+        """
+        return cls._active.get()
+
+    @contextmanager
+    def activate(self):
+        """
+        Makes the monitor visible to components through `MemoryMonitor.active()`.
+        """
+        token = MemoryMonitor._active.set(self)
+        try:
+            yield self
+        finally:
+            MemoryMonitor._active.reset(token)
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.log_enabled:
+            LoggerSingleton().log(f"[MemoryMonitor] {message}", level)
+
+    def spill_path(self) -> str:
+        """
+        Returns a new unique spill file path.
+        """
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="mltest-spill-")
+        return os.path.join(self.spill_dir, f"spill-{os.getpid()}-{next(self._counter)}.arrow")
+
+    def held_bytes(self) -> int:
+        """
+        Returns the estimated size of all tracked intermediates currently held in memory.
+        """
+        return sum(handle.size for handle in self.handles if not handle.spilled)
+
+    def track(self, data: DF) -> SpillableFrame:
+        """
+        Registers an intermediate DataFrame and enforces the budget.
+
+        Returns:
+        - SpillableFrame: Handle to use instead of the DataFrame.
+        """
+        handle = SpillableFrame(data, self)
+        with self._lock:
+            self.handles.append(handle)
+        self.enforce()
+        return handle
+
+    def release(self, handles: List[SpillableFrame]):
+        """
+        Stops tracking intermediates and removes their spill files.
+        """
+        with self._lock:
+            for handle in handles:
+                handle.release()
+                if handle in self.handles:
+                    self.handles.remove(handle)
+
+    def release_all(self):
+        """
+        Stops tracking all intermediates and removes their spill files.
+        """
+        self.release(list(self.handles))
+
+    def cleanup(self):
+        """
+        Releases all intermediates and removes the temporary spill directory, if the monitor created one.
+        A directory passed as `spill_dir` is kept.
+        """
+        self.release_all()
+        if self._temporary and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+    def enforce(self):
+        """
+        Spills the coldest in-memory intermediates while the RSS or the held bytes exceed the budget.
+        """
+        with self._lock:
+            rss = current_rss()
+            self.peak_rss = max(self.peak_rss, rss)
+            candidates = sorted((h for h in self.handles if not h.spilled), key=lambda h: h.last_access)
+            for handle in candidates:
+                if max(rss, self.held_bytes()) <= self.budget:
+                    break
+                handle.spill()
+                self.spill_events += 1
+                self.spilled_bytes += handle.size
+                rss = current_rss()
+                self._log(f"Spilled {handle.size} bytes to {handle.path} (RSS {rss} bytes, budget {self.budget} bytes).")
+
+    def stats(self) -> dict:
+        """
+        Returns spill statistics: events, bytes, reloads, peak RSS and currently held bytes.
+        """
+        return {
+            "spill_events": self.spill_events,
+            "spilled_bytes": self.spilled_bytes,
+            "reloads": self.reloads,
+            "peak_rss": self.peak_rss,
+            "held_bytes": self.held_bytes(),
+        }
@@ -0,0 +1,105 @@
+from types import ModuleType
+import importlib.util
+import threading
+import hashlib
+import os
+
+
+class ModuleCache:
+    """
+    Caches modules loaded from files, keyed by their absolute path.
+
+    A cached module is reused while the file is unchanged. The file is considered changed
+    when its modification time or size differs; with `use_hash`, a changed modification
+    time additionally requires a different content hash, so touching a file does not
+    trigger a reload. Changed files are re-executed (hot reload) on the next access.
+    """
+    def __init__(self, use_hash: bool = False):
+        """
+        Initializes the ModuleCache.
+
+        Parameters:
+        - use_hash (bool): Compare content hashes before reloading a file whose modification time changed.
+        """
+        self.use_hash = use_hash
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(file_path: str) -> str:
+        """
+        Returns the SHA-1 hash of a file content.
+        """
+        with open(file_path, "rb") as file:
+            return hashlib.sha1(file.read()).hexdigest()
+
+    @staticmethod
+    def _exec(module_name: str, file_path: str) -> ModuleType:
+        """
+        Executes a file as a new module.
+        """
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def load(self, file_path: str, module_name: str) -> ModuleType:
+        """
+        Returns the module defined by a file, executing it only if it is not cached or has changed.
+
+        Parameters:
+        - file_path (str): Path of the Python file.
+        - module_name (str): Name given to the module when it is executed.
+
+        Returns:
+        - ModuleType: The loaded module.
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry["version"] == version:
+                    self.hits += 1
+                    return entry["module"]
+                if self.use_hash and entry["hash"] == self._hash(key):
+                    entry["version"] = version
+                    self.hits += 1
+                    return entry["module"]
+
+            module = self._exec(module_name, key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            self.entries[key] = {
+                "module": module,
+                "version": version,
+                "hash": self._hash(key) if self.use_hash else None,
+            }
+            return module
+
+    def invalidate(self, file_path: str = None):
+        """
+        Drops one cached module, or all of them if no path is given.
+        """
+        with self._lock:
+            if file_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.abspath(file_path), None)
+
+    def stats(self) -> dict:
+        """
+        Returns cache statistics: hits, misses, reloads and the number of cached modules.
+        """
+        return {"hits": self.hits, "misses": self.misses, "reloads": self.reloads, "cached": len(self.entries)}
+
+
+# Process-wide cache shared by UseStrategy and PipeLoader
+MODULE_CACHE = ModuleCache()
@@ -0,0 +1,195 @@
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.interfaces.Typing import DF
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+import math
+
+
+class UserState:
+    """
+    Compact in-memory state of one user: a ring buffer of recent amounts and the time and
+    coordinates of the last transaction.
+    """
+    __slots__ = ("amounts", "last_time", "last_latitude", "last_longitude")
+
+    def __init__(self, size: int):
+        self.amounts = deque(maxlen=size)
+        self.last_time = None
+        self.last_latitude = None
+        self.last_longitude = None
+
+
+class OnlineFeatures:
+    """
+    Computes transaction features for single incoming transactions, keeping per-user state in
+    memory instead of recomputing a strategy over a DataFrame. Each event costs O(window).
+
+    The values match the batch definitions used by the strategies (and by `RollingFeatures`,
+    `LagFeatures` and `TransactionDistance`) for transactions arriving in time order per user:
+    - rolling statistics include the current transaction, over the last `window` transactions,
+      nulls are skipped and the std of fewer than two values is `std_fill`,
+    - `TimeSinceLastTransaction` is in minutes, `time_since_default` for the first transaction,
+    - `TransactionDistance` is measured from the previous transaction, `distance_fill` for the first one,
+    - `AmountToCreditLimitRatio` is `Amount / Credit Limit`.
+    """
+    ROLLING = {
+        "WeeklyTransactionCount": ("count", 7),
+        "MonthlyTransactionCount": ("count", 30),
+        "WeeklyTransactionMean": ("mean", 7),
+        "StdDevTransactionAmount": ("std", 7),
+    }
+    EARTH_RADIUS_KM = 6371.0088
+
+    def __init__(self, rolling: Dict[str, Tuple[str, int]] = None, user: str = "User", time: str = "Datetime",
+                 amount: str = "Amount", latitude: str = "Latitude", longitude: str = "Longitude",
+                 credit_limit: Optional[str] = "Credit Limit", metric: str = "euclidean",
+                 time_since_default: Optional[float] = None, distance_fill: Optional[float] = 0.0,
+                 std_fill: Optional[float] = 0.0, log: bool = False):
+        """
+        Initializes the OnlineFeatures engine.
+
+        Parameters:
+        - rolling (Dict[str, Tuple[str, int]]): Output names mapped to (statistic, window) with
+          statistic one of "count", "sum", "mean", "std", "min", "max" (default: the strategy features).
+        - user (str): User column (default: "User").
+        - time (str): Datetime column (default: "Datetime").
+        - amount (str): Amount column (default: "Amount").
+        - latitude (str): Latitude column (default: "Latitude").
+        - longitude (str): Longitude column (default: "Longitude").
+        - credit_limit (Optional[str]): Credit limit column, or None to skip the ratio (default: "Credit Limit").
+        - metric (str): "euclidean" (degrees, as in the strategies) or "haversine" (km) (default: "euclidean").
+        - time_since_default (Optional[float]): Time since the last transaction of a first transaction (default: None).
+        - distance_fill (Optional[float]): Distance of a first transaction or missing coordinates (default: 0.0).
+        - std_fill (Optional[float]): Std of a window with fewer than two non-null values (default: 0.0).
+        - log (bool): Whether to log warm-up and reset operations.
+        """
+        if metric not in ["haversine", "euclidean"]:
+            raise ValueError(f"Unsupported metric '{metric}'. Supported metrics: haversine, euclidean.")
+        self.rolling = rolling or self.ROLLING
+        unknown = {name: statistic for name, (statistic, _) in self.rolling.items()
+                   if statistic not in ["count", "sum", "mean", "std", "min", "max"]}
+        if unknown:
+            raise ValueError(f"Unsupported rolling statistics {unknown}.")
+        self.user = user
+        self.time = time
+        self.amount = amount
+        self.latitude = latitude
+        self.longitude = longitude
+        self.credit_limit = credit_limit
+        self.metric = metric
+        self.time_since_default = time_since_default
+        self.distance_fill = distance_fill
+        self.std_fill = std_fill
+        self.log_enabled = log
+        self.size = max([window for _, window in self.rolling.values()], default=1)
+        self.users: Dict[Any, UserState] = {}
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.log_enabled:
+            LoggerSingleton().log(f"[OnlineFeatures] {message}", level)
+
+    def _statistic(self, statistic: str, values: list) -> Optional[float]:
+        """
+        Computes a statistic over the non-null values of a window.
+        """
+        if statistic == "count":
+            return len(values)
+        if not values:
+            # As `rolling(...).std().fillna(...)` in the strategies, an all-null window has std `std_fill`
+            return self.std_fill if statistic == "std" else None
+        if statistic == "sum":
+            return math.fsum(values)
+        if statistic == "min":
+            return min(values)
+        if statistic == "max":
+            return max(values)
+        mean = math.fsum(values) / len(values)
+        if statistic == "mean":
+            return mean
+        if len(values) < 2:
+            return self.std_fill
+        return math.sqrt(math.fsum((value - mean) ** 2 for value in values) / (len(values) - 1))
+
+    def _distance(self, state: UserState, latitude: Optional[float], longitude: Optional[float]) -> Optional[float]:
+        """
+        Computes the distance from the previous transaction of the user.
+        """
+        if None in (latitude, longitude, state.last_latitude, state.last_longitude):
+            return self.distance_fill
+        if self.metric == "euclidean":
+            return math.sqrt((latitude - state.last_latitude) ** 2 + (longitude - state.last_longitude) ** 2)
+        lat, previous_lat = math.radians(latitude), math.radians(state.last_latitude)
+        a = (math.sin((lat - previous_lat) / 2) ** 2
+             + math.cos(lat) * math.cos(previous_lat) * math.sin(math.radians(longitude - state.last_longitude) / 2) ** 2)
+        return 2 * self.EARTH_RADIUS_KM * math.asin(min(math.sqrt(a), 1.0))
+
+    def update(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Computes the features of one transaction and adds it to the state of its user.
+
+        Parameters:
+        - transaction (Dict[str, Any]): Column values of the transaction; the time is a datetime
+          or an ISO 8601 string.
+
+        Returns:
+        - Dict[str, Any]: Feature names mapped to values.
+        """
+        timestamp = transaction[self.time]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        state = self.users.get(transaction[self.user])
+        if state is None:
+            state = self.users[transaction[self.user]] = UserState(self.size)
+
+        state.amounts.append(transaction.get(self.amount))
+        recent = list(state.amounts)
+        features = {}
+        for name, (statistic, window) in self.rolling.items():
+            features[name] = self._statistic(statistic, [value for value in recent[-window:] if value is not None])
+
+        features["TimeSinceLastTransaction"] = (
+            (timestamp - state.last_time).total_seconds() / 60 if state.last_time is not None else self.time_since_default
+        )
+        latitude, longitude = transaction.get(self.latitude), transaction.get(self.longitude)
+        features["TransactionDistance"] = self._distance(state, latitude, longitude)
+
+        if self.credit_limit is not None:
+            amount, limit = transaction.get(self.amount), transaction.get(self.credit_limit)
+            features["AmountToCreditLimitRatio"] = amount / limit if amount is not None and limit else None
+
+        state.last_time = timestamp
+        state.last_latitude, state.last_longitude = latitude, longitude
+        return features
+
+    def update_many(self, transactions: Iterable[Dict[str, Any]]) -> list:
+        """
+        Computes the features of several transactions in arrival order.
+        """
+        return [self.update(transaction) for transaction in transactions]
+
+    def warm_up(self, history: DF):
+        """
+        Initializes the state from historical transactions, keeping only the most recent
+        `window` transactions of each user.
+        """
+        columns = [self.user, self.time, self.amount, self.latitude, self.longitude]
+        recent = history.select(columns).sort([self.user, self.time]).group_by(self.user, maintain_order=True).tail(self.size)
+        for row in recent.iter_rows(named=True):
+            state = self.users.get(row[self.user])
+            if state is None:
+                state = self.users[row[self.user]] = UserState(self.size)
+            state.amounts.append(row[self.amount])
+            state.last_time = row[self.time]
+            state.last_latitude, state.last_longitude = row[self.latitude], row[self.longitude]
+        self._log(f"Warmed up state of {len(self.users)} users from {history.height} transactions.")
+
+    def reset(self, user: Any = None):
+        """
+        Drops the state of one user, or of all users if none is given.
+        """
+        if user is None:
+            self.users.clear()
+        else:
+            self.users.pop(user, None)
+        self._log(f"Reset state of {'all users' if user is None else user}.")
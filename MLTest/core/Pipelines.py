@@ -1,8 +1,9 @@
 from MLTest.interfaces.Pipelines import Pipeline
 from MLTest.interfaces.Components import Component, FlowComponent, AggregatorComponent, ExportComponent
 from MLTest.interfaces.Typing import DF
-from typing import List
-import importlib.util
+from MLTest.core.ModuleCache import ModuleCache, MODULE_CACHE
+from MLTest.core.Executors import PipelinedExecutor
+from typing import Iterable, List
 import os
 
 
@@ -38,6 +39,23 @@ class FlowThroughPipe(Pipeline):
             data = component.use(data)
         return data
 
+    async def run_async(self, data: DF) -> DF:
+        """
+        Awaitable variant of `run` (see `Component.use_async`).
+        """
+        for component in self.components:
+            data = await component.use_async(data)
+        return data
+
+    def run_chunks(self, chunks: Iterable[DF], depth: int = 2, log: bool = False) -> List[DF]:
+        """
+        Runs chunked input through the components as pipelined stages (see `PipelinedExecutor`).
+
+        Returns:
+        - List[DF]: The processed chunks in input order.
+        """
+        return PipelinedExecutor(self.components, depth=depth, log=log).run(chunks)
+
 
 class LoadingPipe(Pipeline):
     """
@@ -70,6 +88,60 @@ class LoadingPipe(Pipeline):
             data = component.use(data) if data else component.use()
         return data
 
+    async def run_async(self) -> DF:
+        """
+        Awaitable variant of `run` (see `Component.use_async`).
+        """
+        data = None
+        for component in self.components:
+            data = await component.use_async(data) if data else await component.use_async()
+        return data
+
+
+class MergingPipe(Pipeline):
+    """
+    A pipeline that accepts a list of DataFrames, e.g. the outputs of several GraphSequence nodes,
+    merges them and returns a DataFrame.
+    The first component must be an AggregatorComponent (e.g. MergeStorage), the others FlowComponents.
+    """
+    def __init__(self, components: List[Component]):
+        super().__init__(components)
+        self._validate_components()
+
+    def _validate_components(self):
+        """
+        Validates that the first component is an AggregatorComponent and the others are FlowComponents.
+        """
+        if not isinstance(self.components[0], AggregatorComponent):
+            raise TypeError("The first component of MergingPipe must be an AggregatorComponent.")
+        if not all(isinstance(component, FlowComponent) for component in self.components[1:]):
+            raise TypeError("The components of MergingPipe after the aggregator must be FlowComponents.")
+
+    def run(self, data: List[DF]) -> DF:
+        """
+        Merges the DataFrames with the aggregator and passes the result through the other components.
+        The aggregator receives a copy of the list, so the caller's list is left unchanged.
+
+        Parameters:
+        - data (List[DF]): The input DataFrames.
+
+        Returns:
+        - DF: The processed DataFrame.
+        """
+        data = self.components[0].use(list(data))
+        for component in self.components[1:]:
+            data = component.use(data)
+        return data
+
+    async def run_async(self, data: List[DF]) -> DF:
+        """
+        Awaitable variant of `run` (see `Component.use_async`).
+        """
+        data = await self.components[0].use_async(list(data))
+        for component in self.components[1:]:
+            data = await component.use_async(data)
+        return data
+
 
 class ExportPipe(Pipeline):
     """
@@ -100,19 +172,38 @@ class ExportPipe(Pipeline):
         for component in self.components:
             data = component.use(data)
 
+    async def run_async(self, data: DF) -> None:
+        """
+        Awaitable variant of `run` (see `Component.use_async`).
+        """
+        for component in self.components:
+            data = await component.use_async(data)
+
+    def run_chunks(self, chunks: Iterable[DF], depth: int = 2, log: bool = False) -> None:
+        """
+        Runs chunked input through the components as pipelined stages (see `PipelinedExecutor`).
+        The export component should append, e.g. ExportData in "append" mode.
+        """
+        PipelinedExecutor(self.components, depth=depth, log=log).run(chunks)
+
 
 class PipeLoader:
-    def __init__(self, folder_path="pipes"):
+    def __init__(self, folder_path="pipes", cache: ModuleCache = None):
+        """
+        Parameters:
+        - folder_path: Folder containing the pipeline files.
+        - cache: Module cache to load pipelines through. Defaults to the process-wide cache,
+                 so unchanged files are executed once per process and edited ones are reloaded.
+        """
         self.folder_path = folder_path
+        self.cache = cache or MODULE_CACHE
 
     def load_pipeline(self, filename):
         """Dynamically loads a pipeline from a file and creates a runnable class."""
         file_path = os.path.join(self.folder_path, filename + ".py")
         module_name = os.path.splitext(filename)[0]
 
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        module = self.cache.load(file_path, module_name)
 
         # Expect the module to have a 'PIPELINE' attribute defined as a FlowPipe instance
         if hasattr(module, "PIPELINE"):
@@ -127,3 +218,7 @@ class PipeLoader:
             return DynamicPipeline
         else:
             raise ValueError(f"{filename} does not contain a valid 'PIPELINE' definition.")
+
+    def cache_stats(self):
+        """Returns the statistics of the module cache used to load pipelines."""
+        return self.cache.stats()
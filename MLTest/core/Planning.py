@@ -0,0 +1,127 @@
+from typing import Optional, Iterable
+import polars as pl
+import os
+
+
+class PlanError(ValueError):
+    """
+    Raised by a dry run when a stage references missing columns, has conflicting types
+    or exceeds the memory budget.
+    """
+    pass
+
+
+class Estimate:
+    """
+    Schema and size estimate of the data flowing between components during a dry run.
+
+    `schema` is None when a component cannot know its output without reading data; checks
+    against an unknown schema are skipped. `rows` is None when the row count is unknown.
+    """
+    # Approximate bytes per value for fixed-width types, strings use `string_bytes`
+    WIDTHS = {
+        pl.Boolean: 1, pl.Int8: 1, pl.UInt8: 1, pl.Int16: 2, pl.UInt16: 2,
+        pl.Int32: 4, pl.UInt32: 4, pl.Float32: 4, pl.Date: 4, pl.Categorical: 4,
+        pl.Int64: 8, pl.UInt64: 8, pl.Float64: 8, pl.Datetime: 8, pl.Duration: 8, pl.Time: 8,
+    }
+
+    def __init__(self, schema: Optional[dict] = None, rows: Optional[int] = None, string_bytes: int = 16):
+        """
+        Initializes the Estimate.
+
+        Parameters:
+        - schema (Optional[dict]): Column names mapped to Polars data types, or None if unknown.
+        - rows (Optional[int]): Estimated number of rows, or None if unknown.
+        - string_bytes (int): Assumed average size of a string value in bytes (default: 16).
+        """
+        self.schema = dict(schema) if schema is not None else None
+        self.rows = rows
+        self.string_bytes = string_bytes
+
+    def with_schema(self, schema: Optional[dict]) -> "Estimate":
+        """
+        Returns a copy of the estimate with a different schema and the same row count.
+        """
+        return Estimate(schema, self.rows, self.string_bytes)
+
+    def width(self, dtype: pl.DataType) -> int:
+        """
+        Returns the approximate size in bytes of one value of a data type.
+        """
+        if dtype in (pl.Utf8, pl.String):
+            return self.string_bytes
+        for base, width in self.WIDTHS.items():
+            if dtype == base:
+                return width
+        return 8
+
+    @property
+    def bytes(self) -> Optional[int]:
+        """
+        Estimated size of the data in bytes, or None if schema or rows are unknown.
+        """
+        if self.schema is None or self.rows is None:
+            return None
+        return self.rows * sum(self.width(dtype) for dtype in self.schema.values())
+
+    def require(self, columns: Iterable[str], component: str):
+        """
+        Checks that all columns exist in the schema.
+
+        Raises:
+        - PlanError: If any column is missing.
+        """
+        if self.schema is None:
+            return
+        missing = [column for column in columns if column not in self.schema]
+        if missing:
+            raise PlanError(f"{component}: missing column(s) {missing}. Available columns: {list(self.schema)}.")
+
+    def require_type(self, columns: Iterable[str], dtypes: Iterable[pl.DataType], component: str):
+        """
+        Checks that all columns exist and have one of the given data types.
+
+        Raises:
+        - PlanError: If any column is missing or has another data type.
+        """
+        if self.schema is None:
+            return
+        self.require(columns, component)
+        dtypes = list(dtypes)
+        conflicts = {column: self.schema[column] for column in columns if not any(self.schema[column] == dtype for dtype in dtypes)}
+        if conflicts:
+            raise PlanError(f"{component}: column(s) {conflicts} must be of type {dtypes}.")
+
+    def __repr__(self) -> str:
+        return f"Estimate(columns={len(self.schema) if self.schema is not None else None}, rows={self.rows}, bytes={self.bytes})"
+
+
+def estimate_file(path: str) -> Estimate:
+    """
+    Estimates the schema and row count of a file from its metadata, without reading the data.
+    Parquet provides both; for CSV the row count is extrapolated from the first lines; JSON
+    files have no readable metadata and yield an unknown estimate.
+
+    Parameters:
+    - path (str): Path of the file.
+
+    Returns:
+    - Estimate: The estimate of the file content.
+    """
+    file_type = path.split('.')[-1].lower()
+    if not os.path.exists(path):
+        raise PlanError(f"Input file '{path}' does not exist.")
+
+    if file_type == 'pq':
+        rows = pl.scan_parquet(path).select(pl.len()).collect().item()
+        return Estimate(pl.read_parquet_schema(path), rows)
+    if file_type == 'csv':
+        schema = pl.scan_csv(path).collect_schema()
+        with open(path, "rb") as file:
+            sample = file.readlines(1 << 16)
+        line_bytes = sum(len(line) for line in sample) / max(len(sample), 1)
+        rows = max(int(os.path.getsize(path) / line_bytes) - 1, 0) if line_bytes else 0
+        return Estimate(schema, rows)
+    if file_type == 'ndjson':
+        return Estimate(pl.scan_ndjson(path).collect_schema(), None)
+    return Estimate()
@@ -0,0 +1,258 @@
+from MLTest.core.LoadArgs import load_args
+from MLTest.core.Logger import LoggerSingleton
+from multiprocessing.connection import wait
+from contextlib import contextmanager
+from typing import List, Optional
+import multiprocessing
+import threading
+import importlib
+import traceback
+import argparse
+import json
+import time
+import os
+
+"""
+Batch runner for many flows with process isolation.
+
+A runner config is a Python file defining a list of flow specs, loaded via `load_args`:
+
+flows = [
+    {
+        "name": "flow_1",
+        "sequence": "sequences.MyPreprocessingSequence:MyPreprocessingSequence",
+        "config": "flow_1.conf.py",
+        "variable": "seq_1_args",
+        "threads": 4,          # optional: Polars/BLAS thread budget of the flow
+        "memory_mb": 8192,     # optional: RSS limit of the flow process and its children
+        "timeout": 3600,       # optional: seconds before the flow is terminated
+    },
+]
+
+Run it with:
+
+python -m MLTest.core.Runner runner.conf.py --workers 4 --summary ./exports/runs.json
+
+Each flow runs in its own spawned process, started with the thread budget in its environment,
+so the budget is in place before Polars is imported and a crashing or leaking flow cannot
+affect the others. The memory limit is
+enforced on the resident set size, which the runner polls every `POLL_INTERVAL` seconds
+(Linux only): a flow above its limit is terminated. An address-space limit would fail far
+below the intended RSS, because Polars' allocator and thread stacks reserve much more
+address space than they use.
+"""
+
+# Environment variables controlling the size of native thread pools
+THREAD_VARIABLES = ["POLARS_MAX_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"]
+# Seconds between two RSS checks of flows with a memory limit
+POLL_INTERVAL = 0.5
+# Serializes changes of the process environment by `thread_environment`
+_ENVIRONMENT_LOCK = threading.Lock()
+
+
+@contextmanager
+def thread_environment(threads: Optional[int]):
+    """
+    Sets the thread variables to `threads` in the environment of the current process while a
+    worker process is started, and restores them afterwards. A spawned process inherits the
+    environment at start, so the budget applies before it imports Polars, which reads it only
+    once at import (the worker may import it while unpickling its target or re-importing the
+    main module). Does nothing if `threads` is not set.
+    """
+    if not threads:
+        yield
+        return
+    with _ENVIRONMENT_LOCK:
+        previous = {variable: os.environ.get(variable) for variable in THREAD_VARIABLES}
+        os.environ.update({variable: str(threads) for variable in THREAD_VARIABLES})
+        try:
+            yield
+        finally:
+            for variable, value in previous.items():
+                if value is None:
+                    os.environ.pop(variable, None)
+                else:
+                    os.environ[variable] = value
+
+
+def _tree_rss(pid: int) -> Optional[int]:
+    """
+    Returns the resident set size in bytes of a process and all its descendants, or None where
+    /proc is not available. Processes exiting during the walk are skipped.
+    """
+    if not os.path.exists(f"/proc/{pid}/statm"):
+        return None
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/statm", "r") as file:
+                total += int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children", "r") as file:
+                    pending.extend(int(child) for child in file.read().split())
+        except (OSError, ValueError, IndexError):
+            continue
+    return total
+
+
+def _run_flow(spec: dict, connection):
+    """
+    Entry point of a flow process. Builds the sequence from its config and runs it.
+    Sends None on success or the formatted error to `connection`.
+    """
+
+    try:
+        module_name, factory_name = spec["sequence"].split(":")
+        factory = getattr(importlib.import_module(module_name), factory_name)
+        factory(load_args(spec["config"], spec["variable"])).run()
+        connection.send(None)
+    except BaseException as e:
+        connection.send(f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+        raise SystemExit(1)
+    finally:
+        connection.close()
+
+
+class FlowRunner:
+    """
+    Runs many flows in a pool of isolated processes and writes a consolidated summary.
+    """
+    def __init__(self, flows: List[dict], max_workers: int = 2, log: bool = True):
+        """
+        Initializes the FlowRunner.
+
+        Parameters:
+        - flows: List of flow specs (see module documentation).
+        - max_workers: Maximum number of flows running at the same time (default: 2).
+        - log: If True, log flow starts and outcomes (default: True).
+        """
+        for spec in flows:
+            missing = [key for key in ["name", "sequence", "config", "variable"] if key not in spec]
+            if missing:
+                raise ValueError(f"Flow spec {spec} is missing the keys: {missing}.")
+        self.flows = flows
+        self.max_workers = max_workers
+        self.log_enabled = log
+        self.context = multiprocessing.get_context("spawn")
+
+    def _log(self, message: str, level: str = "INFO"):
+        """
+        Logs a message if logging is enabled.
+        """
+        if self.log_enabled:
+            LoggerSingleton().log(f"[FlowRunner] {message}", level)
+
+    def _start(self, spec: dict) -> dict:
+        """
+        Starts the process of a flow and returns its bookkeeping record.
+        """
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=_run_flow, args=(spec, sender), name=spec["name"])
+        with thread_environment(spec.get("threads")):
+            process.start()
+        sender.close()
+        self._log(f"Started flow '{spec['name']}' (pid {process.pid}).")
+        return {"spec": spec, "process": process, "receiver": receiver, "started": time.monotonic(), "error": None}
+
+    def _finish(self, running: dict, status: Optional[str] = None) -> dict:
+        """
+        Collects the outcome of a finished (or terminated) flow process.
+        """
+        process = running["process"]
+        if status is None:
+            if running["receiver"].poll():
+                try:
+                    running["error"] = running["receiver"].recv()
+                except EOFError:
+                    pass
+            status = "ok" if process.exitcode == 0 else "failed"
+            if process.exitcode is not None and process.exitcode < 0 and running["error"] is None:
+                running["error"] = f"Killed by signal {-process.exitcode}."
+        running["receiver"].close()
+
+        outcome = {
+            "name": running["spec"]["name"],
+            "status": status,
+            "duration_s": round(time.monotonic() - running["started"], 3),
+            "exitcode": process.exitcode,
+            "error": running["error"],
+        }
+        level = "INFO" if status == "ok" else "ERROR"
+        self._log(f"Flow '{outcome['name']}' finished with status '{status}' in {outcome['duration_s']} s.", level=level)
+        return outcome
+
+    def run(self, summary_path: Optional[str] = None) -> List[dict]:
+        """
+        Runs all flows and optionally writes the summary as JSON.
+
+        Parameters:
+        - summary_path: Path of the JSON summary file (default: None).
+
+        Returns:
+        - List[dict]: One outcome per flow with name, status ('ok', 'failed', 'timeout' or 'memory'),
+          duration_s, exitcode and error.
+        """
+        queue = list(self.flows)
+        running, outcomes = [], []
+
+        while queue or running:
+            while queue and len(running) < self.max_workers:
+                running.append(self._start(queue.pop(0)))
+
+            # Wake up when a process exits, the nearest timeout expires or memory limits are due for a check
+            now = time.monotonic()
+            deadlines = [r["started"] + r["spec"]["timeout"] - now for r in running if r["spec"].get("timeout")]
+            if any(r["spec"].get("memory_mb") for r in running):
+                deadlines.append(POLL_INTERVAL)
+            wait([r["process"].sentinel for r in running], timeout=max(min(deadlines), 0) if deadlines else None)
+
+            for record in list(running):
+                process, timeout = record["process"], record["spec"].get("timeout")
+                if not process.is_alive():
+                    process.join()
+                    outcomes.append(self._finish(record))
+                    running.remove(record)
+                elif timeout and time.monotonic() - record["started"] >= timeout:
+                    process.terminate()
+                    process.join()
+                    record["error"] = f"Timed out after {timeout} s."
+                    outcomes.append(self._finish(record, status="timeout"))
+                    running.remove(record)
+                elif record["spec"].get("memory_mb"):
+                    limit = int(record["spec"]["memory_mb"]) * 1024 * 1024
+                    rss = _tree_rss(process.pid)
+                    if rss is not None and rss > limit:
+                        process.terminate()
+                        process.join()
+                        record["error"] = f"Exceeded the memory limit of {record['spec']['memory_mb']} MB (RSS {rss} bytes)."
+                        outcomes.append(self._finish(record, status="memory"))
+                        running.remove(record)
+
+        if summary_path is not None:
+            directory = os.path.dirname(summary_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(summary_path, "w") as file:
+                json.dump(outcomes, file, indent=2)
+            self._log(f"Wrote summary of {len(outcomes)} flow(s) to {summary_path}.")
+        return outcomes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command line entry point. Returns a non-zero exit code if any flow did not succeed.
+    """
+    parser = argparse.ArgumentParser(description="Run many MLTest flows in isolated processes.")
+    parser.add_argument("config", help="Python file defining the list of flow specs.")
+    parser.add_argument("--variable", default="flows", help="Name of the list in the config file (default: flows).")
+    parser.add_argument("--workers", type=int, default=2, help="Number of flows running in parallel (default: 2).")
+    parser.add_argument("--summary", default=None, help="Path of the JSON summary to write.")
+    args = parser.parse_args(argv)
+
+    outcomes = FlowRunner(load_args(args.config, args.variable), max_workers=args.workers).run(args.summary)
+    return 0 if all(outcome["status"] == "ok" for outcome in outcomes) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,266 @@
+from MLTest.interfaces.Typing import DF
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import polars as pl
+
+# Resolution of the hash-based sampling decisions
+BUCKETS = 1_000_000
+
+
+class Sampler:
+    """
+    Base class of the samplers of the development mode. A sampler reduces a lazy query before it
+    is collected, so rows that are not sampled are never materialized.
+
+    Loading components (`LoadData`, `LoadNewData`, `StreamDirectory`) collect their queries through
+    the sampler returned by `Sampler.active()`, which `Sequence(sample=...)` activates while it runs.
+    """
+    _active = ContextVar("active_sampler", default=None)
+
+    @classmethod
+    def active(cls) -> Optional["Sampler"]:
+        """
+        Returns the sampler of the running Sequence, or None.
+        """
+        return cls._active.get()
+
+    @contextmanager
+    def activate(self):
+        """
+        Makes the sampler visible to loading components through `Sampler.active()`.
+        """
+        token = Sampler._active.set(self)
+        try:
+            yield self
+        finally:
+            Sampler._active.reset(token)
+
+    def filter(self, query: pl.LazyFrame) -> pl.LazyFrame:
+        """
+        Returns the query restricted to the sampled rows.
+        """
+        return query
+
+    def collect(self, query: pl.LazyFrame) -> DF:
+        """
+        Collects the sampled rows of a query.
+        """
+        return self.filter(query).collect()
+
+
+def _bucket(expression: pl.Expr, seed: int) -> pl.Expr:
+    """
+    Maps values to a deterministic bucket in [0, BUCKETS).
+    """
+    return expression.hash(seed=seed) % BUCKETS
+
+
+class UserSampler(Sampler):
+    """
+    Keeps all rows of a deterministic, hash-selected subset of the keys (users), so per-user
+    features (rolling windows, lags, distances) are computed on complete histories. The same keys
+    are selected in every input containing the key column, so joins stay consistent; inputs
+    without the key column are not sampled.
+    """
+    def __init__(self, fraction: float, key: str = "User", seed: int = 0):
+        """
+        Initializes the UserSampler.
+
+        Parameters:
+        - fraction (float): Fraction of the keys to keep, in (0, 1].
+        - key (str): Key column (default: "User").
+        - seed (int): Hash seed selecting the keys (default: 0).
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError("`fraction` must be in (0, 1].")
+        self.fraction = fraction
+        self.key = key
+        self.seed = seed
+
+    def expression(self) -> pl.Expr:
+        """
+        Returns the predicate selecting the rows of the sampled keys. Keys are hashed as strings,
+        so integer keys of different widths select the same users.
+        """
+        return _bucket(pl.col(self.key).cast(pl.String), self.seed) < int(self.fraction * BUCKETS)
+
+    def filter(self, query: pl.LazyFrame) -> pl.LazyFrame:
+        if self.key not in query.collect_schema().names():
+            return query
+        return query.filter(self.expression())
+
+
+class StratifiedSampler(Sampler):
+    """
+    Downsamples rows per label value, e.g. keeps 5 % of the legitimate transactions and all
+    fraud rows. Every row is kept or dropped by a hash of its content, so the sample is
+    deterministic and independent of file and row order. Inputs without the label column are
+    not sampled.
+    """
+    def __init__(self, fractions: Dict[Any, float], label: str = "Is Fraud?", seed: int = 0,
+                 weight: Optional[str] = None):
+        """
+        Initializes the StratifiedSampler.
+
+        Parameters:
+        - fractions (Dict[Any, float]): Label values mapped to the fraction of their rows to keep.
+          Rows of other values are all kept, e.g. {"No": 0.05}.
+        - label (str): Label column (default: "Is Fraud?").
+        - seed (int): Hash seed of the row selection (default: 0).
+        - weight (Optional[str]): If set, adds a column with the inverse sampling fraction of every row,
+          so weighted metrics and models estimate the unsampled data (default: None).
+        """
+        for value, fraction in fractions.items():
+            if not 0 < fraction <= 1:
+                raise ValueError(f"Fraction of label value {value!r} must be in (0, 1].")
+        self.fractions = fractions
+        self.label = label
+        self.seed = seed
+        self.weight = weight
+
+    def _fraction(self) -> pl.Expr:
+        """
+        Returns the sampling fraction of every row.
+        """
+        return pl.col(self.label).replace_strict(
+            list(self.fractions), list(self.fractions.values()), default=1.0, return_dtype=pl.Float64,
+        )
+
+    def filter(self, query: pl.LazyFrame) -> pl.LazyFrame:
+        if self.label not in query.collect_schema().names():
+            return query
+        query = query.filter(_bucket(pl.struct(pl.all()), self.seed) < self._fraction() * BUCKETS)
+        if self.weight is not None:
+            query = query.with_columns((1.0 / self._fraction()).alias(self.weight))
+        return query
+
+
+class ReservoirSampler(Sampler):
+    """
+    Uniform sample of a fixed number of rows from input of unknown length, in a single pass over
+    batches (reservoir sampling). Memory is bounded by `size` rows plus one batch.
+
+    Feed batches with `add` (e.g. the chunks of `iter_chunks` or streaming micro-batches) and read
+    the sample with `result`, or let `collect` stream a lazy query in batches.
+
+    Rows are sampled independently per input, so sampling several inputs that are joined later
+    loses their join partners. As the sampler of a Sequence, it therefore requires `column`: only
+    inputs containing the column (e.g. the transactions) are sampled, all others are loaded
+    entirely. To sample the joined rows, use `SampleReservoir` after the merge instead.
+    """
+    def __init__(self, size: int, seed: int = 0, batch_rows: int = 100_000, column: Optional[str] = None):
+        """
+        Initializes the ReservoirSampler.
+
+        Parameters:
+        - size (int): Number of rows to keep.
+        - seed (int): Seed of the random generator (default: 0).
+        - batch_rows (int): Rows per batch when collecting a lazy query (default: 100 000).
+        - column (Optional[str]): If set, `collect` only samples queries containing this column and
+          collects other queries entirely (default: None, every query is sampled).
+        """
+        if size < 1:
+            raise ValueError("`size` must be at least 1.")
+        self.size = size
+        self.seed = seed
+        self.batch_rows = batch_rows
+        self.column = column
+        self.reset()
+
+    def reset(self):
+        """
+        Empties the reservoir.
+        """
+        self.rng = np.random.default_rng(self.seed)
+        self.seen = 0
+        self.reservoir = None
+
+    def add(self, batch: DF) -> "ReservoirSampler":
+        """
+        Offers the rows of a batch to the reservoir. Row i of the input (counted over all batches)
+        replaces a random slot with probability size / (i + 1).
+        """
+        if batch.height == 0:
+            if self.reservoir is None:
+                self.reservoir = batch.with_columns(pl.lit(0, dtype=pl.Int64).alias("__slot")).clear()
+            return self
+        batch = batch.with_columns(pl.int_range(pl.len(), dtype=pl.Int64).alias("__slot"))
+        fill = max(min(self.size - self.seen, batch.height), 0)
+        if fill:
+            head = batch.head(fill).with_columns(pl.col("__slot") + self.seen)
+            self.reservoir = head if self.reservoir is None else pl.concat([self.reservoir, head], how="vertical_relaxed")
+
+        rest = batch.height - fill
+        if rest:
+            positions = np.arange(self.seen + fill, self.seen + batch.height)
+            slots = self.rng.integers(0, positions + 1)
+            offsets = np.flatnonzero(slots < self.size)
+            if len(offsets):
+                # A later row replacing the same slot wins, as in the sequential algorithm
+                _, last = np.unique(slots[offsets][::-1], return_index=True)
+                offsets = offsets[::-1][last]
+                replaced = pl.Series("__slot", slots[offsets], dtype=pl.Int64)
+                incoming = batch[(offsets + fill).tolist()].with_columns(replaced)
+                self.reservoir = pl.concat(
+                    [self.reservoir.filter(~pl.col("__slot").is_in(replaced.implode())), incoming],
+                    how="vertical_relaxed",
+                )
+        self.seen += batch.height
+        return self
+
+    def extend(self, batches: Iterable[DF]) -> "ReservoirSampler":
+        """
+        Offers all batches of an iterable to the reservoir.
+        """
+        for batch in batches:
+            self.add(batch)
+        return self
+
+    def result(self) -> DF:
+        """
+        Returns the sampled rows, ordered by reservoir slot.
+        """
+        if self.reservoir is None:
+            return pl.DataFrame()
+        return self.reservoir.sort("__slot").drop("__slot")
+
+    def collect(self, query: pl.LazyFrame) -> DF:
+        """
+        Streams a query in batches through a fresh reservoir and returns the sample.
+        """
+        if self.column is not None and self.column not in query.collect_schema().names():
+            return query.collect()
+        self.reset()
+        self.extend(query.collect_batches(chunk_size=self.batch_rows))
+        return self.result()
+
+
+class SampleChain(Sampler):
+    """
+    Applies several samplers in order, e.g. a UserSampler followed by a StratifiedSampler.
+    Only the last sampler may need to stream (ReservoirSampler).
+    """
+    def __init__(self, samplers: List[Sampler]):
+        if any(isinstance(sampler, ReservoirSampler) for sampler in samplers[:-1]):
+            raise ValueError("A ReservoirSampler must be the last sampler of a chain.")
+        self.samplers = samplers
+
+    def filter(self, query: pl.LazyFrame) -> pl.LazyFrame:
+        for sampler in self.samplers:
+            query = sampler.filter(query)
+        return query
+
+    def collect(self, query: pl.LazyFrame) -> DF:
+        for sampler in self.samplers[:-1]:
+            query = sampler.filter(query)
+        return self.samplers[-1].collect(query) if self.samplers else query.collect()
+
+
+def collect_sampled(query: pl.LazyFrame) -> DF:
+    """
+    Collects a query through the active sampler, or entirely if no sampler is active.
+    """
+    sampler = Sampler.active()
+    return sampler.collect(query) if sampler is not None else query.collect()
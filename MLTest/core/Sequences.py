@@ -1,9 +1,27 @@
 from MLTest.core.Pipelines import LoadingPipe, FlowThroughPipe, ExportPipe
-from typing import List, Any
+from MLTest.core.Cardinality import enable_global_string_cache
+from MLTest.core.Watermarks import WatermarkStore
+from MLTest.components.preprocessing.Types import EncodeCategoricals
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.core.Planning import Estimate, PlanError
+from MLTest.core.Memory import MemoryMonitor
+from MLTest.core.Sampling import Sampler, SampleChain, ReservoirSampler
+from MLTest.core.Async import run_io, run_cpu
+from contextlib import ExitStack
+from typing import List, Any, Union, Optional
+from datetime import datetime
+import polars as pl
+import inspect
+import shutil
+import json
+import os
 
 
 class Sequence:
-    def __init__(self, name: str, pipelines: List[Any], args: List[dict], log: bool = False):
+    def __init__(self, name: str, pipelines: List[Any], args: List[dict], log: bool = False,
+                 categorical: Union[bool, dict] = False, watermark: Optional[WatermarkStore] = None,
+                 checkpoint_dir: Optional[str] = None, memory_budget: Optional[int] = None,
+                 spill_dir: Optional[str] = None, sample: Union[Sampler, List[Sampler], None] = None):
         """
         Initializes the Sequence.
 
@@ -12,13 +30,56 @@ class Sequence:
         - pipelines: List of pipeline classes.
         - args: List of dictionaries containing arguments for each pipeline.
         - log: If True, enable logging for all pipelines (default: False).
+        - categorical: If True (or a dict of EncodeCategoricals arguments), enable the global
+          string cache before any data is loaded and encode low-cardinality string columns
+          of every input as it is loaded (LoadData, LoadNewData), so joins already run on the
+          encoded columns, and again after every LoadingPipe for columns that only qualify
+          after merging (default: False).
+        - watermark: WatermarkStore enabling incremental runs. It is passed to every pipeline
+          factory accepting a `watermark` argument, committed after a successful run and
+          rolled back after a failed one (default: None).
+        - checkpoint_dir: If set, the output of every pipeline is persisted as Arrow IPC together
+          with a run manifest under `<checkpoint_dir>/<name>/<run_id>/`, so that a failed run
+          can be continued with `resume()`. Checkpoints are removed after a successful run
+          (default: None).
+        - memory_budget: Memory budget in bytes. While the process RSS or the intermediates held by
+          storage components exceed it, the coldest intermediates are spilled to memory-mapped
+          Arrow IPC files and reloaded on access (default: None).
+        - spill_dir: Local directory for spill files. Defaults to a temporary directory that is
+          removed when the run finishes.
+        - sample: Development mode. A sampler (or a list of samplers applied in order, e.g.
+          `[UserSampler(0.05), StratifiedSampler({"No": 0.1})]`) used by all loading components
+          while the sequence runs, so only the sampled rows are read into memory. A ReservoirSampler
+          must set `column` to sample only the inputs containing it. Cannot be combined with a
+          watermark (default: None).
         """
         if len(pipelines) != len(args):
             raise ValueError(
                 "The number of pipelines must match the number of argument dictionaries."
             )
 
+        if sample is not None and watermark is not None:
+            raise ValueError("A sampled Sequence cannot use a watermark: skipped rows would be marked as processed.")
+
         self.name = name
+        self.log_enabled = log
+        samplers = sample if isinstance(sample, list) else [sample] if sample is not None else []
+        if any(isinstance(sampler, ReservoirSampler) and sampler.column is None for sampler in samplers):
+            raise ValueError("A ReservoirSampler of a Sequence must set `column`, so only the inputs containing it "
+                             "are sampled and joins keep their partners. To sample the merged rows, add "
+                             "SampleReservoir after the merge instead.")
+        self.sample = SampleChain(sample) if isinstance(sample, list) else sample
+        self.watermark = watermark
+        self.checkpoint_dir = checkpoint_dir
+        self.monitor = MemoryMonitor(memory_budget, spill_dir, log=log) if memory_budget is not None else None
+        self.encoder = None
+        if categorical:
+            enable_global_string_cache()
+            encoder_args = categorical if isinstance(categorical, dict) else {}
+            self.encoder = EncodeCategoricals(**{"log": log, **encoder_args})
+
+        self.pipeline_names = [getattr(pipeline, "__name__", str(pipeline)) for pipeline in pipelines]
+        self.pipeline_args = args
         self.pipelines = [
             self._instantiate_pipeline(pipeline_class, pipeline_args, log)
             for pipeline_class, pipeline_args in zip(pipelines, args)
@@ -39,8 +100,278 @@ class Sequence:
         # Add 'log' to arguments if it's not already specified
         if "log" not in pipeline_args:
             pipeline_args["log"] = log
+        # Share the sequence watermark with pipelines that support incremental runs
+        if self.watermark is not None and "watermark" not in pipeline_args \
+                and "watermark" in inspect.signature(pipeline_class).parameters:
+            pipeline_args["watermark"] = self.watermark
         return pipeline_class(**pipeline_args)
 
+    def _run_pipeline(self, pipeline: Any, current_data):
+        """
+        Run a single pipeline according to its type.
+
+        Parameters:
+        - pipeline: The pipeline to run.
+        - current_data: Output of the previous pipeline.
+
+        Returns:
+        - The pipeline output, or None after an ExportPipe.
+        """
+        if isinstance(pipeline, FlowThroughPipe):
+            if current_data is None:
+                raise ValueError("FlowThroughPipe requires input data, but none was provided.")
+            return pipeline.run(current_data)
+        elif isinstance(pipeline, LoadingPipe):
+            current_data = pipeline.run()  # No input required
+            if self.encoder is not None:
+                current_data = self.encoder.use(current_data)
+            return current_data
+        elif isinstance(pipeline, ExportPipe):
+            if current_data is None:
+                raise ValueError("ExportPipe requires input data, but none was provided.")
+            pipeline.run(current_data)  # No output expected
+            return None  # Reset current_data after export
+        else:
+            raise TypeError(f"Unknown pipeline type: {type(pipeline)}")
+
+    def _log(self, message: str, level: str = "INFO"):
+        """
+        Logs a message if logging is enabled for the sequence.
+        """
+        if self.log_enabled:
+            LoggerSingleton().log(f"[Sequence:{self.name}] {message}", level)
+
+    def _activate(self) -> ExitStack:
+        """
+        Activates the memory monitor, the categorical encoder and the sampler of the sequence
+        for the current context.
+        """
+        stack = ExitStack()
+        if self.monitor is not None:
+            stack.enter_context(self.monitor.activate())
+        if self.encoder is not None:
+            stack.enter_context(self.encoder.activate())
+        if self.sample is not None:
+            stack.enter_context(self.sample.activate())
+        return stack
+
+    def plan(self, estimate: Optional[Estimate] = None, memory_budget: Optional[int] = None) -> List[dict]:
+        """
+        Dry run: propagates schemas and size estimates through every pipeline without reading data.
+        Inputs are estimated from file metadata and components declare their output schema.
+
+        Parameters:
+        - estimate: Estimate of the initial data (if required by the first pipeline).
+        - memory_budget: Maximum estimated peak memory per stage in bytes (default: None).
+
+        Returns:
+        - List[dict]: One entry per pipeline with its name, output columns, estimated rows,
+          output bytes and peak bytes (None where unknown).
+
+        Raises:
+        - PlanError: On missing columns, type conflicts, or a stage exceeding the memory budget.
+        """
+        stages = []
+        current = estimate if estimate is not None else Estimate()
+        for name, pipeline in zip(self.pipeline_names, self.pipelines):
+            try:
+                if isinstance(pipeline, LoadingPipe):
+                    output, peak = pipeline.plan()
+                    if self.encoder is not None:
+                        output = self.encoder.plan(output)
+                else:
+                    output, peak = pipeline.plan(current)
+            except PlanError as e:
+                raise PlanError(f"Pipeline '{name}': {e}") from e
+
+            stage = {
+                "pipeline": name,
+                "columns": list(output.schema) if output is not None and output.schema is not None else None,
+                "rows": output.rows if output is not None else None,
+                "bytes": output.bytes if output is not None else None,
+                "peak_bytes": peak,
+            }
+            stages.append(stage)
+            self._log(f"Planned '{name}': rows={stage['rows']}, bytes={stage['bytes']}, peak={stage['peak_bytes']}.")
+
+            if memory_budget is not None and peak is not None and peak > memory_budget:
+                raise PlanError(f"Pipeline '{name}' needs an estimated {peak} bytes, exceeding the budget of {memory_budget} bytes.")
+            current = output if output is not None else Estimate()
+        return stages
+
+    def _write_manifest(self, run_dir: str, manifest: dict):
+        """
+        Atomically writes the run manifest of a checkpointed run.
+        """
+        tmp_path = os.path.join(run_dir, "manifest.json.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(tmp_path, os.path.join(run_dir, "manifest.json"))
+
+    def _checkpoint(self, run_dir: str, manifest: dict, index: int, current_data):
+        """
+        Persists the output of pipeline `index` and marks it as completed in the manifest.
+        Only the latest checkpoint is kept.
+        """
+        previous = manifest["output"]
+        manifest["output"] = None
+        if current_data is not None:
+            manifest["output"] = f"step-{index}.arrow"
+            current_data.write_ipc(os.path.join(run_dir, manifest["output"]))
+        manifest["completed"] = index
+        if self.watermark is not None:
+            manifest["watermark"] = self.watermark.pending
+        self._write_manifest(run_dir, manifest)
+
+        if previous is not None and previous != manifest["output"]:
+            os.remove(os.path.join(run_dir, previous))
+        self._log(f"Checkpointed pipeline {index + 1}/{len(self.pipelines)}.")
+
+    def _after_pipeline(self, index: int, current_data, run_dir: Optional[str], manifest: Optional[dict]):
+        """
+        Releases the intermediates of pipeline `index` and checkpoints its output if `run_dir` is set.
+        """
+        if self.monitor is not None:
+            # Intermediates of a pipeline are consumed once it returns
+            self.monitor.release_all()
+        if run_dir is not None:
+            self._checkpoint(run_dir, manifest, index, current_data)
+
+    def _fail(self, run_dir: Optional[str], manifest: Optional[dict]):
+        """
+        Marks a checkpointed run as failed and rolls the staged watermark back.
+        """
+        if run_dir is not None:
+            manifest["status"] = "failed"
+            self._write_manifest(run_dir, manifest)
+            self._log(f"Run failed. Resume it from {run_dir}.", level="ERROR")
+        if self.watermark is not None:
+            self.watermark.rollback()
+
+    def _release_memory(self):
+        """
+        Releases all tracked intermediates, removes the temporary spill directory and logs the memory report.
+        """
+        if self.monitor is not None:
+            self.monitor.cleanup()
+            self._log(f"Memory report: {self.monitor.stats()}.")
+
+    def _succeed(self, run_dir: Optional[str]):
+        """
+        Commits the staged watermark and removes the checkpoints of a successful run.
+        """
+        if self.watermark is not None:
+            self.watermark.commit()
+        if run_dir is not None:
+            shutil.rmtree(run_dir)
+
+    def _execute(self, current_data, start: int = 0, run_dir: Optional[str] = None, manifest: Optional[dict] = None):
+        """
+        Runs the pipelines from index `start` on, checkpointing after each one if `run_dir` is set.
+        """
+        try:
+            with self._activate():
+                for index in range(start, len(self.pipelines)):
+                    current_data = self._run_pipeline(self.pipelines[index], current_data)
+                    self._after_pipeline(index, current_data, run_dir, manifest)
+        except Exception:
+            self._fail(run_dir, manifest)
+            raise
+        finally:
+            self._release_memory()
+
+        self._succeed(run_dir)
+        return current_data
+
+    async def _run_pipeline_async(self, pipeline: Any, current_data):
+        """
+        Awaitable variant of `_run_pipeline`.
+        """
+        if isinstance(pipeline, FlowThroughPipe):
+            if current_data is None:
+                raise ValueError("FlowThroughPipe requires input data, but none was provided.")
+            return await pipeline.run_async(current_data)
+        elif isinstance(pipeline, LoadingPipe):
+            current_data = await pipeline.run_async()
+            if self.encoder is not None:
+                current_data = await run_cpu(self.encoder.use, current_data)
+            return current_data
+        elif isinstance(pipeline, ExportPipe):
+            if current_data is None:
+                raise ValueError("ExportPipe requires input data, but none was provided.")
+            await pipeline.run_async(current_data)
+            return None
+        else:
+            raise TypeError(f"Unknown pipeline type: {type(pipeline)}")
+
+    async def _execute_async(self, current_data, run_dir: Optional[str] = None, manifest: Optional[dict] = None):
+        """
+        Awaitable variant of `_execute`. Checkpoints are written in the shared I/O pool.
+        """
+        try:
+            with self._activate():
+                for index in range(len(self.pipelines)):
+                    current_data = await self._run_pipeline_async(self.pipelines[index], current_data)
+                    await run_io(self._after_pipeline, index, current_data, run_dir, manifest)
+        except Exception:
+            self._fail(run_dir, manifest)
+            raise
+        finally:
+            self._release_memory()
+
+        self._succeed(run_dir)
+        return current_data
+
+    @staticmethod
+    def _describe(value: Any) -> Any:
+        """
+        Returns a JSON-serializable description of a pipeline argument that is stable across
+        processes: containers are described item by item, other objects by their type (and their
+        name for classes and functions), never by their address.
+        """
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return [Sequence._describe(item) for item in value]
+        if isinstance(value, dict):
+            return {str(Sequence._describe(key)): Sequence._describe(item) for key, item in value.items()}
+        if isinstance(value, pl.DataType) or (isinstance(value, type) and issubclass(value, pl.DataType)):
+            return str(value)
+        if hasattr(value, "__qualname__"):
+            return f"{getattr(value, '__module__', '')}.{value.__qualname__}"
+        return type(value).__qualname__
+
+    def _steps(self) -> List[dict]:
+        """
+        Describes the pipelines of the sequence for the run manifest: the factory name and its
+        arguments, without the `log` and `watermark` arguments the sequence injects.
+        """
+        return [
+            {"pipeline": name, "args": self._describe({k: v for k, v in args.items() if k not in ("log", "watermark")})}
+            for name, args in zip(self.pipeline_names, self.pipeline_args)
+        ]
+
+    def _start_run(self):
+        """
+        Creates the checkpoint directory and manifest of a new run.
+
+        Returns:
+        - Tuple: The run directory and the manifest.
+        """
+        run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        run_dir = os.path.join(self.checkpoint_dir, self.name, run_id)
+        os.makedirs(run_dir)
+        manifest = {
+            "sequence": self.name,
+            "run_id": run_id,
+            "pipelines": self._steps(),
+            "completed": -1,
+            "output": None,
+            "status": "running",
+        }
+        self._write_manifest(run_dir, manifest)
+        return run_dir, manifest
+
     def run(self, data=None):
         """
         Execute the sequence of pipelines.
@@ -51,21 +382,71 @@ class Sequence:
         Returns:
         - Final processed data or None, depending on the pipeline type.
         """
-        current_data = data
-        for pipeline in self.pipelines:
-            # Determine pipeline type and run appropriately
-            if isinstance(pipeline, FlowThroughPipe):
-                if current_data is None:
-                    raise ValueError("FlowThroughPipe requires input data, but none was provided.")
-                current_data = pipeline.run(current_data)
-            elif isinstance(pipeline, LoadingPipe):
-                current_data = pipeline.run()  # No input required
-            elif isinstance(pipeline, ExportPipe):
-                if current_data is None:
-                    raise ValueError("ExportPipe requires input data, but none was provided.")
-                pipeline.run(current_data)  # No output expected
-                current_data = None  # Reset current_data after export
-            else:
-                raise TypeError(f"Unknown pipeline type: {type(pipeline)}")
-
-        return current_data
\ No newline at end of file
+        if self.checkpoint_dir is None:
+            return self._execute(data)
+        run_dir, manifest = self._start_run()
+        return self._execute(data, run_dir=run_dir, manifest=manifest)
+
+    async def run_async(self, data=None):
+        """
+        Execute the sequence of pipelines on the running event loop.
+
+        Import and export components run in a shared I/O thread pool and all other components in a
+        shared CPU thread pool, so CPU stages of one sequence overlap with I/O waits and CPU stages
+        of others, e.g. `await asyncio.gather(first.run_async(), second.run_async())`. Inputs of
+        StoreInputs and StoreAndAggregateInputs are loaded concurrently. Synchronous components
+        run unchanged.
+
+        Parameters:
+        - data: Initial data for the sequence (if required by the first pipeline).
+
+        Returns:
+        - Final processed data or None, depending on the pipeline type.
+        """
+        if self.checkpoint_dir is None:
+            return await self._execute_async(data)
+        run_dir, manifest = await run_io(self._start_run)
+        return await self._execute_async(data, run_dir=run_dir, manifest=manifest)
+
+    def resume(self, run_id: Optional[str] = None):
+        """
+        Continues a failed (or killed) checkpointed run after its last completed pipeline.
+
+        Parameters:
+        - run_id: The run to resume. Defaults to the most recent unfinished run.
+
+        Returns:
+        - Final processed data or None, depending on the pipeline type.
+
+        Raises:
+        - ValueError: If checkpointing is disabled, no run is found, or the run was recorded
+          for a different list of pipelines or pipeline arguments.
+        """
+        if self.checkpoint_dir is None:
+            raise ValueError("resume() requires the Sequence to be created with a checkpoint_dir.")
+
+        sequence_dir = os.path.join(self.checkpoint_dir, self.name)
+        runs = sorted(os.listdir(sequence_dir)) if os.path.isdir(sequence_dir) else []
+        if run_id is None and runs:
+            run_id = runs[-1]
+        if run_id is None or run_id not in runs:
+            raise ValueError(f"No checkpointed run to resume for sequence '{self.name}'.")
+
+        run_dir = os.path.join(sequence_dir, run_id)
+        with open(os.path.join(run_dir, "manifest.json"), "r") as file:
+            manifest = json.load(file)
+        if manifest["pipelines"] != self._steps():
+            recorded = [step["pipeline"] if isinstance(step, dict) else step for step in manifest["pipelines"]]
+            raise ValueError(f"Run '{run_id}' was recorded for different pipelines or arguments: {recorded}.")
+
+        current_data = None
+        if manifest["output"] is not None:
+            current_data = pl.read_ipc(os.path.join(run_dir, manifest["output"]))
+        if self.watermark is not None and "watermark" in manifest:
+            self.watermark.pending = manifest["watermark"]
+
+        start = manifest["completed"] + 1
+        self._log(f"Resuming run '{run_id}' at pipeline {start + 1}/{len(self.pipelines)}.")
+        manifest["status"] = "running"
+        self._write_manifest(run_dir, manifest)
+        return self._execute(current_data, start=start, run_dir=run_dir, manifest=manifest)
@@ -1,9 +1,16 @@
-import importlib.util
+from MLTest.core.ModuleCache import ModuleCache, MODULE_CACHE
 import os
 
 class UseStrategy:
-    def __init__(self, strategies_folder="strategies"):
+    def __init__(self, strategies_folder="strategies", cache: ModuleCache = None):
+        """
+        :param strategies_folder: Folder containing the strategy files.
+        :param cache: Module cache to load strategies through. Defaults to the process-wide cache,
+                      so unchanged strategy files are executed once per process and edited ones
+                      are reloaded automatically.
+        """
         self.strategies_folder = strategies_folder
+        self.cache = cache or MODULE_CACHE
 
     def load_strategy(self, strategy_name):
         """Dynamically loads a strategy by name."""
@@ -12,10 +19,8 @@ class UseStrategy:
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"Strategy file '{strategy_name}.py' not found in '{self.strategies_folder}'")
 
-        # Load the strategy module
-        spec = importlib.util.spec_from_file_location(strategy_name, file_path)
-        strategy_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(strategy_module)
+        # Load the strategy module (cached while the file is unchanged)
+        strategy_module = self.cache.load(file_path, strategy_name)
 
         # Ensure the strategy file has a `strategy` function defined
         if not hasattr(strategy_module, "strategy"):
@@ -31,4 +36,11 @@ class UseStrategy:
         :return: Processed DataFrame after applying the strategy.
         """
         strategy_func = self.load_strategy(strategy_name)
-        return strategy_func(data)
\ No newline at end of file
+        return strategy_func(data)
+
+    def cache_stats(self):
+        """
+        Returns the statistics of the module cache used to load strategies.
+        :return: Dictionary with hits, misses, reloads and the number of cached modules.
+        """
+        return self.cache.stats()
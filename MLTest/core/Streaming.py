@@ -0,0 +1,200 @@
+from MLTest.core.Logger import LoggerSingleton
+from MLTest.core.Pipelines import FlowThroughPipe, ExportPipe
+from MLTest.core.Watermarks import WatermarkStore
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+import threading
+import hashlib
+import queue
+import time
+
+
+class MicroBatch:
+    """
+    A group of landed files processed together. The id is derived from the file list, so a
+    batch replayed after a failure gets the same id (and the same export part file).
+
+    Components find the batch being processed through `MicroBatch.active()`.
+    """
+    _active = ContextVar("active_micro_batch", default=None)
+
+    def __init__(self, files: List[str], size: int = 0, first_seen: Optional[float] = None):
+        self.files = sorted(files)
+        self.id = hashlib.sha1("\n".join(self.files).encode()).hexdigest()[:16]
+        self.size = size
+        self.first_seen = first_seen if first_seen is not None else time.time()
+        self.data = None
+
+    @classmethod
+    def active(cls) -> Optional["MicroBatch"]:
+        """
+        Returns the batch processed in the current context, or None.
+        """
+        return cls._active.get()
+
+    @contextmanager
+    def activate(self):
+        """
+        Makes the batch visible to components through `MicroBatch.active()`.
+        """
+        token = MicroBatch._active.set(self)
+        try:
+            yield self
+        finally:
+            MicroBatch._active.reset(token)
+
+
+class StreamRunner:
+    """
+    Pushes micro-batches of a streaming source (e.g. `StreamDirectory`) through a FlowThroughPipe
+    and an ExportPipe.
+
+    A reader thread prepares batches into a bounded queue; when `max_pending` batches wait for
+    processing, the reader blocks and stops listing and reading files (backpressure).
+
+    Bookkeeping is exactly-once: a batch is recorded as open in the WatermarkStore before it is
+    processed and its files are committed as processed only after the export succeeded. After a
+    failure, open batches are replayed first with the same files and id, so append exports
+    overwrite the part file of the failed attempt instead of duplicating it.
+    """
+    def __init__(self, source, flow: Optional[FlowThroughPipe], export: ExportPipe,
+                 watermark: WatermarkStore, max_pending: int = 2, log: bool = False):
+        """
+        Initializes the StreamRunner.
+
+        Parameters:
+        - source: Streaming source providing `key`, `poll_interval`, `next_batch(timeout)`, `read(batch)`,
+          `claim(batch)` and `release(batch)`, e.g. `StreamDirectory`.
+        - flow (Optional[FlowThroughPipe]): Pipeline applied to every batch, or None.
+        - export (ExportPipe): Pipeline exporting every processed batch.
+        - watermark (WatermarkStore): Store of processed files and open batches.
+        - max_pending (int): Maximum number of read batches waiting for processing (default: 2).
+        - log (bool): Whether to log batch events.
+        """
+        self.source = source
+        self.flow = flow
+        self.export = export
+        self.watermark = watermark
+        self.max_pending = max_pending
+        self.log_enabled = log
+        self.open_key = f"{source.key}#open_batches"
+        self.stats = {"batches": 0, "rows": 0, "files": 0, "latencies": []}
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.log_enabled:
+            LoggerSingleton().log(f"[StreamRunner] {message}", level)
+
+    def _open_batches(self) -> dict:
+        """
+        Returns the batches recorded as open by a previous run, by id.
+        """
+        return dict(self.watermark.get(self.open_key) or {})
+
+    def _put(self, batches: "queue.Queue", item: Optional[MicroBatch], stop: threading.Event) -> bool:
+        """
+        Blocks until the item fits into the queue (backpressure) or the runner stops.
+        """
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=self.source.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self, batches: "queue.Queue", stop: threading.Event, errors: list):
+        """
+        Reader thread: replays open batches, then polls the source and enqueues read batches.
+        """
+        try:
+            for files in self._open_batches().values():
+                batch = MicroBatch(files)
+                self.source.claim(batch)
+                batch.data = self.source.read(batch)
+                self._log(f"Replaying open batch {batch.id} ({len(files)} file(s)).")
+                if not self._put(batches, batch, stop):
+                    return
+            while not stop.is_set():
+                batch = self.source.next_batch(timeout=self.source.poll_interval)
+                if batch is None:
+                    continue
+                batch.data = self.source.read(batch)
+                if not self._put(batches, batch, stop):
+                    return
+        except Exception as e:
+            errors.append(e)
+            self._log(f"Reader failed: {e}", level="ERROR")
+        self._put(batches, None, stop)
+
+    def _process(self, batch: MicroBatch):
+        """
+        Processes one batch: records it as open, runs the pipelines and commits its files.
+        """
+        open_batches = self._open_batches()
+        open_batches[batch.id] = batch.files
+        self.watermark.stage(self.open_key, open_batches)
+        self.watermark.commit()
+
+        with batch.activate():
+            data = self.flow.run(batch.data) if self.flow is not None else batch.data
+            self.export.run(data)
+
+        open_batches.pop(batch.id)
+        self.watermark.stage(self.open_key, open_batches)
+        self.watermark.stage_files(self.source.key, batch.files)
+        self.watermark.commit()
+        self.source.release(batch)
+
+        latency = time.time() - batch.first_seen
+        self.stats["batches"] += 1
+        self.stats["rows"] += data.height
+        self.stats["files"] += len(batch.files)
+        self.stats["latencies"].append(latency)
+        self._log(f"Batch {batch.id}: {len(batch.files)} file(s), {data.height} row(s), latency {latency:.2f}s.")
+
+    def run(self, max_batches: Optional[int] = None, idle_timeout: Optional[float] = None) -> dict:
+        """
+        Processes batches until `max_batches` were processed or no batch arrived for `idle_timeout`
+        seconds. Without both limits it runs until interrupted.
+
+        Returns:
+        - dict: Processed batches, rows and files, and the per-batch latencies in seconds.
+        """
+        batches = queue.Queue(maxsize=self.max_pending)
+        stop = threading.Event()
+        errors = []
+        reader = threading.Thread(target=self._read, args=(batches, stop, errors), daemon=True)
+        reader.start()
+        self._log(f"Streaming from {self.source.key} (max pending batches: {self.max_pending}).")
+
+        processed = 0
+        try:
+            while max_batches is None or processed < max_batches:
+                try:
+                    batch = batches.get(timeout=idle_timeout)
+                except queue.Empty:
+                    self._log(f"No batch for {idle_timeout}s. Stopping.")
+                    break
+                if batch is None:
+                    if errors:
+                        raise errors[0]
+                    break
+                try:
+                    self._process(batch)
+                except Exception as e:
+                    self.watermark.rollback()
+                    self.source.release(batch)
+                    self._log(f"Batch {batch.id} failed: {e}. It is replayed on the next run.", level="ERROR")
+                    raise
+                processed += 1
+        finally:
+            stop.set()
+            reader.join()
+            # Batches read ahead but not processed are picked up again by the next run
+            while not batches.empty():
+                batch = batches.get_nowait()
+                if batch is not None:
+                    self.source.release(batch)
+
+        return self.stats
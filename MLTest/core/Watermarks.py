@@ -0,0 +1,102 @@
+from datetime import date, datetime
+from typing import Any, Iterable
+import json
+import os
+
+
+class WatermarkStore:
+    """
+    Persists incremental-run state between Sequence runs in a JSON file.
+
+    Two kinds of state are kept per key (usually the input path):
+    - a value watermark, e.g. the max `Datetime` already processed,
+    - a set of files that were already processed.
+
+    Components only stage new state. It is written to disk by `commit`, which the
+    Sequence calls after a successful run, so a failed run is retried from the
+    previous watermark.
+    """
+    def __init__(self, path: str):
+        """
+        Initializes the store and loads the committed state if the file exists.
+
+        Parameters:
+        - path (str): Path of the JSON state file.
+        """
+        self.path = path
+        self.state = {"watermarks": {}, "processed_files": {}}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                self.state = json.load(file)
+        self.pending = {"watermarks": {}, "processed_files": {}}
+
+    @staticmethod
+    def _encode(value: Any) -> dict:
+        """
+        Encodes a watermark value into a JSON-serializable form.
+        """
+        if isinstance(value, datetime):
+            return {"type": "datetime", "value": value.isoformat()}
+        if isinstance(value, date):
+            return {"type": "date", "value": value.isoformat()}
+        return {"type": "raw", "value": value}
+
+    @staticmethod
+    def _decode(encoded: dict) -> Any:
+        """
+        Decodes a watermark value stored by `_encode`.
+        """
+        if encoded["type"] == "datetime":
+            return datetime.fromisoformat(encoded["value"])
+        if encoded["type"] == "date":
+            return date.fromisoformat(encoded["value"])
+        return encoded["value"]
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the committed watermark for a key, or None if the key was never committed.
+        """
+        encoded = self.state["watermarks"].get(key)
+        return self._decode(encoded) if encoded is not None else None
+
+    def stage(self, key: str, value: Any):
+        """
+        Stages a new watermark for a key. It becomes visible after `commit`.
+        """
+        if value is not None:
+            self.pending["watermarks"][key] = self._encode(value)
+
+    def processed_files(self, key: str) -> set:
+        """
+        Returns the set of files already processed for a key.
+        """
+        return set(self.state["processed_files"].get(key, []))
+
+    def stage_files(self, key: str, files: Iterable[str]):
+        """
+        Stages files as processed for a key. They are recorded after `commit`.
+        """
+        self.pending["processed_files"].setdefault(key, []).extend(files)
+
+    def commit(self):
+        """
+        Merges the staged state into the committed state and writes it atomically.
+        """
+        self.state["watermarks"].update(self.pending["watermarks"])
+        for key, files in self.pending["processed_files"].items():
+            self.state["processed_files"][key] = sorted(self.processed_files(key) | set(files))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.state, file, indent=2)
+        os.replace(tmp_path, self.path)
+        self.rollback()
+
+    def rollback(self):
+        """
+        Discards all staged state.
+        """
+        self.pending = {"watermarks": {}, "processed_files": {}}
@@ -1,5 +1,7 @@
 from MLTest.interfaces.Typing import DF
 from MLTest.core.Logger import LoggerSingleton
+from MLTest.core.Planning import Estimate
+from MLTest.core.Async import run_io, run_cpu
 from abc import ABC, abstractmethod
 from typing import List
 
@@ -27,7 +29,21 @@ such as Import, Flow, Aggregator, and Export components.
       is properly initialized.
     - Pass the `log` parameter explicitly to the parent class's `__init__` if logging functionality is needed.
 
-4. **Logging in Components**:
+4. **Dry Runs (optional)**:
+    - Override `plan(self, estimate)` to declare how the component changes the schema and size of the
+      data without touching it. Use `estimate.require(...)` to fail fast on missing columns.
+    - The estimate defaults to None (e.g. after an export), so start with
+      `estimate = estimate or Estimate()` before using it.
+    - Components that do not override it are assumed to keep the schema unchanged.
+
+5. **Asynchronous Execution (optional)**:
+    - `Sequence.run_async` awaits `use_async` instead of calling `use`. Components setting
+      `io_bound = True` (imports and exports do by default) run `use` in the shared I/O thread
+      pool, other components in the shared CPU thread pool, so existing components work unchanged
+      and never block the event loop.
+    - Override `async def use_async(...)` for a natively asynchronous implementation.
+
+6. **Logging in Components**:
     - Enable logging by passing `log=True` when creating the component instance.
     - Use the `self.log(message, level)` method to log messages within your component.
     - Ensure the `log` parameter is included in the `__init__` method if it’s overridden.
@@ -65,6 +81,9 @@ class Component(ABC):
     Basic component interface with integrated logging functionality.
     All components must implement a `use` method.
     """
+    # Components mostly waiting on disk or network run in the shared I/O pool under `use_async`
+    io_bound = False
+
     def __init__(self, log: bool = False):
         """
         Initializes the component with optional logging.
@@ -104,12 +123,37 @@ class Component(ABC):
         """
         pass
 
+    async def use_async(self, *args):
+        """
+        Awaitable variant of `use` used by `Sequence.run_async`. I/O-bound components run `use`
+        in the shared I/O thread pool, other components in the shared CPU thread pool (Polars
+        releases the GIL), so the event loop keeps running other stages meanwhile.
+        """
+        if self.io_bound:
+            return await run_io(self.use, *args)
+        return await run_cpu(self.use, *args)
+
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Propagate a schema and size estimate through the component without processing data.
+        The default assumes the component keeps the schema and row count unchanged.
+
+        Parameters:
+        - estimate (Estimate): Estimate of the component input.
+
+        Returns:
+        - Estimate: Estimate of the component output.
+        """
+        return estimate
+
 
 class ImportComponent(Component):
     """
     Import component that accepts any input type but must return a Polars DataFrame.
     Requires a `save_to` parameter during initialization.
     """
+    io_bound = True
+
     def __init__(self, src: str, log: bool = False):
         """
         Initialize the ImportComponent with a src destination.
@@ -133,6 +177,12 @@ class ImportComponent(Component):
         """
         pass
 
+    def plan(self, estimate: Estimate = None) -> Estimate:
+        """
+        Imported data is unknown unless the component reads its metadata.
+        """
+        return Estimate()
+
 
 class FlowComponent(Component):
     """
@@ -181,6 +231,8 @@ class ExportComponent(Component):
     Export component that accepts a Polars DataFrame and can export it to any specified format.
     Requires a `export_to` parameter during initialization.
     """
+    io_bound = True
+
     def __init__(self, export_to: str, log: bool = False):
         """
         Initialize the ExportComponent with an export_to parameter.
@@ -201,12 +253,20 @@ class ExportComponent(Component):
         """
         pass
 
+    def plan(self, estimate: Estimate = None) -> None:
+        """
+        Exports produce no output.
+        """
+        return None
+
 
 class MultiExportComponent(Component):
     """
     Export component that accepts a Polars DataFrame and can export it to any specified format.
     Requires a `export_to` parameter during initialization.
     """
+    io_bound = True
+
     def __init__(self, export_to: str, log: bool = False):
         """
         Initialize the ExportComponent with an export_to parameter.
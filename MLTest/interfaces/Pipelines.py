@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from MLTest.interfaces.Components import Component
 from MLTest.interfaces.Typing import DF
-from typing import List
+from MLTest.core.Planning import Estimate
+from typing import List, Optional, Tuple
 
 
 class Pipeline(ABC):
@@ -28,4 +29,41 @@ class Pipeline(ABC):
         Returns:
         - DF: The result of the pipeline (if applicable).
         """
-        pass
\ No newline at end of file
+        pass
+
+    async def run_async(self, *args) -> DF:
+        """
+        Awaitable variant of `run`. Pipelines that do not override it run synchronously.
+        """
+        return self.run(*args)
+
+    @staticmethod
+    def _bytes(estimate) -> Optional[int]:
+        """
+        Returns the estimated size of a component input or output (None if unknown).
+        """
+        if estimate is None:
+            return 0
+        if isinstance(estimate, list):
+            sizes = [Pipeline._bytes(item) for item in estimate]
+            return None if any(size is None for size in sizes) else sum(sizes)
+        return estimate.bytes
+
+    def plan(self, estimate: Estimate = None) -> Tuple[Optional[Estimate], Optional[int]]:
+        """
+        Propagates a schema and size estimate through all components without processing data.
+
+        Parameters:
+        - estimate (Estimate): Estimate of the pipeline input (None for loading pipelines).
+
+        Returns:
+        - Tuple: The estimate of the pipeline output and the estimated peak memory in bytes
+          (input plus output of the most expensive component, None if unknown).
+        """
+        peak = 0
+        for component in self.components:
+            output = component.plan(estimate)
+            sizes = [self._bytes(estimate), self._bytes(output)]
+            peak = None if peak is None or None in sizes else max(peak, sum(sizes))
+            estimate = output
+        return estimate, peak
@@ -1,12 +1,13 @@
 # INTERFACES
 from MLTest.core.Pipelines import ExportPipe, FlowThroughPipe, LoadingPipe
-from typing import List, Any
+from typing import List, Any, Optional
 import polars as pl
 
 # COMPONENTS
 from MLTest.components.storage.Input import StoreInputs
 from MLTest.components.filesystem.Export import ExportData
-from MLTest.components.filesystem.Input import LoadData
+from MLTest.components.filesystem.Input import LoadData, LoadNewData
+from MLTest.core.Watermarks import WatermarkStore
 from MLTest.components.preprocessing.Format import GenerateTimeStamp, SplitTimeColumn, FormatDate
 from MLTest.components.preprocessing.Regulation import MergeStorage
 from MLTest.components.preprocessing.Replace import ReplaceStringPattern
@@ -36,6 +37,35 @@ def _MergeData(inputs: List[str], merge_type: str, pk: str, log: bool = False):
     return pipe
 
 
+def _MergeNewData(inputs: List[str], new_input: str, merge_type: str, pk: str, watermark: WatermarkStore,
+                  watermark_column: Optional[str] = None, log: bool = False):
+    """
+    Creates an incremental pipeline that joins only new rows of `new_input` against
+    cached (unchanged) inputs.
+
+    Parameters:
+    - inputs: List of input file paths loaded in full and cached between runs (e.g. Users, Cards).
+    - new_input: File, directory or glob of the incrementally growing input (e.g. transactions).
+    - merge_type: Merge type (e.g., join-inner, join-outer).
+    - pk: Primary key to merge on.
+    - watermark: Store tracking what previous runs processed (injected by the Sequence).
+    - watermark_column: Column of the raw `new_input` files used as value watermark. If None, new files are detected instead.
+    - log: Enable logging (default: False).
+
+    Returns:
+    - LoadingPipe: Configured pipeline instance.
+    """
+    input_loaders = [LoadData(input, cache=True, log=log) for input in inputs]
+    input_loaders.append(LoadNewData(new_input, watermark=watermark, column=watermark_column, log=log))
+
+    pipe = LoadingPipe([
+        StoreInputs(input_loaders, log=log),
+        MergeStorage(how=merge_type, on=pk, log=log),
+    ])
+
+    return pipe
+
+
 def _HandleDateColumns_(cols: List[str], date_format: str = "%m/%Y", tms_format: str = "%Y-%m-%d-%H-%M", log: bool = False):
     """
     Creates a pipeline to handle date columns by formatting and splitting.
@@ -78,7 +108,8 @@ def _ReplaceStrInColumns_(cols: List[str], pattern: str, replace: str, log: bool
     return pipe
 
 
-def CastFillAndExport_(cols_and_types: dict[str, pl.DataType], fill_by: dict[pl.DataType, Any], export_to: str, log: bool = False):
+def CastFillAndExport_(cols_and_types: dict[str, pl.DataType], fill_by: dict[pl.DataType, Any], export_to: str,
+                       export_mode: str = "overwrite", log: bool = False):
     """
     Creates a pipeline to cast column types, handle nulls, and export data.
 
@@ -86,6 +117,7 @@ def CastFillAndExport_(cols_and_types: dict[str, pl.DataType], fill_by: dict[pl.
     - cols_and_types: Dictionary mapping column names to data types.
     - fill_by: Dictionary mapping data types to fill values for null handling.
     - export_to: Path to export the processed data.
+    - export_mode: "overwrite" (default) or "append" to add a new part file per run.
     - log: Enable logging (default: False).
 
     Returns:
@@ -94,7 +126,7 @@ def CastFillAndExport_(cols_and_types: dict[str, pl.DataType], fill_by: dict[pl.
     pipe = ExportPipe([
         CastTypes(columns_and_types=cols_and_types, log=log),
         HandleNullValues(fill_values=fill_by, log=log),
-        ExportData(export_to=export_to, log=log),
+        ExportData(export_to=export_to, mode=export_mode, log=log),
     ])
 
     return pipe
@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+import polars as pl
+
+from MLTest.core.Pipelines import FlowThroughPipe, LoadingPipe
+from MLTest.core.Sequences import Sequence
+from MLTest.components.preprocessing.Regulation import MergeStorage
+from MLTest.components.storage.Input import StoreInputs
+from MLTest.interfaces.Components import FlowComponent, ImportComponent
+
+DELAY = 0.4
+
+
+class SlowImport(ImportComponent):
+    def use(self):
+        time.sleep(DELAY)
+        return pl.DataFrame({"User": [1, 2], "Amount": [1.0, 2.0]})
+
+
+class SlowTransform(FlowComponent):
+    """
+    Stands in for a Polars transformation, which releases the GIL while it computes.
+    """
+    def use(self, data):
+        time.sleep(DELAY)
+        return data.with_columns(pl.col("Amount") * 2)
+
+
+def Load(log: bool = False):
+    return LoadingPipe([StoreInputs([SlowImport("memory")], log=log), MergeStorage(how="concat", log=log)])
+
+
+def Transform(log: bool = False):
+    return FlowThroughPipe([SlowTransform(log=log)])
+
+
+def test_cpu_stages_overlap_with_other_sequences():
+    io_sequence = Sequence("io", [Load], [{}])
+    cpu_sequences = [Sequence(f"cpu-{i}", [Transform, Transform], [{}, {}]) for i in range(2)]
+    data = pl.DataFrame({"User": [1], "Amount": [1.0]})
+
+    async def main():
+        return await asyncio.gather(io_sequence.run_async(), *(sequence.run_async(data) for sequence in cpu_sequences))
+
+    start = time.monotonic()
+    loaded, *transformed = asyncio.run(main())
+    elapsed = time.monotonic() - start
+
+    assert loaded.height == 2
+    assert [frame.get_column("Amount").to_list() for frame in transformed] == [[4.0], [4.0]]
+    # On the event loop, the four CPU stages would run one after another and take 4 * DELAY
+    assert elapsed < 3 * DELAY
@@ -0,0 +1,82 @@
+import os
+import time
+
+import polars as pl
+import pytest
+
+from MLTest.core.Executors import ShardedExecutor
+
+
+def count_per_user(data: pl.DataFrame, threads: int = None) -> pl.DataFrame:
+    if threads is not None and pl.thread_pool_size() != threads:
+        raise RuntimeError(f"Polars runs {pl.thread_pool_size()} threads instead of {threads}.")
+    return data.sort("User", "Row").with_columns(pl.int_range(pl.len()).over("User").alias("Number"))
+
+
+def fail_once(data: pl.DataFrame, markers: str) -> pl.DataFrame:
+    # Every shard fails on its first attempt and succeeds when retried
+    marker = os.path.join(markers, f"{data.get_column('Row').min()}.attempted")
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        raise ValueError("First attempt fails.")
+    return data
+
+
+def fail_always(data: pl.DataFrame) -> pl.DataFrame:
+    raise ValueError("Broken task.")
+
+
+def sleep_forever(data: pl.DataFrame) -> pl.DataFrame:
+    time.sleep(60)
+    return data
+
+
+@pytest.fixture(scope="module")
+def transactions() -> pl.DataFrame:
+    users = [0] * 400 + [user for user in range(1, 41) for _ in range(10)]
+    return pl.DataFrame({"User": users, "Row": range(len(users)), "Amount": [float(i % 97) for i in range(len(users))]})
+
+
+def test_shards_merge_into_the_unsharded_result(transactions):
+    executor = ShardedExecutor({"function": f"{__name__}:count_per_user", "kwargs": {"threads": 2}}, shards=4, threads=2)
+    result = executor.run(transactions)
+
+    expected = count_per_user(transactions)
+    assert result.sort("Row").equals(expected.sort("Row"))
+    # Workers checked their thread budget, which Polars only reads at import
+    assert [outcome["error"] for outcome in executor.outcomes] == [None] * len(executor.outcomes)
+
+
+def test_skewed_keys_are_rebalanced(transactions):
+    executor = ShardedExecutor(f"{__name__}:count_per_user", shards=4)
+    shards = executor.partition(transactions)
+
+    # Every key stays in one shard
+    assert shards.group_by("User").agg(pl.col("shard").n_unique()).get_column("shard").max() == 1
+    sizes = shards.group_by("shard").len().get_column("len")
+    # The heavy user fills one shard, the small users are spread evenly over the others
+    assert sizes.max() == 400
+    assert sorted(sizes.to_list()) == [130, 130, 140, 400]
+
+
+def test_failed_shards_are_retried(transactions, tmp_path):
+    executor = ShardedExecutor({"function": f"{__name__}:fail_once", "kwargs": {"markers": str(tmp_path)}}, shards=2, retries=1)
+    result = executor.run(transactions)
+
+    assert result.sort("Row").equals(transactions)
+    attempts = sorted((outcome["shard"], outcome["attempt"], outcome["error"] is None) for outcome in executor.outcomes)
+    assert attempts == [(0, 1, False), (0, 2, True), (1, 1, False), (1, 2, True)]
+    assert "First attempt fails." in executor.outcomes[0]["error"]
+
+
+def test_errors_are_reported_after_the_last_retry(transactions):
+    executor = ShardedExecutor(f"{__name__}:fail_always", shards=2, retries=1, timeout=30)
+    with pytest.raises(RuntimeError, match="ValueError: Broken task."):
+        executor.run(transactions)
+    assert all("Timed out" not in outcome["error"] for outcome in executor.outcomes)
+
+
+def test_only_terminated_workers_time_out(transactions):
+    executor = ShardedExecutor(f"{__name__}:sleep_forever", shards=2, retries=0, timeout=1)
+    with pytest.raises(RuntimeError, match="Timed out after 1 s."):
+        executor.run(transactions)
@@ -0,0 +1,65 @@
+import math
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+
+from MLTest.components.features.Geo import TransactionDistance
+from MLTest.components.features.Window import LagFeatures
+
+START = datetime(2020, 1, 1)
+
+
+def _frame(rows):
+    return pl.DataFrame(rows, schema={"User": pl.Int64, "Datetime": pl.Datetime, "Latitude": pl.Float64,
+                                      "Longitude": pl.Float64, "Row": pl.Int64}, orient="row")
+
+
+def test_haversine_matches_known_distances():
+    data = _frame([
+        (0, START, 48.8566, 2.3522, 0),                          # Paris
+        (0, START + timedelta(hours=2), 51.5074, -0.1278, 1),    # London
+        (1, START, 0.0, 10.0, 2),
+        (1, START + timedelta(hours=1), 1.0, 10.0, 3),           # One degree north along a meridian
+    ])
+    result = TransactionDistance().use(data)
+    distance, speed = result.get_column("TransactionDistance"), result.get_column("TransactionSpeed")
+
+    assert distance[1] == pytest.approx(343.56, abs=0.05)
+    assert speed[1] == pytest.approx(distance[1] / 2)
+    assert distance[3] == pytest.approx(TransactionDistance.EARTH_RADIUS_KM * math.pi / 180)
+    assert speed[3] == pytest.approx(distance[3])
+
+
+def test_single_transactions_and_null_coordinates_give_nulls():
+    data = _frame([
+        (0, START, 40.0, -75.0, 0),                               # Only transaction of the user
+        (1, START, 40.0, -75.0, 1),
+        (1, START + timedelta(hours=1), None, -75.0, 2),          # Null coordinate
+        (1, START + timedelta(hours=2), 41.0, -75.0, 3),          # Follows the null coordinate
+        (1, START + timedelta(hours=3), 42.0, -75.0, 4),
+    ])
+    result = TransactionDistance().use(data)
+    assert result.get_column("TransactionDistance").is_null().to_list() == [True, True, True, True, False]
+    assert result.get_column("TransactionSpeed").is_null().to_list() == [True, True, True, True, False]
+
+    filled = TransactionDistance(fill_value=0.0).use(data)
+    assert filled.get_column("TransactionDistance").to_list()[:4] == [0.0] * 4
+
+
+def test_equal_timestamps_keep_the_input_order():
+    data = _frame([
+        (0, START, 40.0, -75.0, 0),
+        (0, START + timedelta(hours=1), 41.0, -75.0, 1),
+        (0, START + timedelta(hours=1), 45.0, -75.0, 2),
+        (0, START + timedelta(hours=1), 43.0, -75.0, 3),
+    ])
+    # Rows arrive in reverse; the stable sort keeps rows 3, 2, 1 of the tie in that order
+    result = TransactionDistance(metric="euclidean").use(data.reverse())
+    assert result.get_column("Row").to_list() == [0, 3, 2, 1]
+    assert result.get_column("TransactionDistance").to_list()[1:] == pytest.approx([3.0, 2.0, 4.0])
+    # No time passes within the tie, so the speed is undefined
+    assert result.get_column("TransactionSpeed").to_list()[2:] == [None, None]
+    # The same order as the window features computed on the same frame
+    lagged = LagFeatures(columns=["Latitude"], lags=[1]).use(data.reverse())
+    assert lagged.get_column("Row").to_list() == result.get_column("Row").to_list()
@@ -0,0 +1,109 @@
+import threading
+import time
+import weakref
+
+import polars as pl
+import pytest
+
+from MLTest.core.Graphs import GraphSequence, Node
+from MLTest.core.Pipelines import FlowThroughPipe, LoadingPipe, MergingPipe
+from MLTest.components.filesystem.Input import LoadData
+from MLTest.components.preprocessing.Regulation import MergeStorage
+from MLTest.components.storage.Input import StoreInputs
+from MLTest.interfaces.Components import FlowComponent
+
+DELAY = 0.3
+
+
+class Record(FlowComponent):
+    """
+    Sleeps (releasing the GIL like a Polars kernel) and records when it ran and what it returned.
+    """
+    def __init__(self, name: str, spans: dict, refs: dict, log: bool = False):
+        super().__init__(log)
+        self.name = name
+        self.spans = spans
+        self.refs = refs
+
+    def use(self, data):
+        start = time.monotonic()
+        time.sleep(DELAY)
+        data = data.with_columns(pl.lit(self.name).alias(f"{self.name}_cleaned"))
+        self.spans[self.name] = (start, time.monotonic())
+        self.refs[self.name] = weakref.ref(data)
+        return data
+
+
+class CheckReleased(FlowComponent):
+    """
+    Records which intermediates are still alive while the node consuming the merge result runs.
+    """
+    def __init__(self, refs: dict, alive: dict, log: bool = False):
+        super().__init__(log)
+        self.refs = refs
+        self.alive = alive
+
+    def use(self, data):
+        self.alive.update({name: ref() is not None for name, ref in self.refs.items()})
+        return data
+
+
+@pytest.fixture
+def sources(tmp_path):
+    users, cards = tmp_path / "users.pq", tmp_path / "cards.pq"
+    pl.DataFrame({"User": [0, 1, 2], "Age": [30, 40, 50]}).write_parquet(users)
+    pl.DataFrame({"User": [0, 1, 1], "Card": [0, 0, 1]}).write_parquet(cards)
+    return str(users), str(cards)
+
+
+def _load(src: str, log: bool = False):
+    return LoadingPipe([StoreInputs([LoadData(src, log=log)], log=log), MergeStorage(how="concat", log=log)])
+
+
+def _diamond(sources, memory_budget=None, memory=None):
+    spans, refs, alive = {}, {}, {}
+    nodes = [
+        Node("load_users", _load, {"src": sources[0]}, output="users"),
+        Node("load_cards", _load, {"src": sources[1]}, output="cards"),
+        Node("clean_users", FlowThroughPipe([Record("users", spans, refs)]), inputs=["users"], output="users_clean", memory=memory),
+        Node("clean_cards", FlowThroughPipe([Record("cards", spans, refs)]), inputs=["cards"], output="cards_clean", memory=memory),
+        Node("merge", MergingPipe([MergeStorage(how="join-left", on="User", partitioned=False)]),
+             inputs=["users_clean", "cards_clean"], output="merged"),
+        Node("check", FlowThroughPipe([CheckReleased(refs, alive)]), inputs=["merged"], output="result"),
+    ]
+    graph = GraphSequence("diamond", nodes, max_workers=4, memory_budget=memory_budget)
+    return graph, spans, alive
+
+
+def _overlap(spans) -> bool:
+    (first_start, first_end), (second_start, second_end) = spans["users"], spans["cards"]
+    return first_start < second_end and second_start < first_end
+
+
+def test_diamond_merges_independently_cleaned_inputs(sources):
+    graph, spans, alive = _diamond(sources)
+    result = graph.run()["result"].sort("User", "Card")
+
+    assert result.select("User", "Age", "Card").rows() == [(0, 30, 0), (1, 40, 0), (1, 40, 1), (2, 50, None)]
+    assert {"users_cleaned", "cards_cleaned"} <= set(result.columns)
+    # The two cleaning nodes are independent and run at the same time
+    assert _overlap(spans)
+    # Both cleaned intermediates were freed once the merge node, their last consumer, finished
+    assert alive == {"users": False, "cards": False}
+
+
+def test_memory_budget_holds_a_node_back(sources):
+    graph, spans, _ = _diamond(sources, memory_budget=1_000_000, memory=800_000)
+    result = graph.run()["result"]
+
+    assert result.height == 4
+    assert not _overlap(spans)
+
+
+def test_several_inputs_require_a_merging_pipe(sources):
+    with pytest.raises(TypeError, match="MergingPipe"):
+        GraphSequence("invalid", [
+            Node("load_users", _load, {"src": sources[0]}, output="users"),
+            Node("load_cards", _load, {"src": sources[1]}, output="cards"),
+            Node("merge", FlowThroughPipe([CheckReleased({}, {})]), inputs=["users", "cards"], output="merged"),
+        ])
@@ -0,0 +1,44 @@
+import os
+
+import polars as pl
+import pytest
+
+from MLTest.components.filesystem.Input import LoadNewData
+from MLTest.core.Planning import PlanError
+from MLTest.core.Watermarks import WatermarkStore
+
+
+def _write(path, ids, mtime):
+    pl.DataFrame({"Id": ids, "Amount": [float(i) for i in ids]}).write_csv(path)
+    os.utime(path, (mtime, mtime))
+
+
+def test_value_watermark_scans_only_modified_files(tmp_path):
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    store = WatermarkStore(str(tmp_path / "state.json"))
+    _write(landing / "a.csv", [1, 2], 1_000)
+    _write(landing / "b.csv", [3, 4], 2_000)
+
+    loader = LoadNewData(str(landing), watermark=store, column="Id")
+    assert loader.use().get_column("Id").to_list() == [1, 2, 3, 4]
+    store.commit()
+
+    # Rows sneaked into an unmodified file are not read: the file is not scanned again
+    _write(landing / "a.csv", [1, 2, 99], 1_000)
+    _write(landing / "c.csv", [5, 6], 3_000)
+    data = loader.use()
+    assert sorted(data.get_column("Id").to_list()) == [5, 6]
+    store.commit()
+
+    assert loader.use().height == 0
+    assert loader.use().columns == ["Id", "Amount"]
+
+
+def test_value_watermark_column_must_exist_in_the_files(tmp_path):
+    _write(tmp_path / "a.csv", [1, 2], 1_000)
+    loader = LoadNewData(str(tmp_path / "*.csv"), watermark=WatermarkStore(str(tmp_path / "state.json")), column="Datetime")
+    with pytest.raises(ValueError, match="Watermark column 'Datetime'"):
+        loader.use()
+    with pytest.raises(PlanError, match="Datetime"):
+        loader.plan()
@@ -0,0 +1,153 @@
+import gc
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
+
+import polars as pl
+import pytest
+
+from MLTest.core.Executors import PipelinedExecutor
+from MLTest.core.Memory import current_rss
+from MLTest.core.Pipelines import LoadingPipe
+from MLTest.components.preprocessing.Regulation import MergeStorage
+from MLTest.components.storage.Input import StoreInputs
+from MLTest.interfaces.Components import FlowComponent, ImportComponent
+
+
+class PeakRSS:
+    """
+    Samples the RSS in a background thread and reports the peak growth over the RSS at entry.
+    """
+    def __enter__(self):
+        gc.collect()
+        self.base = self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            time.sleep(0.001)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+    @property
+    def growth(self) -> int:
+        return self.peak - self.base
+
+
+class Constant(ImportComponent):
+    def __init__(self, data):
+        super().__init__("memory")
+        self.data = data
+
+    def use(self):
+        return self.data
+
+
+class CountRows(FlowComponent):
+    def use(self, data):
+        return data.select(pl.len())
+
+
+def _inputs(rows: int = 20_000, users: int = 500):
+    start = datetime(2020, 1, 1)
+    transactions = pl.DataFrame({
+        "User": (pl.int_range(rows, eager=True) * 7919) % users,
+        "Datetime": [start + timedelta(minutes=i) for i in range(rows)],
+        "Amount": pl.int_range(rows, eager=True) * 0.5,
+    })
+    # User 0 is a heavy hitter; some users are missing on either side
+    transactions = pl.concat([transactions, transactions.head(3_000).with_columns(pl.lit(0, dtype=pl.Int64).alias("User"))])
+    profiles = pl.DataFrame({"User": pl.int_range(20, users + 20, eager=True), "Age": pl.int_range(users, eager=True) % 80})
+    limits = pl.DataFrame({
+        "User": pl.int_range(users, eager=True).append(pl.int_range(users, eager=True)),
+        "Datetime": [start] * users + [start + timedelta(days=5)] * users,
+        "Credit Limit": pl.int_range(2 * users, eager=True) * 10.0,
+    })
+    return transactions, profiles, limits
+
+
+def _sorted(df: pl.DataFrame) -> pl.DataFrame:
+    return df.sort(df.columns, nulls_last=True)
+
+
+@pytest.mark.parametrize("how", ["join-inner", "join-left", "join-right", "join-outer", "join-semi", "join-anti"])
+def test_partitioned_join_matches_in_memory(how):
+    transactions, profiles, _ = _inputs()
+    expected = MergeStorage(how=how, on="User", partitioned=False).use([transactions, profiles])
+    merge = MergeStorage(how=how, on="User", partitioned=True, partitions=4, heavy_hitter_rows=100)
+    result = merge.use([transactions, profiles])
+    assert result.schema == expected.schema
+    assert _sorted(result).equals(_sorted(expected))
+
+
+def test_partitioned_asof_join_matches_in_memory():
+    transactions, _, limits = _inputs()
+    specs = [{"how": "asof", "on": "Datetime", "by": "User"}]
+    expected = MergeStorage(specs=specs, partitioned=False).use([transactions, limits])
+    result = MergeStorage(specs=specs, partitioned=True, partitions=3, heavy_hitter_rows=100).use([transactions, limits])
+    assert _sorted(result).equals(_sorted(expected))
+
+
+def test_partitioned_join_keeps_the_callers_inputs():
+    transactions, profiles, _ = _inputs()
+    data = [transactions, profiles]
+    MergeStorage(how="join-inner", on="User", partitioned=True, partitions=2).use(data)
+    assert data[0] is transactions and data[1] is profiles
+
+    # A retained StoreInputs keeps its results after a partitioned merge
+    store = StoreInputs([Constant(transactions), Constant(profiles)], retain=True)
+    LoadingPipe([store, MergeStorage(how="join-inner", on="User", partitioned=True, partitions=2)]).run()
+    assert len(store.storage) == 2
+
+
+def test_iter_join_frees_inputs_the_caller_dropped():
+    transactions, profiles, _ = _inputs()
+    reference = weakref.ref(transactions)
+    joined = MergeStorage(how="join-inner", on="User", partitions=2).iter_join([transactions, profiles])
+    del transactions
+    next(joined)
+    gc.collect()
+    assert reference() is None
+
+
+def test_iter_join_streams_into_pipelined_executor():
+    transactions, profiles, _ = _inputs()
+    expected = MergeStorage(how="join-inner", on="User", partitioned=False).use([transactions, profiles]).height
+    merge = MergeStorage(how="join-inner", on="User", partitions=4)
+    counts = PipelinedExecutor([CountRows()]).run(merge.iter_join([transactions, profiles]))
+    assert len(counts) >= 4
+    assert sum(count.item() for count in counts) == expected
+
+
+def test_partitioned_join_peak_rss_stays_under_threshold(tmp_path):
+    rows, users = 2_000_000, 50_000
+    def inputs():
+        return [
+            pl.DataFrame({"User": (pl.int_range(rows, eager=True) * 7919) % users, "Amount": pl.int_range(rows, eager=True) * 0.5,
+                          "MCC": pl.int_range(rows, eager=True) % 1000}),
+            pl.DataFrame({"User": pl.int_range(users, eager=True), "Age": pl.int_range(users, eager=True) % 80}),
+        ]
+    data = inputs()
+    threshold = sum(df.estimated_size() for df in data)
+    merge = MergeStorage(how="join-inner", on="User", memory_threshold=threshold)
+
+    # The joined partitions are streamed to disk: the join itself stays under the threshold
+    with PeakRSS() as peak:
+        paths = merge.join_to_files(data, str(tmp_path / "joined"))
+    assert pl.scan_ipc(paths).select(pl.len()).collect().item() == rows
+    assert peak.growth < threshold, f"partitioned join grew the RSS by {peak.growth} bytes (threshold {threshold})"
+
+    # `use` additionally holds the returned frame, but never the inputs and the joined rows at once
+    data = inputs()
+    with PeakRSS() as peak:
+        result = merge.use(data)
+    assert result.height == rows
+    assert peak.growth < result.estimated_size() + threshold
@@ -0,0 +1,117 @@
+import importlib.util
+import math
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+
+from MLTest.core.Online import OnlineFeatures
+
+STRATEGIES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "strategies")
+
+
+def _strategy(name: str):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(STRATEGIES, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.strategy
+
+
+@pytest.fixture(scope="module")
+def transactions() -> pl.DataFrame:
+    rng = np.random.default_rng(7)
+    rows = 600
+    users = rng.integers(0, 12, rows)
+    # Distinct timestamps, so the order per user is the same for every sort
+    minutes = rng.permutation(rows * 10)[:rows]
+    amounts = rng.gamma(2.0, 40.0, rows).round(2).tolist()
+    # Null amounts, including a user whose first transactions are all null
+    for i in rng.choice(rows, 60, replace=False):
+        amounts[i] = None
+    first_of_user_0 = sorted((minute, i) for i, (user, minute) in enumerate(zip(users, minutes)) if user == 0)[:3]
+    for _, i in first_of_user_0:
+        amounts[i] = None
+    latitudes = rng.uniform(30, 45, rows).round(4).tolist()
+    latitudes[int(rng.integers(rows))] = None
+
+    start = datetime(2020, 1, 1)
+    return pl.DataFrame({
+        "User": users,
+        "Card": 0,
+        "Datetime": [start + timedelta(minutes=int(minute)) for minute in minutes],
+        "Amount": pl.Series(amounts, dtype=pl.Float64),
+        "Latitude": pl.Series(latitudes, dtype=pl.Float64),
+        "Longitude": rng.uniform(-120, -75, rows).round(4),
+        "Credit Limit": rng.integers(1_000, 20_000, rows).astype(float),
+        "Yearly Income - Person": 50_000.0,
+        "Total Debt": 10_000.0,
+        "MCC": rng.choice([4814, 5411, 5812], rows),
+        "Merchant Name": 1,
+        "Merchant City": "City",
+        "Merchant State": rng.choice(["CA", "NY"], rows),
+        "Errors?": None,
+        "Card Brand": "Visa",
+        "Acct Open Date": datetime(2010, 1, 1),
+        "Year PIN last Changed": 2015,
+        "Card on Dark Web": "No",
+        "Num Credit Cards": 3,
+        "Cards Issued": 1,
+        "Current Age": 40,
+        "Retirement Age": 67,
+        "Birth Year": 1980,
+        "Birth Month": 1,
+        **{column: 0 for column in ["Year", "Month", "Day", "Person", "Zip", "CARD INDEX", "Card Number",
+                                    "CVV", "Expires", "Address", "Apartment", "City", "State", "Zipcode"]},
+    })
+
+
+def _replay(engine: OnlineFeatures, transactions: pl.DataFrame) -> dict:
+    """
+    Replays the transactions in time order per user and returns the features by input row.
+    """
+    ordered = transactions.with_row_index("__row").sort(["User", "Datetime"], maintain_order=True)
+    return {row["__row"]: engine.update(row) for row in ordered.iter_rows(named=True)}
+
+
+def _assert_matches(batch, online: dict, columns: list, skip=lambda row: False):
+    for column in columns:
+        for row, value in batch[column].items():
+            if skip(row):
+                continue
+            expected = online[row][column]
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                assert expected is None, f"{column} of row {row}: expected null, got {expected}"
+            else:
+                assert expected == pytest.approx(float(value), rel=1e-9, abs=1e-9), f"{column} of row {row}"
+
+
+def test_online_features_match_strategy_0(transactions):
+    batch = _strategy("strategy_0")(transactions.to_pandas())
+    online = _replay(OnlineFeatures(time_since_default=0.0), transactions)
+    _assert_matches(batch, online, [
+        "TimeSinceLastTransaction", "WeeklyTransactionCount", "MonthlyTransactionCount",
+        "StdDevTransactionAmount", "AmountToCreditLimitRatio",
+    ])
+
+
+def test_online_features_match_strategy_6(transactions):
+    batch = _strategy("strategy_6")(transactions.to_pandas())
+    online = _replay(OnlineFeatures(), transactions)
+    # strategy_6 fills the time since the first transaction of a user with the batch mean
+    first = {rows[0] for rows in transactions.with_row_index("__row").group_by("User").agg(
+        pl.col("__row").sort_by("Datetime")).get_column("__row").to_list()}
+    _assert_matches(batch, online, [
+        "WeeklyTransactionCount", "MonthlyTransactionCount", "StdDevTransactionAmount",
+        "WeeklyTransactionMean", "TransactionDistance", "AmountToCreditLimitRatio",
+    ])
+    _assert_matches(batch, online, ["TimeSinceLastTransaction"], skip=lambda row: row in first)
+
+
+def test_all_null_window_has_std_fill():
+    engine = OnlineFeatures(std_fill=0.0)
+    features = engine.update({"User": 1, "Datetime": datetime(2020, 1, 1), "Amount": None})
+    assert features["StdDevTransactionAmount"] == 0.0
+    assert features["WeeklyTransactionMean"] is None
+    assert features["WeeklyTransactionCount"] == 0
@@ -0,0 +1,29 @@
+import polars as pl
+
+from MLTest.core.FeatureStore import FeatureStore
+from MLTest.core.Planning import Estimate
+from MLTest.components.features.Geo import TransactionDistance
+from MLTest.components.features.Store import JoinStoredFeatures, UpdateFeatureStore
+from MLTest.components.features.Window import LagFeatures, RollingFeatures
+from MLTest.components.preprocessing.Format import FormatDate, GenerateTimeStamp, SplitTimeColumn
+from MLTest.components.preprocessing.Replace import ReplaceStringPattern
+from MLTest.components.preprocessing.Sample import SampleByLabel, SampleReservoir, SampleUsers
+from MLTest.components.preprocessing.Types import CastTypes, EncodeCategoricals, HandleNullValues
+
+
+def _components(tmp_path):
+    store = FeatureStore(str(tmp_path / "store"), values=["Amount"])
+    return [
+        RollingFeatures(), LagFeatures(columns=["Amount"]), TransactionDistance(),
+        UpdateFeatureStore(store), JoinStoredFeatures(store),
+        FormatDate(["Expires"], "%m/%Y"), GenerateTimeStamp("%Y-%m-%d-%H-%M"), SplitTimeColumn("Time"),
+        ReplaceStringPattern(["Amount"], "$", ""),
+        SampleUsers(0.1), SampleByLabel({"No": 0.1}), SampleReservoir(10),
+        CastTypes({"Amount": pl.Float64}), HandleNullValues(return_null_columns=True), EncodeCategoricals(columns=["Card"]),
+    ]
+
+
+def test_plan_accepts_the_default_estimate(tmp_path):
+    for component in _components(tmp_path):
+        assert isinstance(component.plan(), Estimate), component
+        assert isinstance(component.plan(None), Estimate), component
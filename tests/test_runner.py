@@ -0,0 +1,72 @@
+import os
+import textwrap
+
+from MLTest.core.Runner import FlowRunner
+
+
+FLOWS = '''
+import time
+
+
+class Allocate:
+    def __init__(self, args):
+        self.megabytes = args["megabytes"]
+
+    def run(self):
+        import polars as pl
+        # Polars reserves far more address space than it touches
+        pl.DataFrame({"a": range(1_000_000)}).group_by(pl.col("a") % 7).len()
+        # Touched pages count towards the RSS, unlike reserved address space
+        data = b"x" * (self.megabytes * 1024 * 1024)
+        time.sleep(3)
+        return len(data)
+'''
+
+
+def _spec(tmp_path, name, megabytes, memory_mb):
+    config = tmp_path / f"{name}.conf.py"
+    config.write_text(f"args = {{'megabytes': {megabytes}}}\n")
+    return {"name": name, "sequence": "runner_flows:Allocate", "config": str(config), "variable": "args",
+            "memory_mb": memory_mb, "timeout": 30}
+
+
+def test_memory_limit_is_enforced_on_rss(tmp_path, monkeypatch):
+    (tmp_path / "runner_flows.py").write_text(textwrap.dedent(FLOWS))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    flows = [_spec(tmp_path, "small", 50, 300), _spec(tmp_path, "large", 400, 300)]
+    outcomes = {outcome["name"]: outcome for outcome in FlowRunner(flows, max_workers=2, log=False).run()}
+
+    # A limit above the flow's RSS leaves it alone, although its address space is larger
+    assert outcomes["small"]["status"] == "ok"
+    assert outcomes["large"]["status"] == "memory"
+    assert "Exceeded the memory limit of 300 MB" in outcomes["large"]["error"]
+    assert outcomes["large"]["duration_s"] < 3
+
+
+THREADS = '''
+import polars as pl
+
+
+class Threads:
+    def __init__(self, args):
+        pass
+
+    def run(self):
+        if pl.thread_pool_size() != 3:
+            raise RuntimeError(f"Polars runs {pl.thread_pool_size()} threads.")
+'''
+
+
+def test_thread_budget_applies_before_polars_is_imported(tmp_path, monkeypatch):
+    (tmp_path / "runner_threads.py").write_text(textwrap.dedent(THREADS))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    config = tmp_path / "threads.conf.py"
+    config.write_text("args = {}\n")
+
+    before = os.environ.get("POLARS_MAX_THREADS")
+    flows = [{"name": "threads", "sequence": "runner_threads:Threads", "config": str(config), "variable": "args", "threads": 3}]
+    outcomes = FlowRunner(flows, log=False).run()
+    assert outcomes[0]["status"] == "ok", outcomes[0]["error"]
+    # The budget is only set while the flow process starts
+    assert os.environ.get("POLARS_MAX_THREADS") == before
@@ -0,0 +1,57 @@
+import polars as pl
+import pytest
+
+from MLTest.core.Pipelines import FlowThroughPipe, LoadingPipe
+from MLTest.core.Sequences import Sequence
+from MLTest.components.filesystem.Input import LoadData
+from MLTest.components.preprocessing.Regulation import MergeStorage
+from MLTest.components.storage.Input import StoreInputs
+from MLTest.interfaces.Components import FlowComponent
+
+FAIL = {"enabled": True}
+
+
+class Scale(FlowComponent):
+    def __init__(self, factor: int, log: bool = False):
+        super().__init__(log)
+        self.factor = factor
+
+    def use(self, data):
+        if FAIL["enabled"]:
+            raise RuntimeError("Simulated failure.")
+        return data.with_columns(pl.col("Amount") * self.factor)
+
+
+def Load(src: str, log: bool = False):
+    return LoadingPipe([StoreInputs([LoadData(src, log=log)], log=log), MergeStorage(how="concat", log=log)])
+
+
+def ScaleAmount(factor: int, log: bool = False):
+    return FlowThroughPipe([Scale(factor, log=log)])
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "transactions.pq"
+    pl.DataFrame({"User": [1, 2], "Amount": [1.0, 2.0]}).write_parquet(path)
+    return str(path)
+
+
+def test_resume_rejects_a_run_of_other_pipeline_arguments(tmp_path, source):
+    other = tmp_path / "other.pq"
+    pl.DataFrame({"User": [3], "Amount": [100.0]}).write_parquet(other)
+    checkpoints = tmp_path / "checkpoints"
+
+    FAIL["enabled"] = True
+    with pytest.raises(RuntimeError):
+        Sequence("checkpointed", [Load, ScaleAmount], [{"src": str(other)}, {"factor": 2}], checkpoint_dir=str(checkpoints)).run()
+
+    FAIL["enabled"] = False
+    # Same pipeline kinds and factories, but the checkpoint holds the output of another input
+    with pytest.raises(ValueError, match="different pipelines or arguments"):
+        Sequence("checkpointed", [Load, ScaleAmount], [{"src": source}, {"factor": 2}], checkpoint_dir=str(checkpoints)).resume()
+    with pytest.raises(ValueError, match="different pipelines or arguments"):
+        Sequence("checkpointed", [Load, ScaleAmount], [{"src": str(other)}, {"factor": 3}], checkpoint_dir=str(checkpoints)).resume()
+
+    result = Sequence("checkpointed", [Load, ScaleAmount], [{"src": str(other)}, {"factor": 2}], checkpoint_dir=str(checkpoints)).resume()
+    assert result.get_column("Amount").to_list() == [200.0]
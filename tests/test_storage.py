@@ -0,0 +1,84 @@
+import gc
+import tracemalloc
+
+import polars as pl
+import pytest
+
+from MLTest.core.Memory import current_rss
+from MLTest.core.Pipelines import LoadingPipe
+from MLTest.components.filesystem.Input import LoadData
+from MLTest.components.preprocessing.Regulation import MergeStorage
+from MLTest.components.storage.Flow import UseFloatingStorage
+from MLTest.components.storage.Input import StoreAndAggregateInputs, StoreInputs
+from MLTest.interfaces.Components import FlowComponent
+
+RUNS = 100
+ROWS = 200_000
+
+
+class Identity(FlowComponent):
+    def use(self, data):
+        return data
+
+
+@pytest.fixture(scope="module")
+def sources(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("storage")
+    transactions = directory / "transactions.pq"
+    users = directory / "users.pq"
+    pl.DataFrame({"User": pl.int_range(ROWS, eager=True) % 1000, "Amount": pl.int_range(ROWS, eager=True) * 0.5}).write_parquet(transactions)
+    pl.DataFrame({"User": pl.int_range(1000, eager=True), "Age": pl.int_range(1000, eager=True) % 80}).write_parquet(users)
+    return str(transactions), str(users)
+
+
+def _assert_flat(run, storages):
+    # Warm up allocator pools and caches before taking the baselines
+    for _ in range(5):
+        run()
+    gc.collect()
+    rss_before = current_rss()
+    tracemalloc.start()
+    traced_before, _ = tracemalloc.get_traced_memory()
+
+    for _ in range(RUNS):
+        result = run()
+        assert result.height == ROWS
+        assert all(not storage() for storage in storages)
+    del result
+    gc.collect()
+
+    traced_after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = current_rss()
+    frame_bytes = ROWS * 16
+    # A single retained run would hold at least one input frame; 100 runs would hold 100
+    assert traced_after - traced_before < 1_000_000
+    assert rss_after - rss_before < 10 * frame_bytes
+
+
+def test_loading_pipe_reruns_hold_no_frames(sources):
+    store = StoreInputs([LoadData(sources[0]), LoadData(sources[1])])
+    pipe = LoadingPipe([store, MergeStorage(how="join-left", on="User", partitioned=False)])
+    _assert_flat(pipe.run, [lambda: store.storage])
+
+
+def test_store_and_aggregate_reruns_hold_no_frames(sources):
+    store = StoreAndAggregateInputs(
+        [LoadData(sources[0]), LoadData(sources[1])], MergeStorage(how="join-left", on="User", partitioned=False)
+    )
+    _assert_flat(store.use, [lambda: store.storage])
+
+
+def test_floating_storage_reruns_hold_no_frames(sources):
+    data = pl.read_parquet(sources[0])
+    floating = UseFloatingStorage([Identity(), Identity()], MergeStorage(how="concat"))
+    run = lambda: floating.use(data).head(ROWS)
+    _assert_flat(run, [lambda: floating.storage])
+
+
+def test_retain_keeps_only_the_last_run(sources):
+    store = StoreInputs([LoadData(sources[0]), LoadData(sources[1])], retain=True)
+    pipe = LoadingPipe([store, MergeStorage(how="join-left", on="User", partitioned=False)])
+    for _ in range(3):
+        pipe.run()
+    assert len(store.storage) == 2
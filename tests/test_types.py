@@ -0,0 +1,25 @@
+import polars as pl
+
+from MLTest.components.preprocessing.Types import DowncastNumeric
+
+
+def test_integers_are_downcast_to_the_smallest_fitting_type():
+    data = pl.DataFrame({"Small": [0, 100], "Medium": [-40_000, 40_000], "Unsigned": [0, 200]})
+    result = DowncastNumeric().use(data)
+    assert result.schema == {"Small": pl.Int8, "Medium": pl.Int32, "Unsigned": pl.Int16}
+    assert DowncastNumeric(allow_unsigned=True).use(data).schema["Unsigned"] == pl.UInt8
+
+
+def test_unsigned_values_beyond_int64_keep_their_type():
+    data = pl.DataFrame({"Id": pl.Series([0, 2**63 + 5], dtype=pl.UInt64)})
+    component = DowncastNumeric()
+    result = component.use(data)
+    assert result.schema["Id"] == pl.UInt64
+    assert result.equals(data)
+    assert component.report == {}
+
+
+def test_integers_are_never_widened():
+    data = pl.DataFrame({"Count": pl.Series([0, 2**32 - 1], dtype=pl.UInt32), "Flag": pl.Series([0, 1], dtype=pl.UInt8)})
+    result = DowncastNumeric().use(data)
+    assert result.schema == {"Count": pl.UInt32, "Flag": pl.UInt8}
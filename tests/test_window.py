@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+
+from MLTest.components.features.Window import LagFeatures, RollingFeatures
+
+STATISTICS = ["mean", "std", "count", "sum", "min", "max"]
+
+
+@pytest.fixture(scope="module")
+def transactions() -> pl.DataFrame:
+    rng = np.random.default_rng(11)
+    rows = 800
+    amounts = rng.gamma(2.0, 40.0, rows).round(2).tolist()
+    for i in rng.choice(rows, 80, replace=False):
+        amounts[i] = None
+    # Hours drawn with repetition, so users have transactions with equal timestamps
+    hours = rng.integers(0, 24 * 120, rows)
+    start = datetime(2020, 1, 1)
+    return pl.DataFrame({
+        "User": rng.integers(0, 15, rows),
+        "Datetime": [start + timedelta(hours=int(hour)) for hour in hours],
+        "Amount": pl.Series(amounts, dtype=pl.Float64),
+        "Row": np.arange(rows),
+    })
+
+
+def _reference(data: pl.DataFrame) -> pd.DataFrame:
+    # Stable sort: rows with equal timestamps keep their input order, like the components
+    return data.to_pandas().sort_values(["User", "Datetime"], kind="stable").reset_index(drop=True)
+
+
+def _assert_close(actual: pl.Series, expected: pd.Series):
+    np.testing.assert_allclose(actual.to_numpy().astype(float), expected.to_numpy().astype(float), rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize("window", [7, 30])
+def test_row_windows_match_the_strategy_definitions(transactions, window):
+    result = RollingFeatures(windows=[window]).use(transactions)
+    expected = _reference(transactions)
+    assert result.get_column("Row").to_list() == expected["Row"].tolist()
+
+    grouped = expected.groupby("User")["Amount"]
+    for statistic in STATISTICS:
+        reference = grouped.transform(lambda x: getattr(x.rolling(window=window, min_periods=1), statistic)())
+        _assert_close(result.get_column(f"Amount_rolling_{statistic}_{window}"), reference)
+
+
+def test_std_fill_matches_the_strategy_definition(transactions):
+    # StdDevTransactionAmount of strategy_0 and strategy_6
+    names = {("std", 7): "StdDevTransactionAmount"}
+    result = RollingFeatures(windows=[7], statistics=["std"], names=names, fill_value=0).use(transactions)
+    expected = _reference(transactions)
+    reference = expected.groupby("User")["Amount"].transform(lambda x: x.rolling(window=7, min_periods=1).std()).fillna(0)
+    _assert_close(result.get_column("StdDevTransactionAmount"), reference)
+
+
+@pytest.mark.parametrize("window", ["7d", "30d"])
+def test_duration_windows_match_time_based_rolling(transactions, window):
+    result = RollingFeatures(windows=[window]).use(transactions)
+    expected = _reference(transactions)
+    # Rows with equal timestamps share one window holding all of them, which pandas computes
+    # for the last row of the tie
+    last_of_tie = expected.index.to_series().groupby([expected["User"], expected["Datetime"]]).transform("max")
+
+    for statistic in STATISTICS:
+        reference = expected.groupby("User", group_keys=False)[["Datetime", "Amount"]].apply(
+            lambda x: getattr(x.rolling(window.upper(), on="Datetime", min_periods=1)["Amount"], statistic)()
+        ).sort_index()
+        _assert_close(result.get_column(f"Amount_rolling_{statistic}_{window}"), reference.loc[last_of_tie])
+
+
+def test_lag_features_match_the_strategy_definitions(transactions):
+    result = LagFeatures(columns=["Amount"], lags=[1, 2], diffs=[1]).use(transactions)
+    expected = _reference(transactions)
+    assert result.get_column("Row").to_list() == expected["Row"].tolist()
+
+    grouped = expected.groupby("User")
+    _assert_close(result.get_column("Amount_lag_1"), grouped["Amount"].shift(1))
+    _assert_close(result.get_column("Amount_lag_2"), grouped["Amount"].shift(2))
+    _assert_close(result.get_column("Amount_diff_1"), grouped["Amount"].diff(1))
+    # TimeSinceLastTransaction of strategy_0, in minutes
+    _assert_close(result.get_column("TimeSinceLastTransaction"), grouped["Datetime"].diff().dt.total_seconds() / 60)
+
+
+def test_equal_timestamps_keep_the_input_order(transactions):
+    shuffled = transactions.sample(fraction=1.0, shuffle=True, seed=3)
+    for component in [RollingFeatures(windows=[7]), LagFeatures(columns=["Amount"], lags=[1])]:
+        first, second = component.use(shuffled), component.use(shuffled)
+        assert first.equals(second)
+        assert first.get_column("Row").to_list() == _reference(shuffled)["Row"].tolist()